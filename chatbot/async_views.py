@@ -0,0 +1,152 @@
+"""
+chatbot/async_views.py
+chat_page, chat_stream 의 async 버전 (ASGI / uvicorn worker 로 실행할 때 사용, CHAT_ASYNC_VIEWS=1)
+- langgraph 는 app_graph.ainvoke / astream, LLM 은 AsyncOpenAI, 검색은 AsyncQdrantClient 로 실행
+- LLM 답변을 기다리는 동안 worker 가 다른 요청을 처리하므로 worker 하나가 여러 대화를 동시에 처리
+- DB 는 Django async ORM / 세션 API, 조회가 많은 채팅방 조회와 렌더링은 views 의 함수를 sync_to_async 로 재사용
+"""
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, redirect
+from django.views.decorators.http import require_POST
+
+from products.models import FinProduct
+
+from .models import ChatMessage, ChatRoom
+from .views import find_chat_room, render_chat_page, sse_event
+
+
+async def save_user_message(request, user, chat_room, chat, user_message):
+    """
+    views.save_user_message 의 async 버전
+    """
+    chatroom_pk = chat_room.pk
+    await ChatMessage.objects.acreate(user=user, room=chat_room, role="user", message=user_message)
+    # 세션에 임시로 현재 로그인 상태에서 사용자가 보냈던 메시지를 저장합니다.
+    previous = await request.session.aget(f"chat{chatroom_pk}")
+    await request.session.aset(f"chat{chatroom_pk}", previous + ", " + user_message if previous else user_message)
+
+    chat.state["history"].append({"role": "user", "content": user_message, "state": "new"})
+
+
+async def save_reply(request, user, chat_room, reply):
+    """
+    views.save_reply 의 async 버전
+
+    return (str, FinProduct | None) : 화면에 보여줄 답변, 추천 상품
+    """
+    if reply["need_user_feedback"]:
+        answer = reply["__interrupt__"][0].value
+    else:
+        answer = reply["answer"]
+    await request.session.aset("need_user_feedback", reply["need_user_feedback"])
+    await ChatMessage.objects.acreate(user=user, room=chat_room, role="bot", message=answer)
+
+    product = None
+    if reply["recommend_mode"]:
+        product = await FinProduct.objects.aget(fin_prdt_cd=reply["product_code"])
+        await ChatMessage.objects.acreate(user=user, room=chat_room, role="bot", message="추천상품", product=product)
+    return answer, product
+
+
+async def greet(request, user, chat_room, chat, user_thread):
+    """
+    인삿말이 필요하면 langgraph 로 인삿말을 만들어 저장합니다. (views.chat_page 의 GET 처리와 같음)
+    """
+    chatroom_pk = chat_room.pk
+    if not chat_room.ever_visited:
+        chat_room.ever_visited = True
+        await chat_room.asave()
+    elif await request.session.aget(f"login_visited{chatroom_pk}") or not chat_room.history:
+        return
+
+    reply = await chat.aask(None, user_thread)
+    # 중복 인사를 방지하기 위해 세션에 로그인 상태를 기록합니다.
+    await request.session.aset(f"login_visited{chatroom_pk}", True)
+    await ChatMessage.objects.acreate(user=user, room=chat_room, role="bot", message=reply["answer"])
+
+
+@login_required
+async def chat_page(request, chatroom_pk=None):
+    """
+    views.chat_page 의 async 버전
+    - GET 요청: 기존 대화 내역 표시 (필요하면 인삿말 생성)
+    - POST 요청: 사용자 입력을 DB에 저장하고 챗봇 응답 생성 후 리다이렉트
+    """
+    chat_room, response = await sync_to_async(find_chat_room)(request, chatroom_pk)
+    if response is not None:
+        return response
+    chatroom_pk = chat_room.pk
+    user = await request.auser()
+
+    from rag_flow.graph_flow import ChatSession
+
+    chat = ChatSession(chat_room.history)
+    user_thread = {"configurable": {"thread_id": chatroom_pk, "user_id": user.pk}}
+
+    if request.method == "POST":
+        user_message = request.POST.get("message", "").strip()
+        if user_message:
+            await save_user_message(request, user, chat_room, chat, user_message)
+            need_user_feedback = await request.session.aget("need_user_feedback", False)
+            reply = await chat.aask(user_message, user_thread, need_user_feedback)
+            await save_reply(request, user, chat_room, reply)
+        return redirect("chat:chat_page", chatroom_pk)
+
+    await greet(request, user, chat_room, chat, user_thread)
+    return await sync_to_async(render_chat_page)(request, chat_room)
+
+
+@login_required
+@require_POST
+async def chat_stream(request, chatroom_pk):
+    """
+    views.chat_stream 의 async 버전 (이벤트 형식은 같음)
+    """
+    start = time.perf_counter()
+    user = await request.auser()
+    chat_room = await aget_object_or_404(ChatRoom, pk=chatroom_pk, user=user)
+    user_message = request.POST.get("message", "").strip()
+
+    from rag_flow.graph_flow import ChatSession
+
+    chat = ChatSession(chat_room.history)
+    user_thread = {"configurable": {"thread_id": chatroom_pk, "user_id": user.pk}}
+    need_user_feedback = await request.session.aget("need_user_feedback", False)
+    if user_message:
+        await save_user_message(request, user, chat_room, chat, user_message)
+        # 응답 header 를 보내기 전에 세션 저장 (stream 이 끝나기 전에 SessionMiddleware 가 먼저 실행됨)
+        await request.session.asave()
+
+    async def events():
+        if not user_message:
+            yield sse_event("done", {"answer": "", "product": False, "ttft_ms": None})
+            return
+        ttft = None
+        try:
+            async for kind, value in chat.astream(user_message, user_thread, need_user_feedback):
+                if kind == "token":
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    yield sse_event("token", {"text": value})
+                else:
+                    answer, product = await save_reply(request, user, chat_room, value)
+                    await request.session.asave()
+        except Exception as e:
+            print(f"chat_stream 오류 : {e!r}")
+            yield sse_event("error", {"message": "답변을 만드는 중 오류가 발생했습니다. 다시 시도해 주세요."})
+            return
+
+        total = time.perf_counter() - start
+        ttft_ms = round(ttft * 1000, 1) if ttft is not None else None
+        print(f"chat_stream room={chatroom_pk} TTFT {ttft_ms}ms, 전체 {total * 1000:.1f}ms")
+        yield sse_event("done", {"answer": answer, "product": product is not None, "ttft_ms": ttft_ms})
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx 가 응답을 모았다가 보내지 않도록
+    return response
@@ -0,0 +1,117 @@
+"""
+LangGraph checkpointer 벤치마크 (MemorySaver vs DjangoCheckpointSaver)
+- stub OpenAI 서버(latency 0)로 ChatSession.ask 를 실행해서 turn 당 시간 차이 = checkpoint 비용
+- DjangoCheckpointSaver 의 get_tuple / put / put_writes 호출 수, 평균 시간도 출력
+- 기본은 임시 SQLite 파일, --database default 로 settings 의 DB(MySQL)에서 측정
+
+실행 명령어
+python -m chatbot.bench_checkpoint --conversations 20 --turns 5
+python -m chatbot.bench_checkpoint --database default
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+
+def setup_django(sqlite_path: str | None) -> None:
+    """
+    sqlite_path 가 있으면 DB 를 SQLite 파일로 바꾸고 checkpoint 테이블만 생성
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "finbot.settings")
+    import django
+    from django.conf import settings
+
+    if sqlite_path:
+        settings.DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": sqlite_path}}
+    django.setup()
+
+    if sqlite_path:
+        from django.db import connection
+
+        from chatbot.models import GraphCheckpoint, GraphCheckpointWrite
+
+        with connection.schema_editor() as editor:
+            editor.create_model(GraphCheckpoint)
+            editor.create_model(GraphCheckpointWrite)
+
+
+def run_conversations(checkpointer, n_conversations: int, n_turns: int) -> list[float]:
+    """
+    첫 인사 + normal chat n_turns 번을 n_conversations 개 대화방에서 실행
+
+    return list[float] : turn 별 ChatSession.ask 시간(초), 첫 인사 제외
+    """
+    from rag_flow import graph_flow
+
+    graph_flow.app_graph = graph_flow.graph.compile(checkpointer=checkpointer)
+
+    elapsed = []
+    for _ in range(n_conversations):
+        thread = {"configurable": {"thread_id": uuid.uuid4().hex}}
+        chat = graph_flow.ChatSession(None)
+        chat.ask(None, thread)
+        for turn in range(n_turns):
+            query = f"요즘 금리 흐름은 어떤가요 {turn}"
+            chat.state["history"].append({"role": "user", "content": query, "state": "new"})
+            start = time.perf_counter()
+            chat.ask(query, thread)
+            elapsed.append(time.perf_counter() - start)
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of LangGraph checkpoint latency per chat turn")
+    parser.add_argument("--conversations", "-c", type=int, default=20)
+    parser.add_argument("--turns", "-t", type=int, default=5)
+    parser.add_argument("--database", choices=["sqlite", "default"], default="sqlite")
+    parser.add_argument("--max_history", type=int, default=20)
+    args = parser.parse_args()
+
+    from finbot.stub_openai import start_stub_server
+
+    server = start_stub_server(latency=0)
+    os.environ["OPENAI_BASE_URL"] = server.url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, "checkpoint.sqlite3") if args.database == "sqlite" else None)
+
+        from langgraph.checkpoint.memory import MemorySaver
+
+        from chatbot.checkpoint import DjangoCheckpointSaver
+        from chatbot.models import GraphCheckpoint
+
+        saver = DjangoCheckpointSaver(max_history=args.max_history)
+        results = {}
+        for name, checkpointer in [("memory", MemorySaver()), ("db", saver)]:
+            # node 의 실행 시간 print 는 숨김
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_conversations(checkpointer, 1, 1)  # warm-up (graph compile, OpenAI client)
+                saver.reset_stats()
+                results[name] = run_conversations(checkpointer, args.conversations, args.turns)
+        db_stats = saver.stats()
+        rows = GraphCheckpoint.objects.count()
+
+    server.shutdown()
+
+    n_turns = args.conversations * args.turns
+    print("-" * 70)
+    print(f"database={args.database}, 대화 {args.conversations}개 x {args.turns} turn, max_history={args.max_history}")
+    print(f"{'checkpointer':<14} {'turn p50(ms)':>13} {'turn p95(ms)':>13} {'turn mean(ms)':>14}")
+    for name, elapsed in results.items():
+        p50 = statistics.median(elapsed) * 1000
+        p95 = statistics.quantiles(elapsed, n=20)[-1] * 1000
+        print(f"{name:<14} {p50:>13.1f} {p95:>13.1f} {statistics.mean(elapsed) * 1000:>14.1f}")
+    overhead = (statistics.mean(results["db"]) - statistics.mean(results["memory"])) * 1000
+    print(f"turn 당 추가 시간(db - memory) : {overhead:.1f}ms")
+    for op, stat in db_stats.items():
+        per_turn = stat["count"] / n_turns
+        print(f"  {op:<11} turn 당 {per_turn:>4.1f}회, 평균 {stat['avg_ms']:.2f}ms")
+    print(f"저장된 checkpoint : {rows}개 (대화방 당 최대 {args.max_history}개)")
+    print("-" * 70)
@@ -0,0 +1,374 @@
+"""
+Django DB(MySQL / SQLite)에 저장하는 LangGraph checkpointer
+- gunicorn worker 가 여러 개여도 같은 DB 를 보므로 interrupt 된 flow(human_feedback, user_feedback, fill_fin_type)를
+  다른 worker 가 이어서 실행할 수 있고, 서버를 재시작해도 유지됨
+- thread 별로 최근 max_history 개 checkpoint 만 유지 (오래된 checkpoint, pending write 는 put 할 때 삭제)
+- 마지막 checkpoint 가 ttl_hours 보다 오래된 thread 는 통째로 삭제
+  (prune_interval 초마다 put 에서 한 번, 또는 python manage.py prune_checkpoints)
+"""
+
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import timedelta
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db import InterfaceError, OperationalError, connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from finbot.db import bulk_upsert
+
+from .models import GraphCheckpoint, GraphCheckpointWrite
+
+
+CHECKPOINT_KEY = ("thread_id", "checkpoint_ns", "checkpoint_id")
+WRITE_KEY = ("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx")
+CHAT_CHECKPOINT_MAX_HISTORY = int(os.getenv("CHAT_CHECKPOINT_MAX_HISTORY", "20"))
+CHAT_CHECKPOINT_TTL_HOURS = float(os.getenv("CHAT_CHECKPOINT_TTL_HOURS", "72"))
+CHAT_CHECKPOINT_PRUNE_INTERVAL = float(os.getenv("CHAT_CHECKPOINT_PRUNE_INTERVAL", "3600"))
+
+
+def retry_on_disconnect(func, *args, **kwargs):
+    """
+    LangGraph 는 checkpoint 저장을 별도 thread 에서 실행하므로 그 thread 의 DB 연결은 요청이 끝나도 닫히지 않음
+    -> MySQL wait_timeout 으로 끊긴 연결이면 닫고 한 번 다시 실행
+    """
+    try:
+        return func(*args, **kwargs)
+    except (OperationalError, InterfaceError):
+        connection.close()
+        return func(*args, **kwargs)
+
+
+class DjangoCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    GraphCheckpoint / GraphCheckpointWrite 모델에 checkpoint 를 저장하는 checkpointer
+
+    parameter (int) max_history : thread(+checkpoint_ns) 별로 남길 checkpoint 수 (0 이면 제한 없음)
+    parameter (float) ttl_hours : 마지막 checkpoint 이후 이 시간이 지난 thread 삭제 (0 이면 삭제 안 함)
+    parameter (float) prune_interval : put 에서 TTL 정리를 실행하는 최소 간격(초, 프로세스별)
+    """
+
+    def __init__(
+        self,
+        max_history: int = CHAT_CHECKPOINT_MAX_HISTORY,
+        ttl_hours: float = CHAT_CHECKPOINT_TTL_HOURS,
+        prune_interval: float = CHAT_CHECKPOINT_PRUNE_INTERVAL,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.max_history = max_history
+        self.ttl_hours = ttl_hours
+        self.prune_interval = prune_interval
+        self.last_prune = time.monotonic()
+        self.lock = threading.Lock()
+        self.timings: defaultdict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+
+    def record(self, name: str, start: float) -> None:
+        with self.lock:
+            timing = self.timings[name]
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        """
+        return dict : {"get_tuple": {"count", "total_ms", "avg_ms"}, "put": ..., "put_writes": ...}
+        """
+        with self.lock:
+            return {
+                name: {"count": count, "total_ms": total * 1000, "avg_ms": total * 1000 / count if count else 0.0}
+                for name, (count, total) in self.timings.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.timings.clear()
+
+    # 조회
+
+    def make_tuple(self, row: GraphCheckpoint) -> CheckpointTuple:
+        writes = GraphCheckpointWrite.objects.filter(
+            thread_id=row.thread_id, checkpoint_ns=row.checkpoint_ns, checkpoint_id=row.checkpoint_id
+        ).order_by("task_id", "idx")
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((row.checkpoint_type, bytes(row.checkpoint))),
+            metadata=self.serde.loads_typed((row.metadata_type, bytes(row.metadata))),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": row.thread_id,
+                        "checkpoint_ns": row.checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.value_type, bytes(write.value))))
+                for write in writes
+            ],
+        )
+
+    def _get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        rows = GraphCheckpoint.objects.filter(
+            thread_id=str(config["configurable"]["thread_id"]),
+            checkpoint_ns=config["configurable"].get("checkpoint_ns", ""),
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            row = rows.filter(checkpoint_id=checkpoint_id).first()
+        else:
+            # checkpoint_id 는 시간순으로 정렬되는 uuid6 이므로 가장 큰 값이 최신
+            row = rows.order_by("-checkpoint_id").first()
+        return self.make_tuple(row) if row else None
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        start = time.perf_counter()
+        try:
+            return retry_on_disconnect(self._get_tuple, config)
+        finally:
+            self.record("get_tuple", start)
+
+    def _list(self, config, filter, before, limit) -> list[CheckpointTuple]:
+        rows = GraphCheckpoint.objects.all()
+        if config:
+            rows = rows.filter(thread_id=str(config["configurable"]["thread_id"]))
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                rows = rows.filter(checkpoint_ns=checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                rows = rows.filter(checkpoint_id=checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            rows = rows.filter(checkpoint_id__lt=before_checkpoint_id)
+
+        results = []
+        for row in rows.order_by("thread_id", "checkpoint_ns", "-checkpoint_id"):
+            if limit is not None and len(results) >= limit:
+                break
+            checkpoint_tuple = self.make_tuple(row)
+            # metadata 는 직렬화된 bytes 라서 필터는 python 에서 적용
+            if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            results.append(checkpoint_tuple)
+        return results
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        yield from retry_on_disconnect(self._list, config, filter, before, limit)
+
+    # 저장
+
+    def _put(self, config, checkpoint, metadata) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        # SELECT 후 INSERT 하면 SQLite 에서 read -> write lock 승격 중 "database is locked" 가 나므로 upsert 한 문장
+        row = GraphCheckpoint(
+            thread_id=thread_id,
+            checkpoint_ns=checkpoint_ns,
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+            checkpoint_type=checkpoint_type,
+            checkpoint=checkpoint_data,
+            metadata_type=metadata_type,
+            metadata=metadata_data,
+        )
+        bulk_upsert(GraphCheckpoint.objects, [row], CHECKPOINT_KEY)
+        if self.max_history:
+            self.prune_history(thread_id, checkpoint_ns)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        start = time.perf_counter()
+        try:
+            return retry_on_disconnect(self._put, config, checkpoint, metadata)
+        finally:
+            self.record("put", start)
+            self.maybe_prune_expired()
+
+    def _put_writes(self, config, writes, task_id, task_path) -> None:
+        key = {
+            "thread_id": str(config["configurable"]["thread_id"]),
+            "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+            "checkpoint_id": config["configurable"]["checkpoint_id"],
+            "task_id": task_id,
+        }
+        new_rows, special_rows = [], []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_data = self.serde.dumps_typed(value)
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            row = GraphCheckpointWrite(
+                **key, idx=write_idx, channel=channel, value_type=value_type, value=value_data, task_path=task_path
+            )
+            (special_rows if write_idx < 0 else new_rows).append(row)
+        # 일반 write 는 이미 있으면 유지 (같은 task 가 다시 실행된 경우), error/interrupt 같은 특수 write 는 덮어씀
+        if new_rows:
+            GraphCheckpointWrite.objects.bulk_create(new_rows, ignore_conflicts=True)
+        if special_rows:
+            bulk_upsert(GraphCheckpointWrite.objects, special_rows, WRITE_KEY)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            retry_on_disconnect(self._put_writes, config, writes, task_id, task_path)
+        finally:
+            self.record("put_writes", start)
+
+    # 정리
+
+    def prune_history(self, thread_id: str, checkpoint_ns: str) -> int:
+        """
+        thread 의 최근 max_history 개를 제외한 checkpoint, pending write 삭제
+
+        return int : 삭제한 checkpoint 수
+        """
+        old_ids = list(
+            GraphCheckpoint.objects.filter(thread_id=thread_id, checkpoint_ns=checkpoint_ns)
+            .order_by("-checkpoint_id")
+            .values_list("checkpoint_id", flat=True)[self.max_history :]
+        )
+        if not old_ids:
+            return 0
+        with transaction.atomic():
+            GraphCheckpointWrite.objects.filter(
+                thread_id=thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id__in=old_ids
+            ).delete()
+            GraphCheckpoint.objects.filter(
+                thread_id=thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id__in=old_ids
+            ).delete()
+        return len(old_ids)
+
+    def prune_expired(self, ttl_hours: float | None = None) -> int:
+        """
+        마지막 checkpoint 가 ttl_hours 보다 오래된 thread 삭제
+
+        return int : 삭제한 thread 수
+        """
+        ttl_hours = self.ttl_hours if ttl_hours is None else ttl_hours
+        cutoff = timezone.now() - timedelta(hours=ttl_hours)
+        thread_ids = list(
+            GraphCheckpoint.objects.values("thread_id")
+            .annotate(last_created_at=Max("created_at"))
+            .filter(last_created_at__lt=cutoff)
+            .values_list("thread_id", flat=True)
+        )
+        for thread_id in thread_ids:
+            self.delete_thread(thread_id)
+        return len(thread_ids)
+
+    def maybe_prune_expired(self) -> None:
+        """
+        put 할 때 prune_interval 초마다 한 번 TTL 정리 (실패해도 대화는 계속)
+        """
+        if not self.ttl_hours or time.monotonic() - self.last_prune < self.prune_interval:
+            return
+        with self.lock:
+            if time.monotonic() - self.last_prune < self.prune_interval:
+                return
+            self.last_prune = time.monotonic()
+        try:
+            deleted = retry_on_disconnect(self.prune_expired)
+            if deleted:
+                print(f"만료된 대화 checkpoint {deleted}개 thread 를 삭제했습니다.")
+        except Exception as e:
+            print(f"checkpoint TTL 정리 실패: {e!r}")
+
+    def delete_thread(self, thread_id: str) -> None:
+        with transaction.atomic():
+            GraphCheckpointWrite.objects.filter(thread_id=str(thread_id)).delete()
+            GraphCheckpoint.objects.filter(thread_id=str(thread_id)).delete()
+
+    # async (ASGI 에서 ainvoke 할 때, ORM 은 thread 에서 실행)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await sync_to_async(self.get_tuple)(config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await sync_to_async(retry_on_disconnect)(self._list, config, filter, before, limit)
+        for checkpoint_tuple in results:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await sync_to_async(self.put)(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await sync_to_async(self.put_writes)(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await sync_to_async(self.delete_thread)(thread_id)
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        # InMemorySaver 와 같은 형식 ("<순번 32자리>.<난수>")
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from chatbot.checkpoint import CHAT_CHECKPOINT_MAX_HISTORY, CHAT_CHECKPOINT_TTL_HOURS, DjangoCheckpointSaver
+from chatbot.models import GraphCheckpoint
+
+
+class Command(BaseCommand):
+    """
+    오래된 LangGraph checkpoint 정리 (cron 등에서 주기적으로 실행)
+    python manage.py prune_checkpoints --ttl_hours 72 --max_history 20
+    """
+
+    help = "Delete chat threads whose last checkpoint is older than the TTL and trim per-thread history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ttl_hours", type=float, default=CHAT_CHECKPOINT_TTL_HOURS)
+        parser.add_argument("--max_history", type=int, default=CHAT_CHECKPOINT_MAX_HISTORY)
+
+    def handle(self, *args, **options):
+        saver = DjangoCheckpointSaver(max_history=options["max_history"], ttl_hours=options["ttl_hours"])
+        threads = saver.prune_expired()
+
+        trimmed = 0
+        if saver.max_history:
+            for thread_id, checkpoint_ns in GraphCheckpoint.objects.values_list(
+                "thread_id", "checkpoint_ns"
+            ).distinct():
+                trimmed += saver.prune_history(thread_id, checkpoint_ns)
+        self.stdout.write(f"만료된 thread {threads}개, 오래된 checkpoint {trimmed}개를 삭제했습니다.")
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0002_chatmessage_product'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('thread_id', models.CharField(max_length=150)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', max_length=150)),
+                ('checkpoint_id', models.CharField(max_length=64)),
+                ('parent_checkpoint_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('checkpoint_type', models.CharField(max_length=32)),
+                ('checkpoint', models.BinaryField()),
+                ('metadata_type', models.CharField(max_length=32)),
+                ('metadata', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'checkpoint_id'), name='uniq_graph_checkpoint')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GraphCheckpointWrite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('thread_id', models.CharField(max_length=150)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', max_length=150)),
+                ('checkpoint_id', models.CharField(max_length=64)),
+                ('task_id', models.CharField(max_length=64)),
+                ('idx', models.IntegerField()),
+                ('channel', models.CharField(max_length=150)),
+                ('value_type', models.CharField(max_length=32)),
+                ('value', models.BinaryField()),
+                ('task_path', models.CharField(blank=True, default='', max_length=255)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'), name='uniq_graph_checkpoint_write')],
+            },
+        ),
+    ]
@@ -55,3 +55,56 @@ class ChatMessage(models.Model):
 
     def __str__(self):
         return f"[{self.role}] {self.message[:30]}"
+
+
+class GraphCheckpoint(models.Model):
+    """
+    LangGraph checkpoint (chatbot/checkpoint.py 의 DjangoCheckpointSaver 가 사용)
+    - thread_id 는 채팅방 pk, checkpoint_id 는 시간순으로 정렬되는 uuid6 문자열
+    - checkpoint/metadata 는 LangGraph serializer 로 직렬화한 bytes
+    """
+
+    thread_id = models.CharField(max_length=150)
+    checkpoint_ns = models.CharField(max_length=150, default="", blank=True)
+    checkpoint_id = models.CharField(max_length=64)
+    parent_checkpoint_id = models.CharField(max_length=64, null=True, blank=True)
+    checkpoint_type = models.CharField(max_length=32)
+    checkpoint = models.BinaryField()
+    metadata_type = models.CharField(max_length=32)
+    metadata = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["thread_id", "checkpoint_ns", "checkpoint_id"],
+                name="uniq_graph_checkpoint",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.thread_id}:{self.checkpoint_ns}:{self.checkpoint_id}"
+
+
+class GraphCheckpointWrite(models.Model):
+    """
+    checkpoint 에 딸린 pending write (interrupt 값, 실행 중이던 node 의 출력 등)
+    """
+
+    thread_id = models.CharField(max_length=150)
+    checkpoint_ns = models.CharField(max_length=150, default="", blank=True)
+    checkpoint_id = models.CharField(max_length=64)
+    task_id = models.CharField(max_length=64)
+    idx = models.IntegerField()
+    channel = models.CharField(max_length=150)
+    value_type = models.CharField(max_length=32)
+    value = models.BinaryField()
+    task_path = models.CharField(max_length=255, default="", blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"],
+                name="uniq_graph_checkpoint_write",
+            )
+        ]
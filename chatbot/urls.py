@@ -1,13 +1,18 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 
 app_name = "chat"
 
+# ASGI(uvicorn worker)에서는 LLM 답변을 기다리는 동안 다른 요청을 처리하는 async view 사용
+chat_views = async_views if settings.CHAT_ASYNC_VIEWS else views
+
 urlpatterns = [
-    path("", views.chat_page, name="current_chat"),  # 가장 최근의 채팅 페이지
-    path("<int:chatroom_pk>/", views.chat_page, name="chat_page"),  # 대화 페이지
+    path("", chat_views.chat_page, name="current_chat"),  # 가장 최근의 채팅 페이지
+    path("<int:chatroom_pk>/", chat_views.chat_page, name="chat_page"),  # 대화 페이지
+    path("<int:chatroom_pk>/stream/", chat_views.chat_stream, name="chat_stream"),  # 답변 streaming (SSE)
     path("chatroom/create/", views.chatroom_create, name="chatroom_create"),  # 채팅방 생성
     path(
         "chatroom/delete/<int:chatroom_pk>/",
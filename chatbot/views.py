@@ -2,13 +2,19 @@
 chatbot/views.py
 폼 전송 방식으로 대화 메시지를 주고받는 간단한 챗봇
 AJAX(JSON) 대신 Django의 기본 POST 방식 사용
+chat_stream 은 같은 폼 데이터를 받아 답변을 SSE(text/event-stream)로 token 단위 전송 (chat.html 의 fetch)
+ASGI(uvicorn worker)로 실행하면 chat_page, chat_stream 대신 async_views 의 async 버전 사용 (CHAT_ASYNC_VIEWS)
 """
 
+import json
+import time
+
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import redirect, render
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
 
 from products.models import FinProduct
-from rag_flow.graph_flow import ChatSession
 
 from .forms import ChatRoomForm
 from .models import ChatMessage, ChatRoom
@@ -44,17 +50,62 @@ def chatroom_delete(requset, chatroom_pk):
         return redirect("chat:current_chat")
 
 
-@login_required
-def chat_page(request, chatroom_pk=None):
+def save_user_message(request, chat_room, chat, user_message):
     """
-    대화 페이지 렌더링
-    - GET 요청: 기존 대화 내역 표시
-    - POST 요청: 사용자 입력을 DB에 저장하고 챗봇 응답 생성 후 다시 렌더링
+    사용자 메시지를 DB, 세션, langgraph history 에 저장합니다. (chat_page / chat_stream 공통)
+    """
+    chatroom_pk = chat_room.pk
+    # 사용자 메시지 저장
+    ChatMessage.objects.create(user=request.user, room=chat_room, role="user", message=user_message)
+    # 세션에 임시로 현재 로그인 상태에서 사용자가 보냈던 메시지를 저장합니다.
+    # 이미 세션에 저장된 메시지가 있다면 추가합니다.
+    if request.session.get(f"chat{chatroom_pk}"):
+        request.session[f"chat{chatroom_pk}"] = request.session.get(f"chat{chatroom_pk}") + ", " + user_message
+    else:
+        request.session[f"chat{chatroom_pk}"] = user_message
+
+    # langgraph의 flow에 따라 chat 인스턴스에 히스토리를 "new"로 추가합니다.
+    chat.state["history"].append({"role": "user", "content": user_message, "state": "new"})
+
+
+def save_reply(request, chat_room, reply):
+    """
+    챗봇 응답(langgraph 의 마지막 state)을 DB 에 저장합니다. (chat_page / chat_stream 공통)
+
+    return (str, FinProduct | None) : 화면에 보여줄 답변, 추천 상품
+    """
+    if reply["need_user_feedback"]:
+        answer = reply["__interrupt__"][0].value
+    else:
+        answer = reply["answer"]
+    request.session["need_user_feedback"] = reply["need_user_feedback"]
+    ChatMessage.objects.create(user=request.user, room=chat_room, role="bot", message=answer)
+
+    # 사용자의 채팅을 바탕으로 현재 챗봇이 recommend mode라면 추천 상품 정보를 채팅에 추가합니다.
+    product = None
+    if reply["recommend_mode"]:
+        # 추천받은 상품
+        product = FinProduct.objects.get(fin_prdt_cd=reply["product_code"])
+        ChatMessage.objects.create(
+            user=request.user,
+            room=chat_room,
+            role="bot",
+            message="추천상품",
+            product=product,
+        )
+    return answer, product
+
+
+def find_chat_room(request, chatroom_pk=None):
+    """
+    대화 페이지에서 보여줄 채팅방을 조회합니다. (chat_page / async_views.chat_page 공통)
+
+    return (ChatRoom | None, HttpResponse | None) : 채팅방, 채팅방 대신 보낼 리다이렉트 응답
     """
     # 채팅방이 하나도 없다면 채팅방을 하나 자동으로 생성합니다.
     rooms = ChatRoom.objects.filter(user=request.user)
     if not rooms.exists():
-        return chatroom_create(request)
+        return None, chatroom_create(request)
 
     # 유저가 메인페이지에서 채팅방 페이지를 요청한 경우
     if not chatroom_pk:
@@ -66,8 +117,6 @@ def chat_page(request, chatroom_pk=None):
         else:
             # 가장 최근에 나눴던 대화를 통해 가장 최근에 대화를 나눴던 채팅방을 조회합니다.
             chat_room = current_chat.room
-        # 채팅방의 고유키를 할당합니다.
-        chatroom_pk = chat_room.pk
 
     # 유저가 채팅방을 이동하는 경우
     # 해당 사용자의 채팅방을 조회합니다.
@@ -75,11 +124,47 @@ def chat_page(request, chatroom_pk=None):
         chat_room = ChatRoom.objects.get(pk=chatroom_pk)
     # 요청한 채팅방이 사용자의 채팅방이 맞는지 확인합니다.
     if chat_room.user != request.user:
-        return redirect("chat:chat_list")
+        return None, redirect("chat:chat_list")
+    return chat_room, None
+
+
+def render_chat_page(request, chat_room):
+    """
+    채팅방 목록과 현재 채팅방의 메시지로 대화 페이지를 렌더링합니다.
+    """
+    # 사용자의 모든 채팅방을 조회
+    rooms = ChatRoom.objects.filter(user=request.user)
+    # 현재 채팅방의 메시지만 조회
+    messages = ChatMessage.objects.filter(room=chat_room).order_by("created_at")  # 오래된 순
+    context = {
+        "messages": messages,
+        "rooms": rooms,
+        # 사용자가 어떤 채팅방에 머무르는지 확인할 수 있도록 현재 채팅방의 pk를 넘겨줍니다.
+        "chatroom_pk": chat_room.pk,
+    }
+    return render(request, "chatbot/chat.html", context)
+
+
+@login_required
+def chat_page(request, chatroom_pk=None):
+    """
+    대화 페이지 렌더링
+    - GET 요청: 기존 대화 내역 표시
+    - POST 요청: 사용자 입력을 DB에 저장하고 챗봇 응답 생성 후 다시 렌더링
+    """
+    chat_room, response = find_chat_room(request, chatroom_pk)
+    if response is not None:
+        return response
+    # 채팅방의 고유키를 할당합니다.
+    chatroom_pk = chat_room.pk
 
     # 사용자가 이전 로그인 시점에 챗봇과 나눴던 대화를 불러옵니다.
     chat_history = chat_room.history
 
+    # langgraph/qdrant/openai import 는 무거우므로 채팅 화면에 들어올 때 처음 import 합니다.
+    # (manage.py 명령, 상품 페이지 등은 RAG 모듈을 불러오지 않음)
+    from rag_flow.graph_flow import ChatSession
+
     # langgraph_flow를 따르기 위해 ChatSession의 인스턴스를 생성합니다.
     # 현재 사용자의 이전 로그인 시점의 대화 히스토리를 인스턴스 변수로 생성합니다.
     chat = ChatSession(chat_history)
@@ -90,42 +175,12 @@ def chat_page(request, chatroom_pk=None):
         user_message = request.POST.get("message", "").strip()
 
         if user_message:  # 빈 메시지가 아닐 때만 저장
-            # 사용자 메시지 저장
-            ChatMessage.objects.create(user=request.user, room=chat_room, role="user", message=user_message)
-            # 세션에 임시로 현재 로그인 상태에서 사용자가 보냈던 메시지를 저장합니다.
-            # 이미 세션에 저장된 메시지가 있다면 추가합니다.
-            if request.session.get(f"chat{chatroom_pk}"):
-                request.session[f"chat{chatroom_pk}"] = request.session.get(f"chat{chatroom_pk}") + ", " + user_message
-            else:
-                request.session[f"chat{chatroom_pk}"] = user_message
-
-            # langgraph의 flow에 따라 chat 인스턴스에 히스토리를 "new"로 추가합니다.
-            chat.state["history"].append({"role": "user", "content": user_message, "state": "new"})
+            save_user_message(request, chat_room, chat, user_message)
 
             # 챗봇 응답 저장
-            if request.session.get("need_user_feedback"):
-                reply = chat.ask(user_message, user_thread, request.session["need_user_feedback"])
-                request.session["need_user_feedback"] = False
-            else:
-                reply = chat.ask(user_message, user_thread)
-            if reply["need_user_feedback"]:
-                answer = reply["__interrupt__"][0].value
-            else:
-                answer = reply["answer"]
-            request.session["need_user_feedback"] = reply["need_user_feedback"]
-            ChatMessage.objects.create(user=request.user, room=chat_room, role="bot", message=answer)
-
-            # 사용자의 채팅을 바탕으로 현재 챗봇이 recommend mode라면 추천 상품 정보를 채팅에 추가합니다.
-            if reply["recommend_mode"]:
-                # 추천받은 상품
-                product = FinProduct.objects.get(fin_prdt_cd=reply["product_code"])
-                ChatMessage.objects.create(
-                    user=request.user,
-                    room=chat_room,
-                    role="bot",
-                    message="추천상품",
-                    product=product,
-                )
+            need_user_feedback = request.session.get("need_user_feedback", False)
+            reply = chat.ask(user_message, user_thread, need_user_feedback)
+            save_reply(request, chat_room, reply)
 
         # POST 후 새로고침 시 중복 전송 방지를 위해 리다이렉트
         return redirect("chat:chat_page", chatroom_pk)
@@ -149,16 +204,68 @@ def chat_page(request, chatroom_pk=None):
         # 중복 인사를 방지하기 위해 세션에 로그인 상태를 기록합니다.
         request.session[f"login_visited{chatroom_pk}"] = True
         ChatMessage.objects.create(user=request.user, room=chat_room, role="bot", message=answer)
-    # 사용자의 모든 채팅방을 조회
-    rooms = ChatRoom.objects.filter(user=request.user)
-    # 현재 채팅방의 메시지만 조회
-    messages = ChatMessage.objects.filter(room=chat_room).order_by("created_at")  # 오래된 순
-    context = {
-        "messages": messages,
-        "rooms": rooms,
-        "chatroom_pk": chatroom_pk,  # 사용자가 어떤 채팅방에 머무르는지 확인할 수 있도록 현재 채팅방의 pk를 넘겨줍니다.
-    }
-    return render(request, "chatbot/chat.html", context)
+    return render_chat_page(request, chat_room)
+
+
+def sse_event(event: str, data: dict) -> str:
+    """
+    Server-Sent Events 형식의 이벤트 한 개
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@login_required
+@require_POST
+def chat_stream(request, chatroom_pk):
+    """
+    POST 요청: 사용자 메시지를 받아 챗봇 답변을 SSE 로 전송합니다.
+    - event: token  {"text": ...}  LLM 이 생성하는 대로 답변 조각 (fin_word_explain, normal_chat)
+    - event: done   {"answer": ..., "product": bool, "ttft_ms": ...}  답변을 DB 에 저장한 뒤 마지막 이벤트
+    - event: error  {"message": ...}
+    추천 상품, interrupt 질문 등 token 없이 끝나는 답변은 done 의 answer 로 표시합니다.
+    """
+    start = time.perf_counter()
+    chat_room = get_object_or_404(ChatRoom, pk=chatroom_pk, user=request.user)
+    user_message = request.POST.get("message", "").strip()
+
+    from rag_flow.graph_flow import ChatSession
+
+    chat = ChatSession(chat_room.history)
+    user_thread = {"configurable": {"thread_id": chatroom_pk, "user_id": request.user.pk}}
+    need_user_feedback = request.session.get("need_user_feedback", False)
+    if user_message:
+        save_user_message(request, chat_room, chat, user_message)
+        # 응답 header 를 보내기 전에 세션 저장 (stream 이 끝나기 전에 SessionMiddleware 가 먼저 실행됨)
+        request.session.save()
+
+    def events():
+        if not user_message:
+            yield sse_event("done", {"answer": "", "product": False, "ttft_ms": None})
+            return
+        ttft = None
+        try:
+            for kind, value in chat.stream(user_message, user_thread, need_user_feedback):
+                if kind == "token":
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    yield sse_event("token", {"text": value})
+                else:
+                    answer, product = save_reply(request, chat_room, value)
+                    request.session.save()
+        except Exception as e:
+            print(f"chat_stream 오류 : {e!r}")
+            yield sse_event("error", {"message": "답변을 만드는 중 오류가 발생했습니다. 다시 시도해 주세요."})
+            return
+
+        total = time.perf_counter() - start
+        ttft_ms = round(ttft * 1000, 1) if ttft is not None else None
+        print(f"chat_stream room={chatroom_pk} TTFT {ttft_ms}ms, 전체 {total * 1000:.1f}ms")
+        yield sse_event("done", {"answer": answer, "product": product is not None, "ttft_ms": ttft_ms})
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx 가 응답을 모았다가 보내지 않도록
+    return response
 
 
 def chatroom_update(request, chatroom_pk):
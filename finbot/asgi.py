@@ -11,7 +11,15 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from finbot.singleton.warmup import warm_up_from_env
+
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "finbot.settings")
+# ASGI 로 실행하면 대화 view 는 async 버전 (chatbot/async_views.py)
+os.environ.setdefault("CHAT_ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
+
+# 모델/Qdrant/OpenAI client 는 처음 사용할 때 초기화 (lazy singleton)
+# FINBOT_WARMUP=1 이면 worker 가 요청을 받기 전에 미리 초기화
+warm_up_from_env()
@@ -0,0 +1,181 @@
+"""
+WSGI vs ASGI 동시 대화 부하 테스트 (worker 1개 당 동시에 처리하는 대화 수)
+- stub OpenAI 서버(고정 latency)로 LLM 답변을 기다리는 시간을 재현
+- gunicorn worker 1개를 sync worker(finbot.wsgi, chatbot/views.py) /
+  uvicorn worker(finbot.asgi, chatbot/async_views.py)로 각각 띄우고,
+  로그인한 사용자 N명이 각자의 채팅방에 동시에 메시지를 POST
+- 동시 사용자 수 별 처리량(req/s), latency p50/p95, 동시에 진행된 LLM 호출 수(stub 의 최대 in-flight) 비교
+- 설정된 DB 에 벤치마크용 사용자/채팅방을 만들고 끝나면 삭제 (checkpoint 는 memory backend, 의도 분류는 규칙만)
+
+실행 명령어
+python -m finbot.bench_asgi --concurrency 1 10 50 100 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import secrets
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from finbot.bench_workers import wait_ready
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SERVERS = {
+    "WSGI": ("finbot.wsgi:application", "sync"),
+    "ASGI": ("finbot.asgi:application", "uvicorn_worker.UvicornWorker"),
+}
+MESSAGE = "오늘 날씨 어때?"  # normal_chat 으로 가는 질문 (LLM 1번)
+
+
+def create_sessions(n_users: int) -> tuple[list[tuple[str, int]], callable]:
+    """
+    벤치마크용 사용자 1명, 채팅방 n_users 개, 로그인 세션 n_users 개 생성
+
+    return (list[(str, int)], callable) : (세션 key, 채팅방 pk) 목록, 정리 함수
+    """
+    from importlib import import_module
+
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+
+    from chatbot.models import ChatRoom
+
+    session_store = import_module(settings.SESSION_ENGINE).SessionStore
+    user = get_user_model().objects.create_user(username=f"bench_{secrets.token_hex(4)}")
+    sessions = []
+    for i in range(n_users):
+        room = ChatRoom.objects.create(user=user, display_id=i + 1, ever_visited=True)
+        session = session_store()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        sessions.append((session.session_key, room.pk))
+
+    def cleanup():
+        for session_key, _ in sessions:
+            session_store(session_key).delete()
+        user.delete()
+
+    return sessions, cleanup
+
+
+async def post_message(client: httpx.AsyncClient, session_key: str, room_pk: int) -> float:
+    """
+    채팅방에 메시지 1건 POST (답변이 DB 에 저장된 뒤의 redirect 까지) 소요 시간
+    """
+    csrf = secrets.token_hex(16)
+    cookies = {"sessionid": session_key, "csrftoken": csrf}
+    start = time.perf_counter()
+    response = await client.post(
+        f"/chat/{room_pk}/", data={"message": MESSAGE}, cookies=cookies, headers={"X-CSRFToken": csrf}
+    )
+    elapsed = time.perf_counter() - start
+    if response.status_code != 302:
+        raise RuntimeError(f"chat/{room_pk}/ 응답 {response.status_code}: {response.text[:300]}")
+    return elapsed
+
+
+async def load(base_url: str, sessions: list[tuple[str, int]], timeout: float) -> tuple[list[float], float]:
+    """
+    모든 세션이 동시에 메시지 1건씩
+
+    return (list[float], float) : 요청별 latency, 전체 시간
+    """
+    limits = httpx.Limits(max_connections=len(sessions))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*[post_message(client, key, pk) for key, pk in sessions])
+        return list(latencies), time.perf_counter() - start
+
+
+def run(name: str, server, sessions: list, concurrency: list[int], port: int, timeout: float) -> list[dict]:
+    """
+    gunicorn worker 1개로 동시 사용자 수 별 부하 테스트
+    """
+    app, worker_class = SERVERS[name]
+    env = {
+        **os.environ,
+        "GUNICORN_WORKERS": "1",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_TIMEOUT": str(int(timeout)),
+    }
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "gunicorn.log"
+        command = [sys.executable, "-m", "gunicorn", app, "-c", "gunicorn.conf.py", "--error-logfile", str(log_path)]
+        proc = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(log_path, 1, timeout)
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(load(base_url, sessions[:1], timeout))  # warm-up (graph compile, OpenAI client)
+            for n in concurrency:
+                server.stats.max_in_flight = 0
+                latencies, total = asyncio.run(load(base_url, sessions[:n], timeout))
+                latencies.sort()
+                rows.append(
+                    {
+                        "server": name,
+                        "users": n,
+                        "throughput": n / total,
+                        "p50_ms": statistics.median(latencies) * 1000,
+                        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+                        "in_flight": server.stats.max_in_flight,
+                    }
+                )
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=30)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="concurrent chat sessions per worker under WSGI and ASGI")
+    parser.add_argument("--concurrency", "-c", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--latency", "-l", type=float, default=1.0, help="stub LLM latency (seconds)")
+    parser.add_argument("--port", type=int, default=18100)
+    parser.add_argument("--timeout", type=float, default=300, help="request / worker timeout (seconds)")
+    args = parser.parse_args()
+
+    from finbot.stub_openai import start_stub_server
+
+    server = start_stub_server(latency=args.latency)
+    os.environ["OPENAI_BASE_URL"] = server.url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "finbot.settings")
+    os.environ.setdefault("CHAT_CHECKPOINT_BACKEND", "memory")
+    os.environ.setdefault("INTENT_CLASSIFIER", "rules")  # 분류 LLM 호출 없이 normal_chat 으로
+    os.environ["LLM_CACHE_NODES"] = ""
+    os.environ.pop("CHAT_ASYNC_VIEWS", None)  # WSGI 는 sync view, ASGI 는 asgi.py 에서 async view
+
+    import django
+
+    django.setup()
+    sessions, cleanup = create_sessions(max(args.concurrency))
+    try:
+        results = []
+        for name in SERVERS:
+            results += run(name, server, sessions, args.concurrency, args.port, args.timeout)
+    finally:
+        cleanup()
+        server.shutdown()
+
+    print("-" * 80)
+    print(f"gunicorn worker 1개, stub LLM latency {args.latency * 1000:.0f}ms, 사용자 당 메시지 1건")
+    print(f"{'server':<6} {'users':>6} {'req/s':>8} {'p50(ms)':>10} {'p95(ms)':>10} {'LLM 동시 호출':>12}")
+    for r in results:
+        print(
+            f"{r['server']:<6} {r['users']:>6} {r['throughput']:>8.2f} {r['p50_ms']:>10.0f} "
+            f"{r['p95_ms']:>10.0f} {r['in_flight']:>12}"
+        )
+    print("-" * 80)
@@ -0,0 +1,140 @@
+"""
+Embedding backend 벤치마크 (torch / onnx / onnx-int8)
+- backend 마다 새 프로세스에서 모델을 로드해서 startup 시간, RSS, query 1건 encode latency 측정
+- torch 벡터 대비 cosine similarity 와 top-3 검색 결과 일치율로 parity 확인
+
+실행 명령어
+python -m finbot.bench_embedding --backends torch onnx onnx-int8 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+
+
+QUERIES = [
+    "금리 높은 예금 추천해줘",
+    "1년 정기예금 중에 이자 제일 많이 주는 상품",
+    "사회초년생 적금 추천",
+    "매달 30만원씩 넣을 적금",
+    "자유적립식 적금 우대금리 조건",
+    "전세자금대출 금리 낮은 곳",
+    "청년 전세대출 한도",
+    "중도상환수수료 없는 전세대출",
+    "저축은행 예금 금리 비교",
+    "비대면 가입 가능한 예금",
+    "6개월 단기 예금",
+    "월급통장 연결하면 우대금리 주는 적금",
+    "서민전용 적금 있어?",
+    "3년 만기 적금 복리 상품",
+    "고정금리 전세자금대출",
+    "변동금리 대출 상품 알려줘",
+    "인터넷은행 예금 추천",
+    "노후 대비 예금",
+    "목돈 굴리기 좋은 예금",
+    "신용카드 실적 없이 우대금리 받는 적금",
+]
+
+
+def run_worker(backend: str, out_path: str, repeat: int, n_docs: int) -> None:
+    """
+    한 backend 측정 (새 프로세스에서 실행)
+    """
+    start = time.perf_counter()
+    os.environ["EMBEDDING_BACKEND"] = backend
+    from finbot.singleton.embedding_model import embed_model
+
+    embed_model.encode(QUERIES[:1], convert_to_numpy=True)  # 첫 호출 warm-up (session/graph 초기화 포함)
+    startup = time.perf_counter() - start
+    rss_loaded = psutil.Process().memory_info().rss
+
+    latencies = []
+    for i in range(repeat):
+        query = QUERIES[i % len(QUERIES)]
+        t = time.perf_counter()
+        embed_model.encode([query], convert_to_numpy=True)
+        latencies.append(time.perf_counter() - t)
+
+    from findata.simple_chunk import make_embedding_ready_text
+    from findata.snapshot import load_products
+
+    docs = [make_embedding_ready_text(p) for p in load_products()][:n_docs]
+    vectors = embed_model.encode(QUERIES + docs, batch_size=32, convert_to_numpy=True)
+    np.save(out_path, vectors)
+
+    print(
+        json.dumps(
+            {
+                "startup_sec": startup,
+                "rss_mb": rss_loaded / 2**20,
+                "peak_rss_mb": psutil.Process().memory_info().rss / 2**20,
+                "p50_ms": float(np.percentile(latencies, 50) * 1000),
+                "p95_ms": float(np.percentile(latencies, 95) * 1000),
+            }
+        )
+    )
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def parity(reference: np.ndarray, vectors: np.ndarray, n_queries: int, topk: int = 3) -> dict:
+    """
+    reference(torch) 대비 row 별 cosine similarity, query 별 top-k 문서 일치율
+    """
+    ref, vec = normalize(reference), normalize(vectors)
+    cosine = (ref * vec).sum(axis=1)
+
+    ref_top = np.argsort(-(ref[:n_queries] @ ref[n_queries:].T), axis=1)[:, :topk]
+    vec_top = np.argsort(-(vec[:n_queries] @ vec[n_queries:].T), axis=1)[:, :topk]
+    overlap = np.mean([len(set(a) & set(b)) / topk for a, b in zip(ref_top, vec_top, strict=True)])
+    return {"cos_mean": float(cosine.mean()), "cos_min": float(cosine.min()), f"top{topk}_overlap": float(overlap)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of embedding inference backends")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--repeat", "-r", type=int, default=200, help="single query encode repeats")
+    parser.add_argument("--n_docs", "-n", type=int, default=300, help="product texts for parity check")
+    parser.add_argument("--min_cos", type=float, default=0.95, help="fail if min cosine vs torch is lower")
+    parser.add_argument("--worker", type=str, help=argparse.SUPPRESS)
+    parser.add_argument("--out", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.out, args.repeat, args.n_docs)
+        sys.exit(0)
+
+    backends = ["torch", *[b for b in args.backends if b != "torch"]]
+    results, vectors = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            out_path = str(Path(tmp) / f"{backend}.npy")
+            command = [sys.executable, "-m", "finbot.bench_embedding", "--worker", backend, "--out", out_path]
+            command += ["--repeat", str(args.repeat), "--n_docs", str(args.n_docs)]
+            start = time.perf_counter()
+            proc = subprocess.run(command, capture_output=True, text=True, check=True)
+            results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+            results[backend]["process_sec"] = time.perf_counter() - start
+            vectors[backend] = np.load(out_path)
+
+    print("-" * 100)
+    header = f"{'backend':<10} {'startup(s)':>10} {'RSS(MB)':>9} {'peak(MB)':>9} {'p50(ms)':>8} {'p95(ms)':>8}"
+    print(f"{header} {'cos mean':>9} {'cos min':>8} {'top3':>6}")
+    for backend in backends:
+        r = results[backend]
+        p = parity(vectors["torch"], vectors[backend], len(QUERIES))
+        row = f"{backend:<10} {r['startup_sec']:>10.2f} {r['rss_mb']:>9.0f} {r['peak_rss_mb']:>9.0f}"
+        row += f" {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}"
+        print(f"{row} {p['cos_mean']:>9.4f} {p['cos_min']:>8.4f} {p['top3_overlap']:>6.2f}")
+        assert p["cos_min"] >= args.min_cos, f"{backend}: torch 대비 cosine {p['cos_min']:.4f} < {args.min_cos}"
+    print("-" * 100)
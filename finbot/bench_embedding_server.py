@@ -0,0 +1,112 @@
+"""
+embedding 서버 micro-batching 벤치마크
+- 동시 사용자 N명이 query 1건씩 encode 하는 상황을 thread 로 재현
+- inline          : 각 thread 가 embed_model.encode 직접 호출 (현재 rag_search 방식)
+- server batch=1  : embedding 서버 경유, 배치 없이 1건씩
+- server batch=B  : embedding 서버 경유, max_wait_ms 안에 들어온 요청을 모아서 encode
+- 처리량(query/s), latency p50/p95, 평균 배치 크기, inline 대비 cosine 확인
+
+실행 명령어
+python -m finbot.bench_embedding_server --concurrency 16 --requests 800
+python -m finbot.bench_embedding_server --transport unix --max_batch 64 --max_wait_ms 10
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from finbot.bench_embedding import QUERIES
+from finbot.embedding_server import start_embedding_server
+from finbot.singleton.embedding_client import EmbeddingClient
+
+
+def run_load(encode, concurrency: int, n_requests: int) -> dict:
+    """
+    concurrency 개 thread 가 n_requests 건을 나눠서 encode
+
+    parameter (callable) encode : query(str) -> vector
+    return dict : qps, p50_ms, p95_ms
+    """
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            query = f"{QUERIES[i % len(QUERIES)]} {i}"  # 캐시가 없어도 매번 다른 문장
+            t = time.perf_counter()
+            encode(query)
+            elapsed = time.perf_counter() - t
+            with lock:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - start
+    return {
+        "qps": n_requests / total,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+    }
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of embedding server micro-batching")
+    parser.add_argument("--concurrency", "-c", type=int, default=16, help="concurrent users (threads)")
+    parser.add_argument("--requests", "-r", type=int, default=800, help="total queries per mode")
+    parser.add_argument("--transport", "-t", choices=["http", "unix"], default="unix")
+    parser.add_argument("--max_batch", type=int, default=32)
+    parser.add_argument("--max_wait_ms", type=float, default=5)
+    args = parser.parse_args()
+
+    from finbot.singleton.embedding_model import EMBED_MODEL_NAME, get_embed_model
+
+    model = get_embed_model()
+    model.encode(QUERIES, convert_to_numpy=True)  # warm-up
+
+    results = {}
+    results["inline"] = run_load(lambda q: model.encode([q], convert_to_numpy=True)[0], args.concurrency, args.requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, max_batch, max_wait_ms in [
+            ("server batch=1", 1, 0),
+            (f"server batch={args.max_batch}", args.max_batch, args.max_wait_ms),
+        ]:
+            socket_path = str(Path(tmp) / "embedding.sock") if args.transport == "unix" else None
+            server = start_embedding_server(
+                model, EMBED_MODEL_NAME, socket_path=socket_path, max_batch=max_batch, max_wait_ms=max_wait_ms
+            )
+            client = EmbeddingClient(server.url)  # fallback 없음: 서버 오류는 그대로 실패
+            reference = model.encode(QUERIES, convert_to_numpy=True)
+            served = client.encode(QUERIES)
+            min_cos = min(cosine(a, b) for a, b in zip(reference, served, strict=True))
+
+            results[name] = run_load(client.encode, args.concurrency, args.requests)
+            results[name].update(server.batcher.stats(), min_cos=min_cos)
+            server.shutdown()
+            server.server_close()
+
+    print("-" * 80)
+    print(f"concurrency={args.concurrency}, requests={args.requests}, transport={args.transport}")
+    print(f"{'mode':<18} {'query/s':>9} {'p50(ms)':>8} {'p95(ms)':>8} {'avg batch':>10} {'cos min':>8}")
+    for name, r in results.items():
+        batch = f"{r['avg_batch']:>10.1f}" if "avg_batch" in r else f"{'-':>10}"
+        cos = f"{r['min_cos']:>8.4f}" if "min_cos" in r else f"{'-':>8}"
+        print(f"{name:<18} {r['qps']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {batch} {cos}")
+    print("-" * 80)
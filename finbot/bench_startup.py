@@ -0,0 +1,105 @@
+"""
+Django 시작 시간 벤치마크
+- manage.py check : 새 프로세스로 여러 번 실행한 wall time (median / max)
+- 첫 요청 latency : 새 프로세스에서 finbot.wsgi import 후 WSGI application 으로 첫 요청, 두 번째 요청 시간
+
+실행 명령어
+python -m finbot.bench_startup --repeat 5 --path /accounts/login/
+FINBOT_WARMUP=1 python -m finbot.bench_startup --path /accounts/login/  # warm-up 비용 포함
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def request(application, path: str) -> tuple[str, float]:
+    """
+    WSGI application 에 GET 요청 1건 (status, 소요 시간)
+    """
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": path, "REQUEST_METHOD": "GET", "wsgi.input": BytesIO()}
+    setup_testing_defaults(environ)
+    result = {}
+
+    def start_response(status, headers, exc_info=None):
+        result["status"] = status
+
+    start = time.perf_counter()
+    body = application(environ, start_response)
+    b"".join(body)
+    return result["status"], time.perf_counter() - start
+
+
+def run_worker(path: str) -> None:
+    """
+    새 프로세스에서 wsgi import + 첫 요청 측정
+    """
+    start = time.perf_counter()
+    from finbot.wsgi import application
+
+    import_sec = time.perf_counter() - start
+    status, first_sec = request(application, path)
+    _, second_sec = request(application, path)
+    heavy = [name for name in ("torch", "sentence_transformers", "qdrant_client", "langgraph") if name in sys.modules]
+    print(
+        json.dumps(
+            {
+                "import_sec": import_sec,
+                "first_sec": first_sec,
+                "second_sec": second_sec,
+                "status": status,
+                "heavy_modules": heavy,
+            }
+        )
+    )
+
+
+def time_command(command: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, cwd=BASE_DIR, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of Django startup and first request")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="number of fresh processes")
+    parser.add_argument("--path", "-p", type=str, default="/accounts/login/", help="first request path")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.path)
+        sys.exit(0)
+
+    checks = [time_command([sys.executable, "manage.py", "check"]) for _ in range(args.repeat)]
+
+    runs = []
+    for _ in range(args.repeat):
+        command = [sys.executable, "-m", "finbot.bench_startup", "--worker", "--path", args.path]
+        start = time.perf_counter()
+        proc = subprocess.run(command, cwd=BASE_DIR, check=True, capture_output=True, text=True)
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        run["process_sec"] = time.perf_counter() - start
+        runs.append(run)
+
+    def median(key: str) -> float:
+        return statistics.median(run[key] for run in runs)
+
+    print("-" * 60)
+    print(f"manage.py check          median {statistics.median(checks):.2f}초  max {max(checks):.2f}초")
+    print(f"wsgi import              median {median('import_sec'):.2f}초")
+    print(f"첫 요청 {args.path:<16} median {median('first_sec') * 1000:.0f}ms  ({runs[0]['status']})")
+    print(f"두 번째 요청             median {median('second_sec') * 1000:.0f}ms")
+    print(f"프로세스 전체            median {median('process_sec'):.2f}초")
+    print(f"로드된 무거운 모듈       {runs[0]['heavy_modules'] or '없음'}")
+    print("-" * 60)
@@ -0,0 +1,95 @@
+"""
+gunicorn multi-worker 메모리 벤치마크 (preload 끄기 / 켜기)
+- 같은 worker 수로 gunicorn 을 띄우고, 모든 worker 가 embedding 모델까지 준비된 뒤 worker 별 RSS/PSS/USS 측정
+- preload 를 켜면 모델 weight 가 master 에서 한 번만 로드되어 PSS 합계(실제 메모리)가 worker 수에 비례해 늘지 않아야 함
+
+실행 명령어
+python -m finbot.bench_workers --workers 4 --requests 20
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from finbot.worker_memory import print_report, summarize, worker_memory
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def wait_ready(log_path: Path, n_workers: int, timeout: float) -> None:
+    """
+    worker 가 모두 post_worker_init 을 마칠 때까지 대기 (gunicorn.conf.py 의 "준비 완료" 로그)
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if log_path.exists() and log_path.read_text().count("준비 완료") >= n_workers:
+            return
+        time.sleep(0.5)
+    raise TimeoutError(f"{timeout}초 안에 worker {n_workers}개가 준비되지 않았습니다.\n{log_path.read_text()}")
+
+
+def run(preload: bool, n_workers: int, port: int, path: str, n_requests: int, warmup: str, timeout: float) -> dict:
+    """
+    gunicorn 1회 실행 후 메모리 측정
+
+    return dict : summarize() 결과 + 준비 시간
+    """
+    env = {
+        **os.environ,
+        "GUNICORN_PRELOAD": "1" if preload else "0",
+        "GUNICORN_WORKERS": str(n_workers),
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "FINBOT_WARMUP": warmup,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "gunicorn.log"
+        command = [sys.executable, "-m", "gunicorn", "finbot.wsgi:application", "-c", "gunicorn.conf.py"]
+        command += ["--error-logfile", str(log_path)]
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(log_path, n_workers, timeout)
+            ready_sec = time.perf_counter() - start
+
+            for _ in range(n_requests):
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}") as response:
+                    response.read()
+
+            rows = worker_memory(proc.pid)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=30)
+
+    print(f"\n[preload={'on' if preload else 'off'}] 준비 {ready_sec:.1f}초, 요청 {n_requests}건")
+    print_report(rows)
+    return {**summarize(rows), "ready_sec": ready_sec}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of gunicorn worker memory with and without preload")
+    parser.add_argument("--workers", "-w", type=int, default=4)
+    parser.add_argument("--requests", "-r", type=int, default=20, help="requests after all workers are ready")
+    parser.add_argument("--path", "-p", type=str, default="/accounts/login/")
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--warmup", type=str, default="embed_model", help="FINBOT_WARMUP for each worker")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for workers")
+    args = parser.parse_args()
+
+    results = {}
+    for preload in (False, True):
+        results[preload] = run(preload, args.workers, args.port, args.path, args.requests, args.warmup, args.timeout)
+
+    print("-" * 70)
+    print(f"{'preload':<8} {'workers':>7} {'RSS 합계':>10} {'PSS 합계':>10} {'worker USS':>11} {'준비(s)':>8}")
+    for preload, r in results.items():
+        pss = f"{r['pss_total_mb']:>10.0f}" if r["pss_total_mb"] is not None else f"{'-':>10}"
+        row = f"{'on' if preload else 'off':<8} {r['workers']:>7} {r['rss_total_mb']:>10.0f} {pss}"
+        print(f"{row} {r['worker_uss_mb']:>11.0f} {r['ready_sec']:>8.1f}")
+    print("-" * 70)
@@ -0,0 +1,30 @@
+"""
+여러 app 에서 같이 쓰는 DB 유틸 (products 옵션 upsert, chatbot checkpoint 저장)
+"""
+
+from django.db import connections, models
+
+
+def bulk_upsert(manager: models.Manager, objs: list, unique_fields: tuple, batch_size: int = 500) -> list:
+    """
+    bulk_create(update_conflicts=True) 기반 set-based upsert
+
+    - unique_fields 가 같은 row는 마지막 값만 남김 (한 INSERT 안에서 같은 row를 두 번 갱신하지 않도록)
+    - unique_fields 를 제외한 나머지 필드를 update_fields 로 갱신
+    - MySQL 처럼 ON CONFLICT 대상 지정을 지원하지 않는 DB는 unique_fields 없이 호출
+      (ON DUPLICATE KEY UPDATE 가 모든 unique 제약을 기준으로 동작)
+    """
+    model = manager.model
+    key_attnames = [model._meta.get_field(name).attname for name in unique_fields]
+
+    deduped = {}
+    for obj in objs:
+        deduped[tuple(getattr(obj, attname) for attname in key_attnames)] = obj
+
+    update_fields = [
+        field.name for field in model._meta.concrete_fields if not field.primary_key and field.name not in unique_fields
+    ]
+    kwargs = {"update_conflicts": True, "update_fields": update_fields}
+    if connections[manager.db].features.supports_update_conflicts_with_target:
+        kwargs["unique_fields"] = list(unique_fields)
+    return manager.bulk_create(list(deduped.values()), batch_size=batch_size, **kwargs)
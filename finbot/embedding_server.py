@@ -0,0 +1,265 @@
+"""
+로컬 embedding 서버 (query micro-batching)
+- web worker 들의 query encode 요청을 한 프로세스에서 모아 짧은 시간(max_wait_ms) 동안 들어온 요청을 한 번에 encode
+  -> 동시 요청이 많을 때 1건씩 encode 하는 것보다 CPU 행렬 연산을 꽉 채워서 처리량이 늘어남
+- 모델은 get_embed_model() 그대로 사용 (EMBEDDING_BACKEND 설정도 동일하게 적용)
+- HTTP(host:port) 또는 Unix socket 으로 접근, client 는 finbot/singleton/embedding_client.py
+
+API
+POST /encode  {"texts": ["..."]}  ->  {"model": ..., "dim": 768, "count": n, "vectors": base64(float32 n x dim)}
+GET  /health  ->  {"status": "ok", "model": ..., "stats": {...}}
+
+실행 명령어
+python -m finbot.embedding_server --socket /tmp/finbot-embedding.sock
+python -m finbot.embedding_server --host 0.0.0.0 --port 8100 --max_batch 32 --max_wait_ms 5
+EMBEDDING_SERVER_URL=unix:///tmp/finbot-embedding.sock gunicorn finbot.wsgi:application -c gunicorn.conf.py
+"""
+
+import argparse
+import base64
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+
+
+class MicroBatcher:
+    """
+    encode 요청을 모아서 배치로 처리하는 단일 worker thread
+
+    - 첫 요청이 들어오면 max_wait_ms 동안(또는 max_batch 개가 찰 때까지) 추가 요청을 기다린 뒤 한 번에 encode
+    - 요청 하나에 text 가 여러 개여도 됨 (배치 안에서 순서대로 잘라서 돌려줌)
+    - encode 가 실패하면 해당 배치의 모든 요청에 예외 전달
+    """
+
+    def __init__(self, model, max_batch: int = EMBEDDING_BATCH_SIZE, max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests: queue.Queue[tuple[list[str], Future]] = queue.Queue()
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+        self.max_batch_seen = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, texts: list[str]) -> Future:
+        """
+        return Future : result() 는 (len(texts), dim) float32 배열
+        """
+        future = Future()
+        self.requests.put((texts, future))
+        return future
+
+    def encode(self, texts: list[str], timeout: float | None = None) -> np.ndarray:
+        return self.submit(texts).result(timeout)
+
+    def collect(self) -> list[tuple[list[str], Future]]:
+        """
+        첫 요청은 올 때까지 기다리고, 이후 max_wait 동안 max_batch 개까지 모음
+        """
+        batch = [self.requests.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def run(self) -> None:
+        while True:
+            batch = self.collect()
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                vectors = self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+                vectors = np.asarray(vectors, dtype=np.float32)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for item_texts, future in batch:
+                future.set_result(vectors[start : start + len(item_texts)])
+                start += len(item_texts)
+            with self.lock:
+                self.batches += 1
+                self.texts += len(texts)
+                self.max_batch_seen = max(self.max_batch_seen, len(texts))
+
+    def stats(self) -> dict:
+        """
+        return dict : batches, texts, 평균/최대 배치 크기
+        """
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "texts": self.texts,
+                "avg_batch": self.texts / self.batches if self.batches else 0.0,
+                "max_batch": self.max_batch_seen,
+            }
+
+
+def encode_vectors(vectors: np.ndarray) -> dict:
+    """
+    float32 배열 -> json 응답 (base64, json float 리스트보다 작고 빠름)
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    return {
+        "dim": int(vectors.shape[1]),
+        "count": int(vectors.shape[0]),
+        "vectors": base64.b64encode(vectors.tobytes()).decode("ascii"),
+    }
+
+
+def decode_vectors(body: dict) -> np.ndarray:
+    """
+    encode_vectors() 의 반대
+    """
+    data = base64.b64decode(body["vectors"])
+    return np.frombuffer(data, dtype=np.float32).reshape(body["count"], body["dim"])
+
+
+class EmbeddingHandler(BaseHTTPRequestHandler):
+    server: "EmbeddingHTTPServer | EmbeddingUnixServer"
+    protocol_version = "HTTP/1.1"  # keep-alive (client 가 연결을 재사용)
+
+    def log_message(self, format, *args):
+        pass
+
+    def address_string(self) -> str:
+        # Unix socket 은 client_address 가 (host, port) 가 아님
+        return str(self.client_address[0]) if isinstance(self.client_address, tuple) else "unix"
+
+    def send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/health":
+            self.send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        self.send_json(200, {"status": "ok", "model": self.server.model_name, "stats": self.server.batcher.stats()})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.rstrip("/") != "/encode":
+            self.send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        texts = body.get("texts")
+        if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+            self.send_json(400, {"error": "texts must be a non-empty list of strings"})
+            return
+        try:
+            vectors = self.server.batcher.encode(texts)
+        except Exception as e:
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self.send_json(200, {"model": self.server.model_name, **encode_vectors(vectors)})
+
+
+class EmbeddingServerMixin:
+    daemon_threads = True
+    request_queue_size = 128
+
+    def setup_embedding(self, batcher: MicroBatcher, model_name: str) -> None:
+        self.batcher = batcher
+        self.model_name = model_name
+
+
+class TCPEmbeddingHandler(EmbeddingHandler):
+    disable_nagle_algorithm = True  # header/body 를 나눠 쓸 때 TCP delayed ACK 로 응답이 지연되지 않도록
+
+
+class EmbeddingHTTPServer(EmbeddingServerMixin, ThreadingHTTPServer):
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class EmbeddingUnixServer(EmbeddingServerMixin, socketserver.ThreadingUnixStreamServer):
+    @property
+    def url(self) -> str:
+        return f"unix://{self.server_address}"
+
+
+def make_server(
+    model,
+    model_name: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    socket_path: str | None = None,
+    max_batch: int = EMBEDDING_BATCH_SIZE,
+    max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS,
+) -> EmbeddingHTTPServer | EmbeddingUnixServer:
+    """
+    embedding 서버 생성 (socket_path 가 있으면 Unix socket, 없으면 HTTP host:port)
+    return : server.url 을 EMBEDDING_SERVER_URL 로 사용, 실행은 server.serve_forever()
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = EmbeddingUnixServer(socket_path, EmbeddingHandler)
+    else:
+        server = EmbeddingHTTPServer((host, port), TCPEmbeddingHandler)
+    server.setup_embedding(MicroBatcher(model, max_batch, max_wait_ms), model_name)
+    return server
+
+
+def start_embedding_server(model, model_name: str, **kwargs) -> EmbeddingHTTPServer | EmbeddingUnixServer:
+    """
+    백그라운드 스레드에서 embedding 서버 실행 (벤치마크/동작 확인용), 종료는 server.shutdown()
+    """
+    server = make_server(model, model_name, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="local embedding server with request micro-batching")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=8100)
+    parser.add_argument("--socket", "-s", type=str, default=None, help="listen on a Unix socket instead of HTTP")
+    parser.add_argument("--max_batch", type=int, default=EMBEDDING_BATCH_SIZE, help="max texts per encode call")
+    parser.add_argument("--max_wait_ms", type=float, default=EMBEDDING_BATCH_WAIT_MS, help="batching window")
+    args = parser.parse_args()
+
+    from finbot.singleton.embedding_model import EMBED_MODEL_NAME, EMBEDDING_BACKEND, get_embed_model
+
+    model = get_embed_model()
+    model.encode(["warm up"], convert_to_numpy=True)
+    server = make_server(
+        model,
+        f"{EMBED_MODEL_NAME}:{EMBEDDING_BACKEND}",
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+    print(f"embedding server : {server.url} (max_batch={args.max_batch}, max_wait_ms={args.max_wait_ms})")
+    server.serve_forever()
@@ -112,6 +112,39 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# query embedding 공유 캐시 (설정하면 gunicorn worker 끼리 embedding 결과를 공유)
+# 예) QUERY_EMBEDDING_CACHE_DIR=/tmp/finbot_query_embeddings
+QUERY_EMBEDDING_CACHE_DIR = os.getenv("QUERY_EMBEDDING_CACHE_DIR")
+if QUERY_EMBEDDING_CACHE_DIR:
+    CACHES["query_embeddings"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": QUERY_EMBEDDING_CACHE_DIR,
+        "TIMEOUT": 60 * 60 * 24 * 7,  # 모델이 같으면 embedding 은 바뀌지 않으므로 길게 유지
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    }
+
+# LLM 응답 공유 캐시 (설정하면 worker 끼리 캐시된 응답(exact match)을 공유, 항목별 TTL 은 llm_cache 정책)
+# 예) LLM_CACHE_DIR=/tmp/finbot_llm_responses
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR")
+if LLM_CACHE_DIR:
+    CACHES["llm_responses"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": LLM_CACHE_DIR,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+
+# 대화 view 를 async 버전(chatbot/async_views.py)으로 사용 (finbot.asgi 로 실행하면 기본 1)
+CHAT_ASYNC_VIEWS = os.getenv("CHAT_ASYNC_VIEWS", "0") == "1"
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
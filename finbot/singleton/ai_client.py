@@ -3,7 +3,9 @@ import sys
 from functools import lru_cache
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from finbot.singleton.lazy import LazySingleton
 
 
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))))
@@ -24,4 +26,22 @@ def get_ai_client():
     return OpenAI(api_key=OPENAI_API_KEY)
 
 
-ai_client = get_ai_client()
+# 처음 요청할 때 생성되는 lazy singleton
+ai_client = LazySingleton(get_ai_client)
+
+
+@lru_cache(maxsize=1)
+def get_async_ai_client():
+    """
+    Async AI Client Singleton instance 생성 (ASGI async view 의 ainvoke / astream 경로)
+    - 요청을 기다리는 동안 event loop 를 막지 않으므로 worker 하나가 여러 대화의 LLM 호출을 동시에 처리
+    - 내부 connection pool 이 event loop 에 묶이므로 같은 loop(uvicorn worker) 안에서만 사용
+
+    parameter () : None
+    return AsyncOpenAI : AsyncOpenAI 객체
+    """
+    print("Singleton Async AI Client를 생성합니다....")
+    return AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
+async_ai_client = LazySingleton(get_async_ai_client)
@@ -1,19 +1,32 @@
+import os
 from functools import lru_cache
 
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.store.memory import InMemoryStore
 
 
+# "db": Django DB(MySQL/SQLite)에 저장 (worker 간 공유, 재시작해도 유지) / "memory": 프로세스 메모리 (개발용)
+CHAT_CHECKPOINT_BACKEND = os.getenv("CHAT_CHECKPOINT_BACKEND", "db")
+# checkpoint 저장 시점 "exit": graph 가 끝나거나 interrupt 될 때만 저장 (turn 당 DB 쓰기 최소화)
+# "async"/"sync": node(step) 마다 저장 (실행 도중 죽어도 마지막 step 부터 재개 가능)
+CHAT_CHECKPOINT_DURABILITY = os.getenv("CHAT_CHECKPOINT_DURABILITY", "exit")
+
+
 @lru_cache(maxsize=1)
 def get_checkpoint():
     """
-    Embedding Model Singleton instance 생성
+    Chatting Checkpoint Singleton instance 생성 (graph compile 할 때 처음 호출)
 
     parameter () : None
-    return MemorySaver, InMemoryStore : 휘발성 memory 객체 생성
+    return BaseCheckpointSaver, InMemoryStore : checkpointer, store 객체
     """
-    print("Chatting Checkpoint를 생성합니다....")
-    return MemorySaver(), InMemoryStore()
+    print(f"Chatting Checkpoint를 생성합니다.... (backend={CHAT_CHECKPOINT_BACKEND})")
+    if CHAT_CHECKPOINT_BACKEND == "memory":
+        return MemorySaver(), InMemoryStore()
+    if CHAT_CHECKPOINT_BACKEND != "db":
+        raise ValueError(f"지원하지 않는 CHAT_CHECKPOINT_BACKEND: {CHAT_CHECKPOINT_BACKEND}")
 
+    # chatbot 모델을 사용하므로 Django 설정이 끝난 뒤 import
+    from chatbot.checkpoint import DjangoCheckpointSaver
 
-memory, memory_store = get_checkpoint()
+    return DjangoCheckpointSaver(), InMemoryStore()
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from finbot.singleton.embedding_client import get_query_encoder
+from finbot.singleton.embedding_model import EMBED_MODEL_NAME, EMBEDDING_BACKEND
+
+
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
+# Django CACHES 에 이 alias 가 있으면 gunicorn worker 끼리 공유하는 2차 캐시로 사용
+SHARED_CACHE_ALIAS = "query_embeddings"
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 key 용 query 정규화
+    - NFKC (전각/반각, 호환 문자 통일), 소문자화
+    - 문장부호 제거, 연속 공백을 하나로
+
+    parameter (str) query : 사용자 질문
+    return str : 정규화된 질문 ("금리 높은 예금 추천!!" == "금리  높은 예금 추천")
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return _whitespace.sub(" ", text).strip()
+
+
+class QueryEmbeddingCache:
+    """
+    정규화한 query -> embedding 벡터 LRU 캐시 (thread-safe)
+
+    1차: 프로세스 내 OrderedDict (maxsize 초과 시 가장 오래 안 쓴 항목 제거)
+    2차: Django cache (SHARED_CACHE_ALIAS 가 설정된 경우, worker 간 공유)
+    """
+
+    def __init__(self, model, model_name: str, maxsize: int = QUERY_EMBEDDING_CACHE_SIZE, shared=None):
+        self.model = model
+        self.model_name = model_name
+        self.maxsize = maxsize
+        self.shared = shared
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, query: str) -> str:
+        normalized = normalize_query(query)
+        return hashlib.sha256(f"{self.model_name}\n{normalized}".encode()).hexdigest()
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self.lock:
+            vector = self.entries.get(key)
+            if vector is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        with self.lock:
+            self.entries[key] = vector
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def encode(self, query: str) -> np.ndarray:
+        """
+        query embedding 반환 (캐시에 없을 때만 모델 호출)
+
+        parameter (str) query : 사용자 질문
+        return np.ndarray : 읽기 전용 float32 벡터
+        """
+        key = self.make_key(query)
+        vector = self.get(key)
+        if vector is not None:
+            return vector
+
+        if self.shared is not None:
+            vector = self.shared.get(f"qemb:{key}")
+            if vector is not None:
+                with self.lock:
+                    self.shared_hits += 1
+                vector.setflags(write=False)
+                self.put(key, vector)
+                return vector
+
+        with self.lock:
+            self.misses += 1
+        vector = np.asarray(self.model.encode([query], convert_to_numpy=True)[0], dtype=np.float32)
+        vector.setflags(write=False)
+        self.put(key, vector)
+        if self.shared is not None:
+            self.shared.set(f"qemb:{key}", vector)
+        return vector
+
+    def stats(self) -> dict:
+        """
+        return dict : size, hits(1차), shared_hits(2차), misses, evictions, hit_rate
+        """
+        with self.lock:
+            total = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.shared_hits) / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+
+def get_shared_cache():
+    """
+    Django settings.CACHES 에 SHARED_CACHE_ALIAS 가 있으면 해당 cache, 없으면 None
+    (Django 밖에서 import 해도 동작하도록 settings 가 설정된 경우만 사용)
+    """
+    from django.conf import settings
+
+    if not settings.configured or SHARED_CACHE_ALIAS not in getattr(settings, "CACHES", {}):
+        return None
+    from django.core.cache import caches
+
+    return caches[SHARED_CACHE_ALIAS]
+
+
+@lru_cache(maxsize=1)
+def get_query_cache():
+    """
+    Query Embedding Cache Singleton instance 생성
+
+    parameter () : None
+    return QueryEmbeddingCache : embed_model 앞단의 query embedding 캐시
+    """
+    print("Singleton Query Embedding Cache를 생성합니다....")
+    # backend 마다 벡터가 조금씩 다르므로 key 에 backend 포함
+    # 캐시에 없는 query 는 embedding 서버(EMBEDDING_SERVER_URL) 또는 프로세스 내 embed_model 로 encode
+    model_name = f"{EMBED_MODEL_NAME}:{EMBEDDING_BACKEND}"
+    return QueryEmbeddingCache(get_query_encoder(), model_name, shared=get_shared_cache())
+
+
+def encode_query(query: str) -> np.ndarray:
+    """
+    캐시를 거쳐 query embedding 반환 (rag_search 등에서 embed_model.encode 대신 사용)
+    """
+    return get_query_cache().encode(query)
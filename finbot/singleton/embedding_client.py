@@ -0,0 +1,148 @@
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import numpy as np
+
+from finbot.embedding_server import decode_vectors
+from finbot.singleton.embedding_model import embed_model
+
+
+# 비워두면 embedding 서버를 쓰지 않고 프로세스 내에서 encode
+# 예) http://127.0.0.1:8100, unix:///tmp/finbot-embedding.sock
+EMBEDDING_SERVER_URL = os.getenv("EMBEDDING_SERVER_URL", "")
+EMBEDDING_SERVER_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_TIMEOUT", "2"))
+# 서버 호출이 실패하면 이 시간(초) 동안은 서버를 건너뛰고 바로 프로세스 내 encode
+EMBEDDING_SERVER_RETRY_AFTER = float(os.getenv("EMBEDDING_SERVER_RETRY_AFTER", "30"))
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    Unix socket 위의 HTTP 연결
+    """
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class EmbeddingClient:
+    """
+    embedding 서버 client (SentenceTransformer.encode 와 같은 방식으로 사용)
+
+    - thread 마다 keep-alive 연결 1개
+    - 서버 호출이 timeout/연결 실패/오류 응답이면 fallback 모델(프로세스 내 embed_model)로 encode
+    - 실패 후 retry_after 초 동안은 서버를 건너뜀 (서버가 죽었을 때 요청마다 timeout 을 기다리지 않도록)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        fallback=None,
+        timeout: float = EMBEDDING_SERVER_TIMEOUT,
+        retry_after: float = EMBEDDING_SERVER_RETRY_AFTER,
+    ):
+        self.url = url
+        self.fallback = fallback
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.skip_until = 0.0
+        self.server_calls = 0
+        self.fallback_calls = 0
+        self.errors = 0
+
+    def connect(self) -> http.client.HTTPConnection:
+        parsed = urlparse(self.url)
+        if parsed.scheme == "unix":
+            return UnixHTTPConnection(parsed.path, self.timeout)
+        if parsed.scheme == "http":
+            return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+        raise ValueError(f"지원하지 않는 EMBEDDING_SERVER_URL: {self.url}")
+
+    def request(self, texts: list[str]) -> np.ndarray:
+        """
+        서버에 encode 요청 (연결은 thread 별로 재사용, 끊어져 있으면 한 번 다시 연결)
+        """
+        data = json.dumps({"texts": texts}, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        for attempt in range(2):
+            conn = getattr(self.local, "conn", None)
+            if conn is None:
+                conn = self.local.conn = self.connect()
+            try:
+                conn.request("POST", "/encode", body=data, headers=headers)
+                response = conn.getresponse()
+                body = json.loads(response.read())
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # 서버가 keep-alive 연결을 닫은 경우 새 연결로 한 번 재시도
+                conn.close()
+                self.local.conn = None
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                self.local.conn = None
+                raise
+            if response.status != 200:
+                raise RuntimeError(f"embedding server {response.status}: {body.get('error')}")
+            return decode_vectors(body)
+        raise RuntimeError("unreachable")
+
+    def encode(self, sentences: str | list[str], convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """
+        parameter (str | list[str]) sentences : encode 할 문장
+        return np.ndarray : (n, dim) float32, sentences 가 str 이면 (dim,)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        vectors = None
+        if time.monotonic() >= self.skip_until:
+            try:
+                vectors = self.request(texts)
+                with self.lock:
+                    self.server_calls += 1
+            except Exception as e:
+                with self.lock:
+                    self.errors += 1
+                    self.skip_until = time.monotonic() + self.retry_after
+                print(f"embedding server 호출 실패, {self.retry_after:.0f}초 동안 프로세스 내 encode 사용: {e!r}")
+
+        if vectors is None:
+            if self.fallback is None:
+                raise RuntimeError(f"embedding server 를 사용할 수 없습니다: {self.url}")
+            vectors = np.asarray(self.fallback.encode(texts, convert_to_numpy=True, **kwargs), dtype=np.float32)
+            with self.lock:
+                self.fallback_calls += 1
+        return vectors[0] if single else vectors
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"server_calls": self.server_calls, "fallback_calls": self.fallback_calls, "errors": self.errors}
+
+
+@lru_cache(maxsize=1)
+def get_query_encoder():
+    """
+    query encode 에 쓸 모델 Singleton
+    - EMBEDDING_SERVER_URL 이 있으면 embedding 서버 client (실패 시 embed_model 로 fallback)
+    - 없으면 embed_model (프로세스 내 encode)
+    """
+    if not EMBEDDING_SERVER_URL:
+        return embed_model
+    print(f"Singleton Embedding Server Client를 생성합니다.... ({EMBEDDING_SERVER_URL})")
+    return EmbeddingClient(EMBEDDING_SERVER_URL, fallback=embed_model)
@@ -1,6 +1,75 @@
+import os
 from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from sentence_transformers import SentenceTransformer
+from finbot.singleton.lazy import LazySingleton
+
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+EMBED_MODEL_NAME = "BM-K/KoSimCSE-roberta-multitask"
+
+# 추론 backend: "torch" (기본), "onnx" (ONNX Runtime fp32), "onnx-int8" (ONNX Runtime + int8 dynamic quantization)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# int8 양자화 대상 CPU 명령어 집합: "avx2", "avx512", "avx512_vnni", "arm64"
+EMBEDDING_QUANT_CONFIG = os.getenv("EMBEDDING_QUANT_CONFIG", "avx2")
+# export 한 ONNX 모델 저장 위치 (처음 한 번 export 후 재사용)
+onnx_model_path = Path(os.getenv("EMBEDDING_ONNX_PATH", BASE_DIR / "finbot" / "models" / "kosimcse-onnx"))
+
+
+def quantized_file_name(quant_config: str = EMBEDDING_QUANT_CONFIG) -> str:
+    """
+    int8 양자화 모델 파일 이름 (export 기본 이름은 weight dtype 에 따라 qint8/quint8 로 달라지므로 고정)
+    """
+    return f"onnx/model_int8_{quant_config}.onnx"
+
+
+def export_onnx_model(path: Path = onnx_model_path, quant_config: str = EMBEDDING_QUANT_CONFIG) -> Path:
+    """
+    KoSimCSE 모델을 ONNX 로 export 하고 int8 dynamic quantization 모델도 함께 저장
+
+    parameter (Path) path : 저장 폴더 (tokenizer, pooling 설정, onnx/model.onnx, onnx/model_int8_*.onnx)
+    parameter (str) quant_config : 양자화 대상 CPU 명령어 집합
+    return Path : 저장 폴더
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    print(f"ONNX 모델을 export 합니다.... ({path})")
+    model = SentenceTransformer(EMBED_MODEL_NAME, backend="onnx")
+    model.save_pretrained(str(path))
+    export_dynamic_quantized_onnx_model(model, quant_config, str(path), file_suffix=f"int8_{quant_config}")
+    return path
+
+
+def load_embed_model(backend: str = EMBEDDING_BACKEND) -> "SentenceTransformer":
+    """
+    backend 에 맞는 SentenceTransformer 생성 (encode 사용법은 모든 backend 동일)
+
+    parameter (str) backend : "torch", "onnx", "onnx-int8"
+    return SentenceTransformer : Embedding Model 객체
+    """
+    # torch/transformers import 가 무거우므로 실제로 모델을 만들 때 import
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(EMBED_MODEL_NAME)
+
+    if backend not in ("onnx", "onnx-int8"):
+        raise ValueError(f"지원하지 않는 EMBEDDING_BACKEND: {backend}")
+
+    quant_file = quantized_file_name(EMBEDDING_QUANT_CONFIG)
+    if not (onnx_model_path / quant_file).exists():
+        export_onnx_model(onnx_model_path, EMBEDDING_QUANT_CONFIG)
+    file_name = quant_file if backend == "onnx-int8" else "onnx/model.onnx"
+    return SentenceTransformer(
+        str(onnx_model_path),
+        backend="onnx",
+        model_kwargs={"file_name": file_name, "provider": "CPUExecutionProvider"},
+    )
 
 
 @lru_cache(maxsize=1)
@@ -9,10 +78,11 @@ def get_embed_model():
     Embedding Model Singleton instance 생성
 
     parameter () : None
-    return BGEM3FlagModel : BGEM3FlagModel Embedding Model 객체
+    return SentenceTransformer : EMBEDDING_BACKEND 에 맞는 Embedding Model 객체
     """
-    print("Singleton Embedding Model을 생성합니다....")
-    return SentenceTransformer("BM-K/KoSimCSE-roberta-multitask")
+    print(f"Singleton Embedding Model을 생성합니다.... (backend={EMBEDDING_BACKEND})")
+    return load_embed_model(EMBEDDING_BACKEND)
 
 
-embed_model = get_embed_model()
+# 처음 encode 할 때 로드되는 lazy singleton
+embed_model = LazySingleton(get_embed_model)
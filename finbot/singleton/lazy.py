@@ -0,0 +1,40 @@
+import threading
+
+from django.utils.functional import LazyObject, empty
+
+
+class LazySingleton(LazyObject):
+    """
+    처음 사용할 때 factory()로 객체를 만드는 thread-safe proxy
+
+    - import 시점에는 아무것도 만들지 않으므로 manage.py 명령, RAG 를 쓰지 않는 페이지는 비용이 없음
+    - 여러 스레드가 동시에 처음 접근해도 factory()는 한 번만 호출 (lock)
+    - 속성 접근/메서드 호출은 만들어진 객체로 그대로 전달
+
+    사용 예)
+        embed_model = LazySingleton(get_embed_model)
+        embed_model.encode([...])  # 여기서 모델 로드
+    """
+
+    def __init__(self, factory):
+        # LazyObject.__setattr__ 는 wrapped 객체로 전달하므로 __dict__ 에 직접 저장
+        self.__dict__["_factory"] = factory
+        self.__dict__["_lock"] = threading.Lock()
+        super().__init__()
+
+    def _setup(self):
+        with self._lock:
+            if self._wrapped is empty:
+                self._wrapped = self._factory()
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._wrapped is not empty
+
+    def get(self):
+        """
+        proxy 가 아닌 실제 객체 반환 (필요하면 이때 생성)
+        """
+        if self._wrapped is empty:
+            self._setup()
+        return self._wrapped
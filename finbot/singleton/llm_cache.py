@@ -0,0 +1,343 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from finbot.singleton.embedding_cache import normalize_query
+
+
+# 캐시를 사용할 node (쉼표 구분, 빈 값이면 사용 안 함)
+LLM_CACHE_NODES = os.getenv("LLM_CACHE_NODES", "fin_word_explain,nth_conversation,classify_feedback")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))  # 초
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.95"))  # 유사 질문으로 볼 최소 cosine
+# 유사 질문의 응답도 재사용할 node (쉼표 구분, 기본은 사용 안 함)
+# "복리가 뭐야?" / "단리가 뭐야?" 처럼 용어만 다른 질문도 cosine 이 높게 나올 수 있으므로
+# python -m rag_flow.bench_llm_cache --term_swap 으로 실제 embedding 모델의 오답 hit 비율을 확인한 뒤 사용
+LLM_CACHE_SEMANTIC_NODES = {
+    node.strip() for node in os.getenv("LLM_CACHE_SEMANTIC_NODES", "").split(",") if node.strip()
+}
+# Django CACHES 에 이 alias 가 있으면 gunicorn worker 끼리 공유하는 2차 캐시로 사용 (exact match 만)
+SHARED_CACHE_ALIAS = "llm_responses"
+
+
+@dataclass(frozen=True)
+class NodeCachePolicy:
+    ttl: float = LLM_CACHE_TTL
+    semantic: bool = False  # True 면 exact miss 일 때 embedding 유사도로도 검색
+
+
+# node 별 정책 (여기에 없는 node 는 LLM_CACHE_NODES 에 있어도 exact match 만)
+# - fin_word_explain : 용어 설명은 표현이 조금 달라도 같은 답 ("예금자보호가 뭐야" / "예금자 보호란?")
+#   LLM_CACHE_SEMANTIC_NODES 에 넣었을 때만 유사 질문 재사용
+# - classify_feedback : "응" / "아니" 처럼 짧은 답은 embedding 이 비슷해서 exact match 만
+NODE_CACHE_POLICIES = {
+    "fin_word_explain": NodeCachePolicy(semantic="fin_word_explain" in LLM_CACHE_SEMANTIC_NODES),
+    "nth_conversation": NodeCachePolicy(),
+    "classify_feedback": NodeCachePolicy(ttl=3600),
+}
+
+
+@dataclass
+class CacheEntry:
+    response: str
+    expires_at: float
+    bucket: str | None = None  # semantic 검색 그룹 (node + query 를 뺀 prompt)
+    vector: np.ndarray | None = None
+
+
+class NodeStats:
+    """
+    node 별 hit/miss 수와 최근 latency (hit: 캐시 조회 시간, miss: LLM 호출 포함 시간)
+    """
+
+    def __init__(self, window: int = 1000):
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.hit_latencies: deque[float] = deque(maxlen=window)
+        self.miss_latencies: deque[float] = deque(maxlen=window)
+
+    def summary(self) -> dict:
+        hits = self.exact_hits + self.semantic_hits + self.shared_hits
+        total = hits + self.misses
+
+        def ms(values, q):
+            return float(np.percentile(values, q) * 1000) if values else 0.0
+
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "hit_p50_ms": ms(self.hit_latencies, 50),
+            "hit_p95_ms": ms(self.hit_latencies, 95),
+            "miss_p50_ms": ms(self.miss_latencies, 50),
+            "miss_p95_ms": ms(self.miss_latencies, 95),
+            # hit 1건 당 절약한 시간 (LLM 호출 latency - 캐시 조회 latency)
+            "saved_p50_ms": max(ms(self.miss_latencies, 50) - ms(self.hit_latencies, 50), 0.0),
+            "saved_p95_ms": max(ms(self.miss_latencies, 95) - ms(self.hit_latencies, 95), 0.0),
+        }
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시 (thread-safe)
+
+    1. exact : 정규화한 prompt(messages) + model 의 hash 로 조회
+    2. shared : Django cache (SHARED_CACHE_ALIAS 가 설정된 경우, worker 간 공유)
+    3. semantic : 같은 node, 같은 prompt 틀(query 를 뺀 나머지)에서 query embedding cosine >= similarity 인 응답
+
+    - 항목마다 TTL, 전체 maxsize 초과 시 가장 오래 안 쓴 항목 제거 (LRU)
+    - nodes 에 없는 node 는 캐시 없이 바로 LLM 호출
+    """
+
+    def __init__(
+        self,
+        nodes: set[str],
+        encode=None,
+        maxsize: int = LLM_CACHE_SIZE,
+        similarity: float = LLM_CACHE_SIMILARITY,
+        policies: dict[str, NodeCachePolicy] = NODE_CACHE_POLICIES,
+        shared=None,
+    ):
+        self.nodes = nodes
+        self.encode = encode
+        self.maxsize = maxsize
+        self.similarity = similarity
+        self.policies = policies
+        self.shared = shared
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.buckets: dict[str, dict[str, np.ndarray]] = defaultdict(dict)
+        self.node_stats: dict[str, NodeStats] = defaultdict(NodeStats)
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(node: str, model: str, messages: list[dict]) -> str:
+        text = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(f"{node}\n{model}\n{normalize_query(text)}".encode()).hexdigest()
+
+    @staticmethod
+    def make_bucket(node: str, model: str, messages: list[dict], query: str) -> str:
+        # prompt 에서 query 부분만 비운 틀이 같아야 유사 query 의 응답을 재사용
+        text = json.dumps(messages, ensure_ascii=False, sort_keys=True).replace(query, "\0")
+        return hashlib.sha256(f"{node}\n{model}\n{text}".encode()).hexdigest()
+
+    def remove(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None and entry.bucket is not None:
+            bucket = self.buckets.get(entry.bucket)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.buckets[entry.bucket]
+
+    def get_exact(self, key: str) -> str | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self.remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry.response
+
+    def get_similar(self, bucket_key: str, vector: np.ndarray) -> str | None:
+        with self.lock:
+            bucket = self.buckets.get(bucket_key)
+            if not bucket:
+                return None
+            keys = list(bucket)
+            sims = np.stack([bucket[key] for key in keys]) @ vector
+            for i in np.argsort(-sims):
+                if sims[i] < self.similarity:
+                    return None
+                entry = self.entries[keys[i]]
+                if entry.expires_at <= time.time():
+                    continue
+                self.entries.move_to_end(keys[i])
+                return entry.response
+            return None
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self.lock:
+            self.remove(key)
+            self.entries[key] = entry
+            if entry.bucket is not None:
+                self.buckets[entry.bucket][key] = entry.vector
+            while len(self.entries) > self.maxsize:
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def embed(self, query: str) -> np.ndarray | None:
+        """
+        semantic 검색용 정규화된 query 벡터 (모델 오류 시 None -> semantic 검색 생략)
+        """
+        try:
+            vector = np.asarray(self.encode(query), dtype=np.float32)
+        except Exception as e:
+            print(f"LLM 캐시 embedding 실패, exact match 만 사용합니다: {e!r}")
+            return None
+        return vector / np.linalg.norm(vector)
+
+    def record(self, node: str, kind: str, elapsed: float) -> None:
+        with self.lock:
+            stats = self.node_stats[node]
+            if kind == "miss":
+                stats.misses += 1
+                stats.miss_latencies.append(elapsed)
+            else:
+                setattr(stats, f"{kind}_hits", getattr(stats, f"{kind}_hits") + 1)
+                stats.hit_latencies.append(elapsed)
+
+    def lookup(self, node: str, model: str, messages: list[dict], query: str | None = None):
+        """
+        캐시 조회 (get_or_call / aget_or_call 공통)
+
+        return (str | None, tuple | None) : (캐시된 응답, miss 일 때 store 에 넘길 pending)
+        """
+        start = time.perf_counter()
+        policy = self.policies.get(node, NodeCachePolicy())
+        key = self.make_key(node, model, messages)
+
+        response = self.get_exact(key)
+        if response is not None:
+            self.record(node, "exact", time.perf_counter() - start)
+            return response, None
+
+        if self.shared is not None:
+            response = self.shared.get(f"llm:{key}")
+            if response is not None:
+                self.put(key, CacheEntry(response, time.time() + policy.ttl))
+                self.record(node, "shared", time.perf_counter() - start)
+                return response, None
+
+        bucket = vector = None
+        if policy.semantic and query and self.encode is not None:
+            vector = self.embed(query)
+            if vector is not None:
+                bucket = self.make_bucket(node, model, messages, query)
+                response = self.get_similar(bucket, vector)
+                if response is not None:
+                    self.record(node, "semantic", time.perf_counter() - start)
+                    return response, None
+
+        return None, (node, key, policy, bucket, vector, start)
+
+    def store(self, pending: tuple, response: str) -> None:
+        node, key, policy, bucket, vector, start = pending
+        self.put(key, CacheEntry(response, time.time() + policy.ttl, bucket, vector))
+        if self.shared is not None:
+            self.shared.set(f"llm:{key}", response, timeout=policy.ttl)
+        self.record(node, "miss", time.perf_counter() - start)
+
+    def get_or_call(self, node: str, model: str, messages: list[dict], call, query: str | None = None) -> str:
+        """
+        캐시에 있으면 저장된 응답, 없으면 call() 로 LLM 호출 후 저장
+
+        parameter (str) node : graph node 이름 (opt-in / 정책 / 통계 단위)
+        parameter (str) model : LLM 모델 이름 (key 에 포함)
+        parameter (list[dict]) messages : LLM 에 보내는 messages (exact key)
+        parameter (callable) call : () -> str, 캐시에 없을 때 LLM 호출
+        parameter (str) query : messages 안의 사용자 입력 (semantic 검색용, None 이면 exact 만)
+        return str : LLM 응답
+        """
+        if node not in self.nodes:
+            return call()
+
+        response, pending = self.lookup(node, model, messages, query)
+        if pending is None:
+            return response
+        response = call()
+        self.store(pending, response)
+        return response
+
+    async def aget_or_call(self, node: str, model: str, messages: list[dict], acall, query: str | None = None) -> str:
+        """
+        get_or_call 의 async 버전
+        - 조회(embedding 계산, shared cache 파일 IO)는 thread 에서, LLM 호출은 await acall()
+
+        parameter (callable) acall : async () -> str, 캐시에 없을 때 LLM 호출
+        """
+        if node not in self.nodes:
+            return await acall()
+
+        response, pending = await asyncio.to_thread(self.lookup, node, model, messages, query)
+        if pending is None:
+            return response
+        response = await acall()
+        await asyncio.to_thread(self.store, pending, response)
+        return response
+
+    def stats(self) -> dict:
+        """
+        return dict : 전체 size/evictions 와 node 별 hit rate, hit/miss latency p50/p95, 절약한 시간
+        """
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "evictions": self.evictions,
+                "nodes": {node: stats.summary() for node, stats in self.node_stats.items()},
+            }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.buckets.clear()
+            self.node_stats.clear()
+            self.evictions = 0
+
+
+def get_shared_cache():
+    """
+    Django settings.CACHES 에 SHARED_CACHE_ALIAS 가 있으면 해당 cache, 없으면 None
+    """
+    from django.conf import settings
+
+    if not settings.configured or SHARED_CACHE_ALIAS not in getattr(settings, "CACHES", {}):
+        return None
+    from django.core.cache import caches
+
+    return caches[SHARED_CACHE_ALIAS]
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> LLMResponseCache:
+    """
+    LLM Response Cache Singleton instance 생성
+
+    parameter () : None
+    return LLMResponseCache : LLM_CACHE_NODES 에 있는 node 의 응답 캐시
+    """
+    from finbot.singleton.embedding_cache import encode_query
+
+    print("Singleton LLM Response Cache를 생성합니다....")
+    nodes = {node.strip() for node in LLM_CACHE_NODES.split(",") if node.strip()}
+    # semantic 검색 embedding 은 query embedding 캐시를 거치므로 같은 질문은 한 번만 encode
+    return LLMResponseCache(nodes, encode=encode_query, shared=get_shared_cache())
+
+
+def cached_llm_response(node: str, model: str, messages: list[dict], call, query: str | None = None) -> str:
+    """
+    node 에서 사용: get_llm_cache().get_or_call(...) 와 같음
+    """
+    return get_llm_cache().get_or_call(node, model, messages, call, query=query)
+
+
+async def acached_llm_response(node: str, model: str, messages: list[dict], acall, query: str | None = None) -> str:
+    """
+    async node 에서 사용: get_llm_cache().aget_or_call(...) 와 같음
+    """
+    return await get_llm_cache().aget_or_call(node, model, messages, acall, query=query)
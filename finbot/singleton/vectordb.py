@@ -1,7 +1,11 @@
-from functools import lru_cache
+import os
+from functools import lru_cache, partial
 from pathlib import Path
 
-from findata.vector_db import get_qdrant_local, get_qdrant_server
+from qdrant_client import AsyncQdrantClient
+
+from finbot.singleton.lazy import LazySingleton
+from findata.vector_db import QDRANT_COLLECTION, get_qdrant_local, get_qdrant_server
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -9,27 +13,43 @@ vectordb_path = BASE_DIR / "findata" / "qdrant_localdb"
 
 
 @lru_cache(maxsize=1)
-def get_qdrant_client(category="all", save_to="server"):
+def get_qdrant_client(save_to="server"):
     """
     Qdrant 서버용 Singleton Client 생성
     - get_ready_search()는 (model, client)을 반환하므로
       여기서는 client만 반환하면 된다.
+    - 모든 카테고리가 collection 1개(QDRANT_COLLECTION)에 있고 카테고리 검색은 payload category filter
 
     Embedding Model Singleton instance 생성
 
-    parameter (str) : category 지정
+    parameter (str) save_to : "server" 또는 "local"
     return QdrnatClient : QdrnatClient Vector DB Client 객체
     """
-    collection_name = "finance_products"
-    db_collection_name = f"{collection_name}_{category}"
     if save_to == "server":
-        qdrant_client = get_qdrant_server(collection_name=db_collection_name)
+        qdrant_client = get_qdrant_server(collection_name=QDRANT_COLLECTION)
     elif save_to == "local":
-        qdrant_client = get_qdrant_local(collection_name=collection_name, category=category, path=vectordb_path)
+        qdrant_client = get_qdrant_local(collection_name=QDRANT_COLLECTION, path=vectordb_path)
         print(f"Local Vector DB Path : {vectordb_path}")
-    print(f"Singleton Qdrant Client를 생성했습니다 (Qdrant {save_to} 모드).")
+    print(f"Singleton Qdrant Client를 생성했습니다 (Qdrant {save_to} 모드, collection {QDRANT_COLLECTION}).")
     return qdrant_client
 
 
-# 앱 전역에서 사용할 싱글톤 QdrantClient
-qdrant_client = get_qdrant_client(save_to="server")
+# 앱 전역에서 사용할 싱글톤 QdrantClient (처음 검색할 때 연결)
+qdrant_client = LazySingleton(partial(get_qdrant_client, save_to="server"))
+
+
+@lru_cache(maxsize=1)
+def get_async_qdrant_client():
+    """
+    Qdrant 서버용 Async Singleton Client 생성 (ASGI async view 의 ainvoke / astream 경로)
+    - collection 생성은 동기 client(get_qdrant_client)와 데이터 적재 단계에서 하므로 여기서는 연결만
+
+    parameter () : None
+    return AsyncQdrantClient : Async Vector DB Client 객체
+    """
+    qdrant_url = os.getenv("QDRANT_URL", "http://qdrant:6333")
+    print(f"Singleton Async Qdrant Client를 생성했습니다 ({qdrant_url}).")
+    return AsyncQdrantClient(url=qdrant_url)
+
+
+async_qdrant_client = LazySingleton(get_async_qdrant_client)
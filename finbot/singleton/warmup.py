@@ -0,0 +1,119 @@
+import gc
+import os
+import time
+
+
+WARMUP_COMPONENTS = ("ai_client", "embed_model", "intent", "qdrant_client", "retriever", "graph")
+
+
+def warm_up(components: tuple[str, ...] = WARMUP_COMPONENTS) -> dict[str, float]:
+    """
+    lazy singleton 을 미리 초기화 (첫 사용자 요청이 모델 로드 시간을 기다리지 않도록)
+    - FINBOT_WARMUP=1 이면 wsgi/asgi 에서 application 생성 직후 호출
+    - FINBOT_WARMUP=embed_model,qdrant_client 처럼 일부만 지정 가능
+
+    parameter (tuple[str]) components : 초기화할 대상
+    return dict : 대상별 초기화 시간(초)
+    """
+    elapsed = {}
+    for name in components:
+        start = time.perf_counter()
+        if name == "ai_client":
+            from finbot.singleton.ai_client import ai_client
+
+            ai_client.get()
+        elif name == "embed_model":
+            from finbot.singleton.embedding_cache import get_query_cache
+
+            # 첫 encode 에서 생기는 초기화 비용까지 미리 (캐시에는 남기지 않음)
+            get_query_cache().model.encode(["warm up"], convert_to_numpy=True)
+        elif name == "intent":
+            from rag_flow.intent import get_intent_classifier
+
+            # 예시 질문 임베딩 -> centroid 계산
+            classifier = get_intent_classifier()
+            if classifier is not None and classifier.encode is not None:
+                classifier.fit()
+        elif name == "qdrant_client":
+            from finbot.singleton.vectordb import qdrant_client
+
+            qdrant_client.get()
+        elif name == "retriever":
+            from rag_flow.retrieval import get_retriever
+
+            # BM25 index (만들 수 없으면 검색할 때 dense 만 사용), reranker 모델
+            retriever = get_retriever()
+            retriever.sparse_search("")
+            if retriever.reranker is not None:
+                retriever.reranker.warm_up()
+        elif name == "graph":
+            from rag_flow.graph_flow import app_graph
+
+            app_graph.get()
+        else:
+            raise ValueError(f"알 수 없는 warm-up 대상: {name}")
+        elapsed[name] = time.perf_counter() - start
+    print("warm-up 완료: " + ", ".join(f"{name} {sec:.2f}초" for name, sec in elapsed.items()))
+    return elapsed
+
+
+def parse_warmup(value: str) -> tuple[str, ...]:
+    """
+    FINBOT_WARMUP 값 해석 ("", "0": 안 함 / "1": 전체 / "a,b": 일부)
+    """
+    value = value.strip()
+    if value in ("", "0", "false"):
+        return ()
+    if value in ("1", "true", "all"):
+        return WARMUP_COMPONENTS
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+def warm_up_from_env(value: str | None = None) -> None:
+    """
+    FINBOT_WARMUP 환경변수(또는 value)에 따라 warm_up 실행
+    """
+    components = parse_warmup(os.getenv("FINBOT_WARMUP", "") if value is None else value)
+    if components:
+        warm_up(components)
+
+
+def configure_torch_threads(num_threads: int) -> None:
+    """
+    torch intra-op thread 수 설정 (worker 여러 개가 CPU 코어를 나눠 쓰도록, torch 가 없으면 무시)
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+
+
+def preload_for_fork(num_threads: int) -> float:
+    """
+    gunicorn master 에서 worker fork 전에 embedding 모델 weight 를 로드 (preload_app)
+    - fork 된 worker 들은 weight 메모리를 copy-on-write 로 공유하므로 worker 를 늘려도 모델 메모리는 1벌
+    - master 에서는 추론하지 않음 (OpenMP thread pool 이 생긴 뒤 fork 하면 worker 의 torch 연산이 멈출 수 있음)
+    - onnx backend 는 session 생성 시 thread pool 을 만들기 때문에 preload 하지 않고 worker 마다 로드
+    - embedding 서버를 쓰면 worker 는 모델이 필요 없으므로 (fallback 때만 로드) preload 하지 않음
+    - 마지막 gc.freeze() : 로드된 객체를 GC 추적에서 빼서 worker 의 GC 가 페이지를 건드려 복사되는 것을 방지
+
+    parameter (int) num_threads : worker 당 torch thread 수
+    return float : 로드 시간(초)
+    """
+    from finbot.singleton.embedding_client import EMBEDDING_SERVER_URL
+    from finbot.singleton.embedding_model import EMBEDDING_BACKEND, embed_model
+
+    start = time.perf_counter()
+    if EMBEDDING_SERVER_URL:
+        print(f"EMBEDDING_SERVER_URL={EMBEDDING_SERVER_URL} 를 사용하므로 모델을 preload 하지 않습니다")
+    elif EMBEDDING_BACKEND == "torch":
+        configure_torch_threads(num_threads)
+        embed_model.get()
+    else:
+        print(f"EMBEDDING_BACKEND={EMBEDDING_BACKEND} 는 fork 전에 로드하지 않습니다 (worker 마다 로드)")
+    gc.collect()
+    gc.freeze()
+    elapsed = time.perf_counter() - start
+    print(f"preload 완료: embed_model {elapsed:.2f}초, gc.freeze {gc.get_freeze_count()}개 객체")
+    return elapsed
@@ -0,0 +1,252 @@
+"""
+로컬 OpenAI 호환 stub 서버 (벤치마크/동작 확인용)
+- POST /v1/chat/completions, /v1/responses 지원, 실제 모델 대신 고정 지연(latency) 후 결정적인 답변을 반환
+- response_format 이 json_schema 이면 schema 에 맞는 JSON 을 반환 (enum 은 마지막 값, structured output 확인용)
+- 요청 수, 최대 동시 요청 수를 기록해서 rate limit/동시성 확인에 사용
+- rate_limit_every > 0 이면 N번째 요청마다 429를 반환 (재시도 확인용)
+- chat.completions 의 stream=True 는 SSE chunk 로 응답 (latency 후 첫 token, 이후 token_latency 마다 한 token)
+  tokens > 0 이면 답변 뒤에 token 을 더 붙여서 긴 답변 생성 시간을 재현 (stream 이 아니면 전체 생성 후 한 번에 응답)
+
+실행 명령어
+python -m finbot.stub_openai --port 8001 --latency 0.3
+python -m finbot.stub_openai --port 8001 --latency 0.3 --tokens 100 --token_latency 0.02
+OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub python -m findata.main
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubStats:
+    """
+    stub 서버 요청 통계 (thread-safe)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def enter(self) -> int:
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.requests
+
+    def leave(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+
+def make_completion(model: str, content: str) -> dict:
+    """
+    chat.completion 응답 json
+    """
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def make_chunk(model: str, delta: dict, finish_reason: str | None = None) -> dict:
+    """
+    chat.completion.chunk (stream=True) 응답 json
+    """
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def sample_from_schema(schema: dict, defs: dict | None = None):
+    """
+    JSON schema 에 맞는 결정적인 값 생성 (enum 은 마지막 값(보통 '그외' 분기), 나머지는 타입별 기본값)
+    """
+    defs = schema.get("$defs", {}) if defs is None else defs
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][-1]
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"] or schema["anyOf"]
+        return sample_from_schema(options[0], defs)
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+    if schema_type == "object":
+        return {key: sample_from_schema(value, defs) for key, value in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return []
+    return {"string": "stub", "integer": 0, "number": 0.0, "boolean": False}.get(schema_type)
+
+
+def make_response(model: str, content: str) -> dict:
+    """
+    responses API 응답 json (output_text 로 content 를 읽을 수 있는 최소 형식)
+    """
+    return {
+        "id": "resp-stub",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "id": "msg-stub",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": content, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, model: str, content: str) -> None:
+        """
+        content 를 띄어쓰기 단위 token 으로 나눠서 SSE 로 전송 (연결 종료로 응답 끝을 알림)
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        words = content.split(" ")
+        tokens = [words[0]] + [f" {word}" for word in words[1:]]
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.server.token_latency)
+            delta = {"role": "assistant", "content": token} if i == 0 else {"content": token}
+            self.wfile.write(f"data: {json.dumps(make_chunk(model, delta), ensure_ascii=False)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(f"data: {json.dumps(make_chunk(model, {}, 'stop'))}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+        if path not in ("/v1/chat/completions", "/v1/responses"):
+            self.send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        stats = self.server.stats
+        n = stats.enter()
+        try:
+            time.sleep(self.server.latency)  # 첫 token 까지의 시간
+            if self.server.rate_limit_every and n % self.server.rate_limit_every == 0:
+                self.send_json(429, {"error": {"message": "stub rate limit", "type": "rate_limit_exceeded"}})
+                return
+            response_format = body.get("response_format") or {}
+            if response_format.get("type") == "json_schema":
+                content = json.dumps(sample_from_schema(response_format["json_schema"]["schema"]), ensure_ascii=False)
+            else:
+                prompt = json.dumps(body.get("messages", body.get("input", [])), ensure_ascii=False)
+                digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+                content = f"stub 응답 {digest}" + "".join(f" 토큰{i}" for i in range(self.server.tokens))
+            model = body.get("model", "stub")
+            if body.get("stream") and path == "/v1/chat/completions":
+                self.send_stream(model, content)
+                return
+            time.sleep(self.server.token_latency * self.server.tokens)  # 나머지 token 생성 시간
+            make = make_completion if path == "/v1/chat/completions" else make_response
+            self.send_json(200, make(model, content))
+        finally:
+            stats.leave()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 동시 접속 테스트 시 listen backlog 부족으로 연결이 지연되지 않도록
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        latency: float,
+        rate_limit_every: int,
+        tokens: int = 0,
+        token_latency: float = 0.0,
+    ):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.tokens = tokens
+        self.token_latency = token_latency
+        self.stats = StubStats()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.2,
+    rate_limit_every: int = 0,
+    tokens: int = 0,
+    token_latency: float = 0.0,
+) -> StubServer:
+    """
+    백그라운드 스레드에서 stub 서버 실행 (port=0이면 빈 포트 사용)
+    return : (StubServer) server.url 을 OpenAI base_url로 사용, 종료는 server.shutdown()
+    """
+    server = StubServer(host, port, latency, rate_limit_every, tokens, token_latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="local OpenAI compatible stub server")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=8001)
+    parser.add_argument("--latency", "-l", type=float, default=0.2, help="seconds per request")
+    parser.add_argument("--rate_limit_every", type=int, default=0, help="return 429 every N requests")
+    parser.add_argument("--tokens", type=int, default=0, help="extra tokens appended to each text answer")
+    parser.add_argument("--token_latency", type=float, default=0.0, help="seconds per generated token")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency, args.rate_limit_every, args.tokens, args.token_latency)
+    print(f"stub OpenAI server : {server.url}")
+    server.serve_forever()
@@ -0,0 +1,89 @@
+"""
+gunicorn worker 별 메모리 리포트
+- RSS : 프로세스가 차지한 물리 메모리 (fork 로 공유된 페이지도 worker 마다 중복 계산)
+- PSS : 공유 페이지를 공유한 프로세스 수로 나눈 값 (합계가 실제 사용량)
+- USS : 해당 프로세스만 쓰는 페이지 (worker 를 하나 늘릴 때 추가되는 메모리)
+
+실행 명령어
+python -m finbot.worker_memory <gunicorn master pid>
+python -m finbot.worker_memory <gunicorn master pid> --watch 10
+"""
+
+import argparse
+import time
+
+import psutil
+
+
+def process_memory(proc: psutil.Process) -> dict:
+    """
+    parameter (psutil.Process) proc : 대상 프로세스
+    return dict : pid, rss/pss/uss (MB), PSS 를 지원하지 않는 OS 에서는 pss 가 None
+    """
+    info = proc.memory_full_info()
+    return {
+        "pid": proc.pid,
+        "rss_mb": info.rss / 2**20,
+        "pss_mb": info.pss / 2**20 if hasattr(info, "pss") else None,
+        "uss_mb": info.uss / 2**20,
+    }
+
+
+def worker_memory(master_pid: int) -> list[dict]:
+    """
+    master 와 worker(자식 프로세스) 메모리
+
+    parameter (int) master_pid : gunicorn master pid
+    return list[dict] : [{"role": "master" | "worker", "pid", "rss_mb", "pss_mb", "uss_mb"}, ...]
+    """
+    master = psutil.Process(master_pid)
+    rows = [{"role": "master", **process_memory(master)}]
+    for child in master.children():
+        try:
+            rows.append({"role": "worker", **process_memory(child)})
+        except psutil.NoSuchProcess:
+            continue
+    return rows
+
+
+def summarize(rows: list[dict]) -> dict:
+    """
+    return dict : worker 수, RSS 합계(중복 포함), PSS 합계(실제 사용량), worker 평균 USS
+    """
+    workers = [row for row in rows if row["role"] == "worker"]
+    pss = [row["pss_mb"] for row in rows]
+    return {
+        "workers": len(workers),
+        "rss_total_mb": sum(row["rss_mb"] for row in rows),
+        "pss_total_mb": sum(pss) if None not in pss else None,
+        "worker_uss_mb": sum(row["uss_mb"] for row in workers) / len(workers) if workers else 0.0,
+    }
+
+
+def print_report(rows: list[dict]) -> None:
+    def mb(value: float | None) -> str:
+        return f"{value:>9.0f}" if value is not None else f"{'-':>9}"
+
+    print("-" * 50)
+    print(f"{'role':<8} {'pid':>8} {'RSS(MB)':>9} {'PSS(MB)':>9} {'USS(MB)':>9}")
+    for row in rows:
+        print(f"{row['role']:<8} {row['pid']:>8} {mb(row['rss_mb'])} {mb(row['pss_mb'])} {mb(row['uss_mb'])}")
+    summary = summarize(rows)
+    print(
+        f"합계: worker {summary['workers']}개, RSS {summary['rss_total_mb']:.0f}MB, "
+        f"PSS {mb(summary['pss_total_mb']).strip()}MB, worker 평균 USS {summary['worker_uss_mb']:.0f}MB"
+    )
+    print("-" * 50)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="per-worker memory report of a gunicorn master")
+    parser.add_argument("master_pid", type=int, help="gunicorn master pid")
+    parser.add_argument("--watch", "-w", type=float, default=0, help="repeat every N seconds (0: once)")
+    args = parser.parse_args()
+
+    while True:
+        print_report(worker_memory(args.master_pid))
+        if not args.watch:
+            break
+        time.sleep(args.watch)
@@ -11,7 +11,13 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from finbot.singleton.warmup import warm_up_from_env
+
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "finbot.settings")
 
 application = get_wsgi_application()
+
+# 모델/Qdrant/OpenAI client 는 처음 사용할 때 초기화 (lazy singleton)
+# FINBOT_WARMUP=1 이면 worker 가 요청을 받기 전에 미리 초기화
+warm_up_from_env()
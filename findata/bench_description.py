@@ -0,0 +1,83 @@
+"""
+상품 설명 생성 벤치마크 (로컬 stub OpenAI 서버 사용, 실제 API 호출 없음)
+- 기존 방식: 상품마다 동기 요청 1건씩 순서대로
+- 현재 방식: describe_products (async + 동시 요청 수/rpm 제한 + 디스크 캐시)
+- 두 번째 실행은 캐시만 사용해서 요청 0건인지 확인
+
+실행 명령어
+python -m findata.bench_description --limit 200 --latency 0.3 --concurrency 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from openai import OpenAI
+
+from finbot.stub_openai import start_stub_server
+from findata.describe import DESC_MODEL, build_messages, describe_products
+from findata.simple_chunk import make_embedding_ready_text
+from findata.snapshot import load_products
+
+
+def describe_serial(products: list[dict], base_url: str) -> list[str]:
+    """
+    기존 create_description 방식 (동기 요청을 하나씩)
+    """
+
+    client = OpenAI(api_key="stub", base_url=base_url)
+    answers = []
+    for product in products:
+        completion = client.chat.completions.create(
+            model=DESC_MODEL,
+            messages=build_messages(make_embedding_ready_text(product)),
+            max_tokens=400,
+        )
+        answers.append(completion.choices[0].message.content)
+    return answers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of LLM product description generation")
+    parser.add_argument("--limit", "-n", type=int, default=200, help="number of products")
+    parser.add_argument("--latency", "-l", type=float, default=0.3, help="stub server seconds per request")
+    parser.add_argument("--concurrency", "-c", type=int, default=16, help="max concurrent requests")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute limit (0: unlimited)")
+    parser.add_argument("--rate_limit_every", type=int, default=0, help="stub returns 429 every N requests")
+    args = parser.parse_args()
+
+    products = [{k: v for k, v in p.items() if k != "상품설명"} for p in load_products()][: args.limit]
+
+    server = start_stub_server(latency=args.latency, rate_limit_every=args.rate_limit_every)
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    kwargs = {"concurrency": args.concurrency, "rpm": args.rpm, "base_url": server.url}
+    try:
+        start = time.perf_counter()
+        serial = describe_serial(products, server.url)
+        serial_time = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "desc_cache.jsonl"
+
+            start = time.perf_counter()
+            described = describe_products([dict(p) for p in products], cache_path=cache_path, **kwargs)
+            pool_time = time.perf_counter() - start
+            assert [p["상품설명"] for p in described] == serial, "async 결과가 동기 결과와 다름"
+
+            before = server.stats.requests
+            start = time.perf_counter()
+            cached = describe_products([dict(p) for p in products], cache_path=cache_path, **kwargs)
+            cache_time = time.perf_counter() - start
+            assert server.stats.requests == before, "캐시 실행에서 요청이 발생함"
+            assert [p["상품설명"] for p in cached] == serial
+    finally:
+        server.shutdown()
+
+    print("-" * 60)
+    print(f"상품 {len(products)}건, stub latency {args.latency}초, 최대 동시 요청 {server.stats.max_in_flight}")
+    print(f"{'serial':<24} {serial_time:>8.2f}초")
+    print(f"{'async pool':<24} {pool_time:>8.2f}초  x{serial_time / pool_time:.1f}")
+    print(f"{'cached re-run':<24} {cache_time:>8.2f}초  (요청 0건)")
+    print("-" * 60)
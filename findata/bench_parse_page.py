@@ -0,0 +1,130 @@
+"""
+parse_page 벤치마크
+- 기존 방식: baseList 상품마다 optionList 전체를 훑는 nested loop (O(base × option))
+- 현재 방식: optionList를 (dcls_month, fin_co_no, fin_prdt_cd)로 한 번 index한 hash join (O(base + option))
+
+fixture(findata/data/fixtures/{category}_page.json)는 API 응답 한 페이지와 같은 schema
+--scale 만큼 상품코드를 바꿔 복제해서 큰 페이지를 만든 뒤 두 방식의 결과가 같은지 확인하고 시간을 비교
+
+실행 명령어
+python -m findata.bench_parse_page --scale 1 10 50
+python -m findata.bench_parse_page --record  # 실제 API 응답으로 fixture 갱신 (API_KEY 필요)
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime
+
+from findata.call_findata_api import BASE_DIR, conf, fin_cat, get_page, get_session, parse_page
+
+
+fixture_path = BASE_DIR / "findata" / "data" / "fixtures"
+
+
+def parse_page_nested(page: dict, category: str, group: str, today_date: datetime) -> list[dict]:
+    """
+    기존 parse_page 구현 (비교 기준)
+    """
+
+    item_dict = conf.tags[category]
+    base_list = page["result"]["baseList"]
+    option_list = page["result"]["optionList"]
+
+    data = []
+    for i in range(len(base_list)):
+        end_day = base_list[i]["dcls_end_day"]
+        if isinstance(end_day, str):
+            end_date = datetime(int(end_day[:4]), int(end_day[4:6]), int(end_day[6:8]))
+            if (end_date - today_date).days <= 0:
+                continue
+
+        rep_data = {"상품카테고리": fin_cat[category]}
+        rep_data["회사유형"] = conf.fin_co_no[group]
+        for api_key in base_list[i].keys():
+            if api_key in item_dict.keys():
+                rep_data[item_dict[api_key]] = base_list[i][api_key]
+        rep_data["옵션"] = []
+
+        for j in range(len(option_list)):
+            if (
+                option_list[j]["dcls_month"] == base_list[i]["dcls_month"]
+                and option_list[j]["fin_co_no"] == base_list[i]["fin_co_no"]
+                and option_list[j]["fin_prdt_cd"] == base_list[i]["fin_prdt_cd"]
+            ):
+                rep_data_in = {}
+                for api_key2 in option_list[j].keys():
+                    if api_key2 in item_dict.keys():
+                        rep_data_in[item_dict[api_key2]] = option_list[j][api_key2]
+                rep_data["옵션"].append(rep_data_in)
+        data.append(rep_data)
+    return data
+
+
+def scale_page(page: dict, scale: int) -> dict:
+    """
+    상품코드에 접미사를 붙여 baseList/optionList를 scale배로 복제
+    """
+
+    base_list, option_list = [], []
+    for n in range(scale):
+        for base in page["result"]["baseList"]:
+            base_list.append({**base, "fin_prdt_cd": f"{base['fin_prdt_cd']}_{n}"})
+        for option in page["result"]["optionList"]:
+            option_list.append({**option, "fin_prdt_cd": f"{option['fin_prdt_cd']}_{n}"})
+    return {"result": {**page["result"], "baseList": base_list, "optionList": option_list}}
+
+
+def record_fixture(category: str, group: str) -> None:
+    """
+    실제 API 응답 1페이지를 fixture로 저장
+    """
+
+    today = date.today()
+    page = get_page(get_session(), category, group, 1, f"{today.year}{today.month:02d}", use_cache=False)
+    with open(fixture_path / f"{category}_page.json", "w", encoding="utf-8") as f:
+        json.dump(page, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"fixture 저장 : {category} / {group} (상품 {len(page['result']['baseList'])}개)")
+
+
+def timeit(func, *args, repeat: int = 3) -> float:
+    """
+    repeat번 실행 중 가장 빠른 시간(초)
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of parse_page (nested loop vs hash join)")
+    parser.add_argument("--category", "-c", type=str, default="fixed_deposit", choices=list(fin_cat))
+    parser.add_argument("--group", "-g", type=str, default="030300", help="fixture 권역 코드")
+    parser.add_argument("--scale", "-s", type=int, nargs="+", default=[1, 10, 50], help="fixture 복제 배수")
+    parser.add_argument("--record", action="store_true", help="실제 API 응답으로 fixture 갱신")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture(args.category, args.group)
+
+    with open(fixture_path / f"{args.category}_page.json", encoding="utf-8") as f:
+        fixture = json.load(f)
+    today = date.today()
+    today_date = datetime(today.year, today.month, today.day)
+
+    print("-" * 72)
+    print(f"{'base':>8} {'option':>8} {'nested(ms)':>12} {'hash join(ms)':>14} {'speedup':>8}")
+    for scale in args.scale:
+        page = scale_page(fixture, scale)
+        params = (page, args.category, args.group, today_date)
+        assert parse_page(*params) == parse_page_nested(*params), "parse_page 결과가 기존 구현과 다름"
+
+        nested = timeit(parse_page_nested, *params, repeat=1 if scale > 10 else 3)
+        joined = timeit(parse_page, *params)
+        n_base, n_option = len(page["result"]["baseList"]), len(page["result"]["optionList"])
+        print(f"{n_base:>8} {n_option:>8} {nested * 1000:>12.1f} {joined * 1000:>14.1f} {nested / joined:>7.1f}x")
+    print("-" * 72)
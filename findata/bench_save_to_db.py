@@ -0,0 +1,96 @@
+"""
+save_to_db_final 벤치마크 (SQLite in-memory DB를 MySQL 대신 사용)
+- 기존 방식: 상품/옵션 row마다 cur.execute 1번
+- bulk 방식: bulk_save_to_db_final (테이블별 executemany, 하나의 transaction)
+- 두 방식으로 저장한 테이블 내용이 같은지, 두 번째 저장이 전부 updated로 집계되는지 확인
+
+실행 명령어
+python -m findata.bench_save_to_db --scale 10 --batch_size 500
+"""
+
+import argparse
+import sqlite3
+import time
+
+from findata.save_to_db_final import (
+    TABLE_UNIQUE_KEYS,
+    bulk_save_to_db_final,
+    conf,
+    create_sqlite_tables,
+    save_fin_product,
+    upsert_option,
+)
+from findata.snapshot import load_products
+
+
+def save_per_row(conn: sqlite3.Connection, data: list[dict]) -> None:
+    """
+    기존 save_to_db_final 방식 (row마다 execute)
+    """
+
+    cur = conn.cursor()
+    for p in data:
+        category_en = conf.category[p["상품카테고리"]]
+        eng_to_han = conf.tags[category_en]
+        save_fin_product(cur, p, category_en, eng_to_han, dialect="sqlite")
+        for opt in p.get("옵션", []):
+            upsert_option(cur, category_en, p["금융상품코드"], p, opt, eng_to_han, dialect="sqlite")
+    conn.commit()
+    cur.close()
+
+
+def dump_tables(conn: sqlite3.Connection) -> dict[str, list[tuple]]:
+    """
+    테이블 내용 비교용 (id 컬럼 제외, 정렬)
+    """
+
+    tables = {}
+    for table in TABLE_UNIQUE_KEYS:
+        cur = conn.execute(f"SELECT * FROM {table}")
+        cols = [d[0] for d in cur.description]
+        tables[table] = sorted(
+            tuple(str(v) for c, v in zip(cols, row, strict=True) if c != "id") for row in cur.fetchall()
+        )
+    return tables
+
+
+def scale_data(data: list[dict], scale: int) -> list[dict]:
+    """
+    금융상품코드에 접미사를 붙여 scale배로 복제
+    """
+
+    return [{**p, "금융상품코드": f"{p['금융상품코드']}_{n}"} for n in range(scale) for p in data]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of save_to_db_final (per-row vs bulk executemany)")
+    parser.add_argument("--scale", "-s", type=int, default=10, help="data replication factor")
+    parser.add_argument("--batch_size", "-b", type=int, default=500, help="rows per executemany")
+    args = parser.parse_args()
+
+    data = scale_data(load_products(), args.scale)
+    n_rows = len(data) + sum(len(p.get("옵션", [])) for p in data)
+    print(f"상품 {len(data)}건, 전체 row {n_rows}개")
+
+    per_row_conn = sqlite3.connect(":memory:")
+    create_sqlite_tables(per_row_conn)
+    start = time.perf_counter()
+    save_per_row(per_row_conn, data)
+    per_row_time = time.perf_counter() - start
+
+    bulk_conn = sqlite3.connect(":memory:")
+    create_sqlite_tables(bulk_conn)
+    start = time.perf_counter()
+    first = bulk_save_to_db_final(data, conn=bulk_conn, dialect="sqlite", batch_size=args.batch_size)
+    bulk_time = time.perf_counter() - start
+    assert dump_tables(bulk_conn) == dump_tables(per_row_conn), "bulk 저장 결과가 row 단위 저장과 다름"
+
+    second = bulk_save_to_db_final(data, conn=bulk_conn, dialect="sqlite", batch_size=args.batch_size)
+    assert all(s["inserted"] == 0 for s in second.values()), "재저장에서 inserted가 발생함"
+    assert sum(s["updated"] for s in second.values()) == n_rows
+
+    print("-" * 60)
+    print(f"{'per-row execute':<24} {per_row_time:>8.2f}초  {n_rows / per_row_time:>10.0f} rows/sec")
+    speedup = per_row_time / bulk_time
+    print(f"{'bulk executemany':<24} {bulk_time:>8.2f}초  {n_rows / bulk_time:>10.0f} rows/sec  x{speedup:.1f}")
+    print("-" * 60)
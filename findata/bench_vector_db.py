@@ -0,0 +1,73 @@
+"""
+임베딩 단계 벤치마크
+- 기존 방식: chunk 하나마다 model.encode([text]) 호출
+- 배치 방식: encode_docs()로 batch_size 단위 인코딩 (+ multi-process pool)
+
+실행 명령어
+python -m findata.bench_vector_db --limit 2000 --batch_size 64 --num_workers 4
+"""
+
+import argparse
+import time
+
+from sentence_transformers import SentenceTransformer
+
+from findata.simple_chunk import chunk
+from findata.snapshot import load_products
+from findata.vector_db import encode_docs, iter_doc_batches
+
+
+def bench_per_doc(model, texts: list[str]) -> float:
+    """
+    기존 save_vector_db 방식 (chunk 1개씩 인코딩)
+    return : (float) 소요 시간(초)
+    """
+
+    start = time.perf_counter()
+    for text in texts:
+        model.encode([text], convert_to_numpy=True)
+    return time.perf_counter() - start
+
+
+def bench_batched(model, texts: list[str], batch_size: int, num_workers: int = 0, pool: dict | None = None) -> float:
+    """
+    스트리밍 배치 방식 (save_vector_db와 같은 stream_size 사용)
+    return : (float) 소요 시간(초)
+    """
+
+    stream_size = batch_size * max(num_workers, 1) * 4
+    start = time.perf_counter()
+    for batch in iter_doc_batches(texts, stream_size):
+        encode_docs(model, batch, batch_size=batch_size, pool=pool)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of embedding stage in save_vector_db")
+    parser.add_argument("--limit", "-n", type=int, default=1000, help="number of chunks to embed")
+    parser.add_argument("--batch_size", "-b", type=int, default=64, help="number of chunks per forward pass")
+    parser.add_argument("--num_workers", "-w", type=int, default=0, help="number of CPU processes for embedding")
+    args = parser.parse_args()
+
+    products = load_products()
+    texts = [doc.page_content for doc in chunk(products)][: args.limit]
+    print(f"벤치마크 chunk 수 : {len(texts)}")
+
+    model = SentenceTransformer("BM-K/KoSimCSE-roberta-multitask")
+    model.encode(texts[:8], convert_to_numpy=True)  # warm-up
+
+    results = {"per_doc": bench_per_doc(model, texts)}
+    results[f"batched(bs={args.batch_size})"] = bench_batched(model, texts, args.batch_size)
+    if args.num_workers > 1:
+        pool = model.start_multi_process_pool(target_devices=["cpu"] * args.num_workers)
+        try:
+            name = f"batched(bs={args.batch_size}, workers={args.num_workers})"
+            results[name] = bench_batched(model, texts, args.batch_size, args.num_workers, pool=pool)
+        finally:
+            model.stop_multi_process_pool(pool)
+
+    baseline = results["per_doc"]
+    print("-" * 60)
+    for name, elapsed in results.items():
+        print(f"{name:<40} {len(texts) / elapsed:>8.1f} chunks/sec  x{baseline / elapsed:.1f}")
+    print("-" * 60)
@@ -1,19 +1,22 @@
 import argparse
+import json
 import os  # 운영 체제와 상호작용하기 위한 라이브러리
+import random
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from functools import cache
 from pathlib import Path  # 파일 경로 처리를 위한 라이브러리
 from pprint import pprint
 
 import requests
 from dotenv import load_dotenv
-from openai import OpenAI
+from requests.adapters import HTTPAdapter
 
 from findata.config_manager import JsonConfigManager
-from findata.simple_chunk import (
-    make_embedding_ready_text_deposit,
-    make_embedding_ready_text_installment,
-    make_embedding_ready_text_jeonse_loan,
-)
+from findata.describe import describe_products
 
 
 """
@@ -33,187 +36,265 @@ conf = JsonConfigManager(path=conf_path).values
 
 # dotenv를 활용하여 API 키 가져오기
 FINAPI_KEY = os.getenv("FINAPI_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# API 응답 캐시 경로: {category}/{dcls_month}/{group}_{page}.json
+# 호출한 달(YYYYMM) 기준이라 같은 달 안의 상품/금리 변경을 반영하지 못함 -> 개발/벤치마크용으로만 켜서 사용 (기본 끔)
+api_cache_path = BASE_DIR / "findata" / "data" / "api_cache"
+# 금융상품 카테고리 (영문 -> 한글)
+fin_cat = {
+    "fixed_deposit": "정기예금",
+    "installment_deposit": "적금",
+    "jeonse_loan": "전세자금대출",
+}
 
 
-def create_description(products: list[dict]) -> list[dict]:
+def create_description(
+    products: list[dict], concurrency: int = 8, rpm: int = 500, use_cache: bool = True
+) -> list[dict]:
     """
     API에서 호출해온 상품 데이터를 보고
     AI로 상품 설명 추가
+    - 동시 요청 수/분당 요청 수를 제한한 async 요청, 바뀌지 않은 상품은 캐시 사용 (findata.describe 참고)
 
     Args:
         products (list[dict]): API로 불러온 데이터들
+        concurrency (int): 동시에 보내는 최대 요청 수
+        rpm (int): 분당 최대 요청 수
+        use_cache (bool): 상품 설명 캐시 사용 여부
     Returns:
         products (list[dict]): API로 불러온 데이터를 기반으로 LLM의 상품 설명 추가
     """
-    for i, product in enumerate(products):
-        if product["상품카테고리"] == "정기예금":
-            product_text = make_embedding_ready_text_deposit(product)
-        elif product["상품카테고리"] == "적금":
-            product_text = make_embedding_ready_text_installment(product)
-        elif product["상품카테고리"] == "전세자금대출":
-            product_text = make_embedding_ready_text_jeonse_loan(product)
-
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "너는 금융 도메인 전문가이자 고객 상담 AI야. 정보를 읽고 특징을 찾아낼거야. "
-                    "찾아낸 특징으로 상품의 설명을 예시와 비슷하게 최대 50자 이내로 생성해야해."
-                    "다음은 예시들이야.\n "
-                    "주거래 고객님께 더 높은 우대금리를!\n"
-                    "미리 준비하는 우리아이 청약통장!\n"
-                    "매달 열리는 행운 카드로 우대금리를 제공하는 적립식 상품.\n"
-                    "Npay 우리 통장 가입 후 머니 연결한 고객에게 제공되는 적립식 상품\n"
-                    "해외여행 특화 외화보통예금.\n"
-                ),
-            },
-            {"role": "user", "content": f"다음은 한 상품의 '정보'야:\n{product_text}"},
-            {
-                "role": "user",
-                "content": (
-                    "'정보'만 참고해서 상품의 특징을 요약해서 50자 이내로 출력해."
-                    "상품이름과 은행은 빼. 다른 말은 필요없어."
-                ),
-            },
-        ]
-
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages,
-            max_tokens=400,
-        )
-
-        answer = completion.choices[0].message.content
-        print("-" * 50)
-        print("-" * 50)
-        pprint(product)
-        print("-" * 50)
-        print(answer)
-        print("-" * 50)
-        print("-" * 50)
-        products[i]["상품설명"] = answer
-    return products
+    return describe_products(products, concurrency=concurrency, rpm=rpm, use_cache=use_cache)
 
 
-# 금융 데이터를 가져오는 함수 정의
-def fetch_findata(category="fixed_deposit") -> list[dict]:
+def get_session(pool_size: int = 16) -> requests.Session:
     """
-    정기예금, 적금, 전세자금대출 호출 가능하도록 develop한 version
-    # 데이터베이스에 저장
-    return : List[Dict(상품)], 데이터 리스트 반환
+    커넥션을 재사용하는 requests Session 생성
+    - 동시에 요청하는 스레드 수만큼 connection pool 크기를 잡는다.
     """
-    # category 유효성
-    assert category in ["fixed_deposit", "installment_deposit", "jeonse_loan"]
-    # 현재 날짜 저장
-    today = date.today()
-    format_today = today.strftime("%Y%m%d")
-    today_date = datetime(int(format_today[:4]), int(format_today[4:6]), int(format_today[6:8]))
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_page(
+    session: requests.Session,
+    category: str,
+    group: str,
+    page_no: int,
+    dcls_month: str,
+    use_cache: bool = False,
+    retries: int = 3,
+    backoff: float = 0.5,
+    timeout: float = 10.0,
+) -> dict:
+    """
+    '금융상품한눈에' API 한 페이지 호출
+    - (category, group, page_no, dcls_month) 기준으로 디스크에 응답을 캐시
+    - 네트워크 오류, 5xx, 비정상 응답은 지수 backoff로 재시도
+
+    Args:
+        session (requests.Session): 커넥션 재사용용 Session
+        category (str): "fixed_deposit", "installment_deposit", "jeonse_loan"
+        group (str): 권역 코드 (topFinGrpNo)
+        page_no (int): 페이지 번호
+        dcls_month (str): 공시제출월(YYYYMM), 캐시 구분용
+        use_cache (bool): 디스크 캐시 사용 여부 (개발/벤치마크용)
+        retries (int): 최대 재시도 횟수
+        backoff (float): 첫 재시도 대기 시간(초), 시도마다 2배
+        timeout (float): 요청 timeout(초)
+    Returns:
+        page (dict): API 응답 json
+    """
+    cache_file = api_cache_path / category / dcls_month / f"{group}_{page_no}.json"
+    if use_cache and cache_file.exists():
+        with open(cache_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    params = {
+        "auth": FINAPI_KEY,  # API 키
+        "topFinGrpNo": group,  #  금융회사가 속한 권역 코드
+        "pageNo": page_no,  # 페이지 번호
+    }
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(conf.urls[category], params=params, timeout=timeout)
+            response.raise_for_status()
+            page = response.json()
+            if page["result"]["err_msg"] != "정상":
+                raise ValueError(f"API 오류 응답: {page['result']['err_msg']}")
+            break
+        except (requests.RequestException, ValueError, KeyError) as e:
+            if attempt == retries:
+                raise
+            wait = backoff * (2**attempt) + random.uniform(0, backoff)
+            print(f"[{category}/{group}/{page_no}] 호출 실패({e}), {wait:.1f}초 후 재시도")
+            time.sleep(wait)
+
+    if use_cache:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(page, f, ensure_ascii=False)
+        tmp_file.replace(cache_file)
+    return page
+
+
+def fetch_findata_pages(
+    categories: list[str],
+    max_workers: int = 16,
+    use_cache: bool = False,
+) -> dict[str, list[tuple[str, dict]]]:
+    """
+    여러 카테고리 x 권역의 모든 페이지를 bounded thread pool로 동시에 호출
 
-    # API 호출에 필요한 파라미터(필수)
-    url = conf.urls[category]
-    fin_grp_dict = conf.fin_co_no
-    item_dict = conf.tags[category]
+    1단계: (카테고리, 권역)별 1페이지를 동시에 호출해서 max_page_no 확인 (1페이지는 데이터로도 사용)
+    2단계: 나머지 페이지를 모두 동시에 호출
 
-    # 최종 데이터 저장 할 data
-    data = []
-    # 금융기관별 api info 가져오기
-    code_dict = {}
-    for group in fin_grp_dict.keys():
-        ex_params = {
-            "auth": FINAPI_KEY,  # API 키
-            "topFinGrpNo": group,  #  금융회사가 속한 권역 코드
-            "pageNo": 2,  # 페이지 번호
+    Args:
+        categories (list[str]): 호출할 카테고리 목록
+        max_workers (int): 동시에 보내는 최대 요청 수
+        use_cache (bool): 디스크 캐시 사용 여부 (개발/벤치마크용, 적재 시에는 끔)
+    Returns:
+        pages (dict): category -> [(group, page json), ...] (권역, 페이지 순서 유지)
+    """
+    for category in categories:
+        # category 유효성
+        if category not in fin_cat:
+            raise ValueError(f"지원하지 않는 카테고리: {category}")
+    dcls_month = date.today().strftime("%Y%m")
+    groups = list(conf.fin_co_no.keys())
+
+    with get_session(pool_size=max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        first_futures = {
+            (category, group): executor.submit(get_page, session, category, group, 1, dcls_month, use_cache)
+            for category in categories
+            for group in groups
         }
+        first_pages = {key: future.result() for key, future in first_futures.items()}
+
+        rest_futures = {}
+        for (category, group), page in first_pages.items():
+            if page["result"]["total_count"] < 0 or page["result"]["max_page_no"] < 0:
+                raise ValueError(f"[{category}/{group}] 비정상 페이지 정보: {page['result']}")
+            for page_no in range(2, page["result"]["max_page_no"] + 1):
+                rest_futures[(category, group, page_no)] = executor.submit(
+                    get_page, session, category, group, page_no, dcls_month, use_cache
+                )
+        rest_pages = {key: future.result() for key, future in rest_futures.items()}
+
+    pages = {}
+    for category in categories:
+        pages[category] = []
+        for group in groups:
+            first_page = first_pages[(category, group)]
+            max_page_no = first_page["result"]["max_page_no"]
+            print(f"[{fin_cat[category]}] {conf.fin_co_no[group]} 자료 {first_page['result']['total_count']}건")
+            for page_no in range(1, max_page_no + 1):
+                page = first_page if page_no == 1 else rest_pages[(category, group, page_no)]
+                pages[category].append((group, page))
+    return pages
+
+
+@cache
+def get_field_mapper(category: str) -> Callable[[dict], dict]:
+    """
+    conf.tags[category] 기반의 API key -> 한글 key 변환 함수를 한 번만 만들어 재사용
 
-        # [ requests 문서를 참고하여 HTTP GET 요청 보내는 코드 작성하기 ]
-        ex_response = requests.get(url, params=ex_params)  # .json()
-        ex_data = ex_response.json()
-
-        assert ex_data["result"]["err_msg"] == "정상"
-        assert ex_data["result"]["total_count"] >= 0
-        assert ex_data["result"]["max_page_no"] >= 0
-        code_dict.setdefault(group, {})
-        code_dict[group]["total_count"] = ex_data["result"]["total_count"]
-        code_dict[group]["max_page_no"] = ex_data["result"]["max_page_no"]
-
-    # 모든 데이터 조회 및 정리"fixed_deposit", "installment_deposit", "jeonse_loan"
-    fin_cat = {
-        "fixed_deposit": "정기예금",
-        "installment_deposit": "적금",
-        "jeonse_loan": "전세자금대출",
-    }
+    Args:
+        category (str): 카테고리
+    Returns:
+        map_fields (Callable): API row(dict)를 한글 key dict로 바꾸는 함수
+    """
+    item_dict = dict(conf.tags[category])
+
+    def map_fields(row: dict) -> dict:
+        return {item_dict[api_key]: value for api_key, value in row.items() if api_key in item_dict}
+
+    return map_fields
+
+
+def parse_page(page: dict, category: str, group: str, today_date: datetime) -> list[dict]:
+    """
+    API 응답 한 페이지를 한글 key의 상품 리스트로 변환
+    - 공시종료일이 지난 상품은 제외
+    - optionList를 (dcls_month, fin_co_no, fin_prdt_cd) 기준으로 한 번 index한 뒤
+      baseList 상품마다 같은 key의 옵션을 "옵션"으로 묶음 (hash join)
+
+    Args:
+        page (dict): API 응답 json
+        category (str): 카테고리
+        group (str): 권역 코드
+        today_date (datetime): 기준 날짜
+    Returns:
+        data (list[dict]): 상품 리스트
+    """
+    map_fields = get_field_mapper(category)
+    today = today_date.strftime("%Y%m%d")
+
+    options_by_key = defaultdict(list)
+    for option in page["result"]["optionList"]:
+        options_by_key[(option["dcls_month"], option["fin_co_no"], option["fin_prdt_cd"])].append(option)
+
+    data = []
+    for base in page["result"]["baseList"]:
+        # 현재 판매 중인 금융상품인지 확인(공시종료가 안되었는지)
+        end_day = base["dcls_end_day"]
+        if isinstance(end_day, str) and end_day[:8] <= today:
+            continue
+
+        # key 이름 변경을 위한 복제 데이터
+        rep_data = {"상품카테고리": fin_cat[category], "회사유형": conf.fin_co_no[group]}
+        rep_data.update(map_fields(base))
+        options = options_by_key.get((base["dcls_month"], base["fin_co_no"], base["fin_prdt_cd"]), ())
+        rep_data["옵션"] = [map_fields(option) for option in options]
+        data.append(rep_data)
+    return data
+
+
+def fetch_findata_all(
+    categories: tuple[str, ...] = ("fixed_deposit", "installment_deposit", "jeonse_loan"),
+    max_workers: int = 16,
+    use_cache: bool = False,
+) -> list[dict]:
+    """
+    여러 카테고리를 한 번에 동시 호출해서 상품 리스트로 반환
+    return : List[Dict(상품)], categories 순서대로 이어붙인 데이터 리스트
+    """
+    # 현재 날짜 저장
+    today = date.today()
+    today_date = datetime(today.year, today.month, today.day)
 
     print("금융상품 통합비교공시 '금융상품한눈에' 오픈 API 호출을 시작합니다.")
-    print(f"Current Finance Category : {fin_cat[category]}")
-    for group in fin_grp_dict.keys():
-        group_name = fin_grp_dict[group]
-        count = code_dict[group]["total_count"]
-        print(f"{group_name} 자료를 {count}건 불러옵니다.")
-
-        for page_no in range(1, code_dict[group]["max_page_no"] + 1):
-            params = {
-                "auth": FINAPI_KEY,  # API 키
-                "topFinGrpNo": group,  #  금융회사가 속한 권역 코드
-                "pageNo": page_no,  # 페이지 번호
-            }
-            response = requests.get(url, params=params)
-            tmp_data = response.json()
-
-            for i in range(len(tmp_data["result"]["baseList"])):
-                # 현재 판매 중인 금융상품인지 확인(공시종료가 안되었는지)
-                end_day = tmp_data["result"]["baseList"][i]["dcls_end_day"]
-                if end_day is None:
-                    pass
-                elif isinstance(end_day, str):
-                    end_date = datetime(
-                        int(end_day[:4]),
-                        int(end_day[4:6]),
-                        int(end_day[6:8]),
-                    )
-                    data_diff = end_date - today_date
-                    if data_diff.days > 0:
-                        pass
-                    else:
-                        continue
-
-                # key 이름 변경을 위한 복제 데이터
-                rep_data = {"상품카테고리": fin_cat[category]}
-                rep_data["회사유형"] = fin_grp_dict[group]
-
-                for api_key in tmp_data["result"]["baseList"][i].keys():
-                    if api_key in item_dict.keys():
-                        rep_data[item_dict[api_key]] = tmp_data["result"]["baseList"][i][api_key]
-                rep_data["옵션"] = []
-
-                for j in range(len(tmp_data["result"]["optionList"])):
-                    if (
-                        tmp_data["result"]["optionList"][j]["dcls_month"]
-                        == tmp_data["result"]["baseList"][i]["dcls_month"]
-                        and tmp_data["result"]["optionList"][j]["fin_co_no"]
-                        == tmp_data["result"]["baseList"][i]["fin_co_no"]
-                        and tmp_data["result"]["optionList"][j]["fin_prdt_cd"]
-                        == tmp_data["result"]["baseList"][i]["fin_prdt_cd"]
-                    ):
-                        # key 이름 변경을 위한 복제 데이터
-                        rep_data_in = {}
-
-                        for api_key2 in tmp_data["result"]["optionList"][j].keys():
-                            if api_key2 in item_dict.keys():
-                                rep_data_in[item_dict[api_key2]] = tmp_data["result"]["optionList"][j][api_key2]
-
-                        rep_data["옵션"].append(rep_data_in)
-                data.append(rep_data)
+    start_time = time.perf_counter()
+    pages = fetch_findata_pages(list(categories), max_workers=max_workers, use_cache=use_cache)
+    print(f"API 호출 완료 ({time.perf_counter() - start_time:.1f}초)")
+
+    data = []
+    for category in categories:
+        for group, page in pages[category]:
+            data.extend(parse_page(page, category, group, today_date))
     print(f"{len(data)} 건 자료 처리완료.")
-    print("*" * 30, "예시", "*" * 30)
-    pprint(data[0])
-    print("*" * 63)
+    if data:
+        print("*" * 30, "예시", "*" * 30)
+        pprint(data[0])
+        print("*" * 63)
 
     return data
 
 
+# 금융 데이터를 가져오는 함수 정의
+def fetch_findata(category="fixed_deposit", max_workers: int = 16, use_cache: bool = False) -> list[dict]:
+    """
+    정기예금, 적금, 전세자금대출 호출 가능하도록 develop한 version
+    - 권역별 모든 페이지를 동시에 호출 (fetch_findata_pages 참고)
+    return : List[Dict(상품)], 데이터 리스트 반환
+    """
+    return fetch_findata_all((category,), max_workers=max_workers, use_cache=use_cache)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="This is calling finance data program from api")
     # ["fixed_deposit", "installment_deposit", "jeonse_loan"] 중 하나
@@ -224,5 +305,17 @@ if __name__ == "__main__":
         default="fixed_deposit",
         help="category of finance data",
     )
+    parser.add_argument(
+        "--max_workers",
+        "-w",
+        type=int,
+        default=16,
+        help="number of concurrent API requests",
+    )
+    parser.add_argument(
+        "--use_cache",
+        action="store_true",
+        help="reuse on-disk API responses of this month (dev / benchmarks only)",
+    )
     args = parser.parse_args()
-    fetch_findata(category=args.category)
+    fetch_findata(category=args.category, max_workers=args.max_workers, use_cache=args.use_cache)
@@ -73,6 +73,7 @@ if __name__ == "__main__":
         "정기예금": "fixed_deposit",
         "적금": "installment_deposit",
         "전세대출": "jeonse_loan",
+        "전세자금대출": "jeonse_loan",
     }
     jm.values.urls = {
         "fixed_deposit": "http://finlife.fss.or.kr/finlifeapi/depositProductsSearch.json?",
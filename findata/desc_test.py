@@ -1,22 +1,14 @@
-import pickle
-from pathlib import Path
+from findata.call_findata_api import create_description, fetch_findata_all
+from findata.snapshot import write_snapshot
 
-from findata.call_findata_api import create_description, fetch_findata
 
+data = create_description(fetch_findata_all(("fixed_deposit", "installment_deposit", "jeonse_loan")))
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-data_path = BASE_DIR / "findata" / "data"
-
-data = create_description(fetch_findata("fixed_deposit"))
-data.extend(create_description(fetch_findata("installment_deposit")))
-data.extend(create_description(fetch_findata("jeonse_loan")))
-
-# 파일로 저장
-with open(data_path / "findata_all.pkl", "wb") as f:
-    pickle.dump(data, f)
+# 카테고리별 Arrow snapshot 으로 저장 (findata/data/snapshot)
+write_snapshot(data)
 
 # 파일 불러오기
-# with open(data_path / "findata_all.pkl", "rb") as f:
-#     loaded_data = pickle.load(f)
+# from findata.snapshot import load_products
+# loaded_data = load_products()
 
 # print(loaded_data)
@@ -0,0 +1,217 @@
+"""
+LLM 상품 설명 생성
+- AsyncOpenAI로 동시에 요청하되 동시 요청 수(concurrency)와 분당 요청 수(rpm)를 제한
+- make_embedding_ready_text 결과 + 모델 + 프롬프트의 hash를 key로 디스크에 캐시해서
+  내용이 바뀌지 않은 상품은 다시 요청하지 않음
+
+base_url을 지정하지 않으면 OpenAI SDK 기본값(OPENAI_BASE_URL 환경변수 또는 api.openai.com)을 사용
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import openai
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from findata.simple_chunk import make_embedding_ready_text
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(BASE_DIR / ".env")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# 상품 설명 캐시: 한 줄에 {"key": ..., "desc": ...} 하나 (append only)
+desc_cache_path = BASE_DIR / "findata" / "data" / "desc_cache.jsonl"
+
+DESC_MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = (
+    "너는 금융 도메인 전문가이자 고객 상담 AI야. 정보를 읽고 특징을 찾아낼거야. "
+    "찾아낸 특징으로 상품의 설명을 예시와 비슷하게 최대 50자 이내로 생성해야해."
+    "다음은 예시들이야.\n "
+    "주거래 고객님께 더 높은 우대금리를!\n"
+    "미리 준비하는 우리아이 청약통장!\n"
+    "매달 열리는 행운 카드로 우대금리를 제공하는 적립식 상품.\n"
+    "Npay 우리 통장 가입 후 머니 연결한 고객에게 제공되는 적립식 상품\n"
+    "해외여행 특화 외화보통예금.\n"
+)
+INSTRUCTION_PROMPT = (
+    "'정보'만 참고해서 상품의 특징을 요약해서 50자 이내로 출력해.상품이름과 은행은 빼. 다른 말은 필요없어."
+)
+
+# 재시도 대상 오류 (그 외 오류는 바로 raise)
+RETRY_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+def build_messages(product_text: str) -> list[dict]:
+    """
+    상품 설명 생성용 chat messages
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"다음은 한 상품의 '정보'야:\n{product_text}"},
+        {"role": "user", "content": INSTRUCTION_PROMPT},
+    ]
+
+
+def make_desc_key(product_text: str, model: str = DESC_MODEL) -> str:
+    """
+    캐시 key: 모델, 프롬프트, 상품 텍스트가 같으면 같은 설명으로 본다.
+    """
+    raw = "\n".join([model, SYSTEM_PROMPT, INSTRUCTION_PROMPT, product_text])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load_desc_cache(path: Path = desc_cache_path) -> dict[str, str]:
+    """
+    jsonl 캐시 파일을 key -> 설명 dict로 읽기 (깨진 마지막 줄은 무시)
+    """
+    cache = {}
+    if not path.exists():
+        return cache
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            cache[row["key"]] = row["desc"]
+    return cache
+
+
+class RateLimiter:
+    """
+    분당 요청 수 제한 (요청 시작 시각을 60/rpm 초 간격으로 벌림)
+    """
+
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.next_time = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def request_description(
+    client: AsyncOpenAI,
+    product_text: str,
+    model: str,
+    semaphore: asyncio.Semaphore,
+    limiter: RateLimiter,
+    retries: int = 5,
+    backoff: float = 1.0,
+) -> str:
+    """
+    상품 하나의 설명 요청 (429/5xx/연결 오류는 지수 backoff로 재시도)
+    """
+    for attempt in range(retries + 1):
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                completion = await client.chat.completions.create(
+                    model=model,
+                    messages=build_messages(product_text),
+                    max_tokens=400,
+                )
+                return completion.choices[0].message.content
+            except RETRY_ERRORS as e:
+                if attempt == retries:
+                    raise
+                wait = backoff * (2**attempt)
+                print(f"설명 생성 실패({type(e).__name__}), {wait:.1f}초 후 재시도")
+        await asyncio.sleep(wait)
+
+
+async def adescribe_products(
+    products: list[dict],
+    concurrency: int = 8,
+    rpm: int = 500,
+    model: str = DESC_MODEL,
+    base_url: str | None = None,
+    use_cache: bool = True,
+    cache_path: Path = desc_cache_path,
+) -> list[dict]:
+    """
+    상품마다 "상품설명"을 채워서 반환 (async)
+
+    Args:
+        products (list[dict]): API로 불러온 데이터들
+        concurrency (int): 동시에 보내는 최대 요청 수
+        rpm (int): 분당 최대 요청 수 (0이면 제한 없음)
+        model (str): 설명 생성 모델
+        base_url (str | None): OpenAI 호환 서버 주소 (None이면 SDK 기본값)
+        use_cache (bool): 디스크 캐시 사용 여부
+        cache_path (Path): 캐시 파일 경로
+    Returns:
+        products (list[dict]): "상품설명"이 추가된 데이터
+    """
+    keys = [make_desc_key(make_embedding_ready_text(product), model) for product in products]
+    cache = load_desc_cache(cache_path) if use_cache else {}
+
+    # 캐시에 없는 텍스트만 요청 (같은 텍스트는 한 번만)
+    pending = {}
+    for key, product in zip(keys, products, strict=True):
+        if key not in cache and key not in pending:
+            pending[key] = make_embedding_ready_text(product)
+    print(f"상품 설명 생성: 전체 {len(products)}건, 캐시 {len(products) - len(pending)}건, 요청 {len(pending)}건")
+
+    if pending:
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = RateLimiter(rpm)
+        if use_cache:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=base_url) as client:
+
+            async def describe(key: str, text: str) -> tuple[str, str]:
+                return key, await request_description(client, text, model, semaphore, limiter)
+
+            # use_cache=False 면 캐시 파일을 만들거나 건드리지 않음
+            with open(cache_path, "a", encoding="utf-8") if use_cache else contextlib.nullcontext() as f:
+                tasks = [asyncio.create_task(describe(key, text)) for key, text in pending.items()]
+                try:
+                    for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                        key, desc = await task
+                        cache[key] = desc
+                        # 완료되는 대로 기록해서 중간에 실패해도 다음 실행에서 이어감
+                        if use_cache:
+                            f.write(json.dumps({"key": key, "desc": desc}, ensure_ascii=False) + "\n")
+                            f.flush()
+                        if done % 100 == 0 or done == len(tasks):
+                            print(f"  {done}/{len(tasks)}건 완료")
+                finally:
+                    for task in tasks:
+                        task.cancel()
+
+        elapsed = time.perf_counter() - start
+        print(f"상품 설명 {len(pending)}건 생성 완료 ({elapsed:.1f}초, {len(pending) / elapsed:.1f}건/초)")
+
+    for key, product in zip(keys, products, strict=True):
+        product["상품설명"] = cache[key]
+    return products
+
+
+def describe_products(products: list[dict], **kwargs) -> list[dict]:
+    """
+    adescribe_products의 동기 wrapper (인자는 adescribe_products 참고)
+    """
+    return asyncio.run(adescribe_products(products, **kwargs))
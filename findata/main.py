@@ -1,15 +1,16 @@
-from findata.call_findata_api import create_description, fetch_findata
+from findata.call_findata_api import create_description, fetch_findata_all
 from findata.save_to_db_final import save_to_db_final
+from findata.snapshot import write_snapshot
 
 
 if __name__ == "__main__":
     print("=== RAW 금융상품 + 설명 생성 후 저장 시작 ===")
-    data = fetch_findata("fixed_deposit")
-    data += fetch_findata("installment_deposit")
-    data += fetch_findata("jeonse_loan")
+    data = fetch_findata_all(("fixed_deposit", "installment_deposit", "jeonse_loan"))
 
     # 여기서 LLM으로 상품설명 생성
     data = create_description(data)
+    # 다음 단계(DB 재적재, chunk, 임베딩)에서 다시 읽을 수 있도록 snapshot 저장
+    write_snapshot(data)
 
     print(f"총 {len(data)}건 통합 데이터 반환 완료")
     print(f"main.py {len(data)}건 저장 시작")
@@ -4,12 +4,14 @@
 수집된 데이터를 MySQL DB에 저장(save)하는 전체 프로세스를 실행
 
 실행 순서
-1. call_findata_api.py 의 fetch_findata() 함수를 통해 금융상품 데이터 수집
-2. save_to_db.py 의 save_fin_products() 함수를 통해 DB 저장
+1. desc_test.py 로 수집 + 상품설명 생성 후 저장한 snapshot(findata/data/snapshot) 을 카테고리별로 읽음
+2. save_to_db_final.py 의 save_to_db_final() 함수를 통해 DB 저장
 3. 실행 결과 및 오류는 콘솔에 출력됨
 
 실행 명령어
-python -m findata.main
+python -m findata.main_desc
+python -m findata.main_desc --category jeonse_loan
+python manage.py load_products --category jeonse_loan  (Django ORM bulk_upsert_from_api 로 저장)
 
 모든 카테고리 저장 처리:
 1) fixed_deposit (정기예금)
@@ -17,19 +19,20 @@ python -m findata.main
 3) jeonse_loan (전세대출)
 """
 
-import pickle
-from pathlib import Path
+import argparse
 
-from findata.save_to_db_findata import save_to_db_final
+from findata.save_to_db_final import save_to_db_final
+from findata.snapshot import load_products
 
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-data_path = BASE_DIR / "findata" / "data"
-
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="save findata snapshot to DB")
+    # ["fixed_deposit", "installment_deposit", "jeonse_loan", "all"] 중 하나
+    parser.add_argument("--category", "-c", type=str, default="all", help="category of finance data")
+    args = parser.parse_args()
+
     print("=== 금융상품 전체 데이터 수집 및 저장 프로세스 시작 ===")
-    with open(data_path / "findata_all.pkl", "rb") as f:
-        loaded_data = pickle.load(f)
+    loaded_data = load_products(None if args.category == "all" else [args.category])
 
     try:
         if loaded_data:
@@ -0,0 +1,191 @@
+"""
+카테고리별 collection 4개(finance_products_{fixed_deposit, installment_deposit, jeonse_loan, all})를
+collection 1개(QDRANT_COLLECTION) + payload category 로 옮기는 migration
+- 카테고리 collection 의 point 를 vector 그대로 복사 (재임베딩 없음)
+  기존 point 는 uuid4 id 에 content_hash/payload_hash 가 없으므로, payload 의 metadata 와 text 로
+  save_vector_db 와 같은 point id/payload(build_points_plan)를 다시 계산해서 저장
+  -> 같은 snapshot 으로 다음 save_vector_db 를 실행하면 재임베딩 없이 "유지" (metadata 가 바뀐 chunk 는 payload 만 갱신)
+- finance_products_all 은 세 카테고리의 중복이므로 복사하지 않음 (point 수만 비교)
+- 옮긴 뒤 카테고리별 point 수가 같은지 확인, --verify 면 같은 query vector 로
+  기존 collection 검색과 새 collection 의 category filter 검색의 상위 10개 일치율과 latency 비교
+- --drop_old 를 주면 확인이 끝난 뒤 기존 collection 삭제 (주지 않으면 그대로 두어서 되돌릴 수 있음)
+
+실행 명령어
+python -m findata.migrate_collections --save_to server --verify 50
+python -m findata.migrate_collections --save_to server --drop_old
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+from findata.snapshot import CATEGORIES
+from findata.vector_db import (
+    CATEGORY_FIELD,
+    PRODUCT_KEY_FIELD,
+    QDRANT_COLLECTION,
+    build_points_plan,
+    category_filter,
+    create_payload_indexes,
+    get_qdrant_local,
+    get_qdrant_server,
+    product_key,
+)
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+save_path = BASE_DIR / "findata" / "qdrant_localdb"
+
+# build_points_plan 이 chunk 마다 다시 계산하는 payload key (나머지는 상품 metadata)
+DERIVED_FIELDS = {CATEGORY_FIELD, PRODUCT_KEY_FIELD, "chunk_id", "text", "content_hash", "payload_hash"}
+
+
+def copy_category(
+    client: QdrantClient, source: str, target: str, scroll_size: int = 256, dry_run: bool = False
+) -> dict[str, str]:
+    """
+    source collection 의 point 를 save_vector_db 와 같은 id/payload 로 바꿔서 target 에 upsert (vector 는 그대로)
+    - 기존 payload 의 chunk_id(collection 안에서의 저장 순번) 순으로 정렬해서 상품 안 chunk 순서를 복원
+      (chunk_id 가 없으면 scroll 순서)
+    - 같은 chunk 가 여러 번 저장된 경우 (uuid4 id 라 save_vector_db 를 다시 실행할 때마다 추가됨) 하나만 복사
+
+    return dict : 기존 point id -> 새 point id
+    """
+    records = []
+    offset = None
+    while True:
+        batch, offset = client.scroll(
+            collection_name=source, limit=scroll_size, offset=offset, with_payload=True, with_vectors=True
+        )
+        records.extend(batch)
+        if offset is None:
+            break
+    records.sort(key=lambda record: (record.payload or {}).get("chunk_id", 0))
+
+    docs, vectors = [], []
+    doc_index = {}  # 기존 point id -> docs 번호
+    seen = {}  # (상품 key, 기존 chunk_id, text) -> docs 번호
+    for record in records:
+        payload = record.payload or {}
+        metadata = {key: value for key, value in payload.items() if key not in DERIVED_FIELDS}
+        chunk = (product_key(metadata), payload.get("chunk_id"), payload["text"])
+        if chunk not in seen:
+            seen[chunk] = len(docs)
+            docs.append(Document(page_content=payload["text"], metadata=metadata))
+            vectors.append(record.vector)
+        doc_index[str(record.id)] = seen[chunk]
+
+    plan = build_points_plan(docs)
+    if not dry_run:
+        for i in range(0, len(plan), scroll_size):
+            client.upsert(
+                collection_name=target,
+                points=[
+                    PointStruct(id=item["id"], vector=vector, payload=item["payload"])
+                    for item, vector in zip(plan[i : i + scroll_size], vectors[i : i + scroll_size], strict=True)
+                ],
+            )
+    return {point_id: plan[i]["id"] for point_id, i in doc_index.items()}
+
+
+def compare_search(
+    client: QdrantClient, source: str, target: str, category: str, id_map: dict[str, str], n: int, top: int = 10
+) -> dict:
+    """
+    source 에서 point n 개의 vector 를 query 로 써서 기존 collection 검색과 새 collection 의 category 검색 비교
+    - id_map : copy_category 결과 (기존 id 를 새 id 로 바꿔서 비교)
+
+    return dict : 상위 top 개 id 일치율, latency p50 (ms)
+    """
+    records, _ = client.scroll(collection_name=source, limit=n, with_payload=False, with_vectors=True)
+    overlap, old_ms, new_ms = [], [], []
+    for record in records:
+        start = time.perf_counter()
+        old = client.query_points(collection_name=source, query=record.vector, limit=top).points
+        old_ms.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        new = client.query_points(
+            collection_name=target, query=record.vector, query_filter=category_filter(category), limit=top
+        ).points
+        new_ms.append(time.perf_counter() - start)
+        old_ids = {id_map[str(p.id)] for p in old}  # 중복 chunk 는 같은 새 id
+        overlap.append(len(old_ids & {str(p.id) for p in new}) / max(len(old_ids), 1))
+    return {
+        "overlap": float(np.mean(overlap)) if overlap else 0.0,
+        "old_p50_ms": float(np.percentile(old_ms, 50) * 1000) if old_ms else 0.0,
+        "new_p50_ms": float(np.percentile(new_ms, 50) * 1000) if new_ms else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="migrate per-category collections into one collection")
+    parser.add_argument("--save_to", "-s", type=str, default="server", help="server or local")
+    parser.add_argument("--prefix", type=str, default="finance_products", help="old collection name prefix")
+    parser.add_argument("--target", type=str, default=QDRANT_COLLECTION)
+    parser.add_argument("--scroll_size", type=int, default=256)
+    parser.add_argument("--verify", type=int, default=0, help="number of sample queries per category")
+    parser.add_argument("--drop_old", action="store_true", help="delete old collections after the counts match")
+    parser.add_argument("--dry_run", action="store_true")
+    args = parser.parse_args()
+
+    if args.save_to == "server":
+        client = get_qdrant_server(collection_name=args.target)
+        # category tenant index 를 point 보다 먼저 만들어야 HNSW 를 만들 때 category 별 link 가 생김
+        create_payload_indexes(client, args.target)
+    else:
+        client = get_qdrant_local(collection_name=args.target, path=save_path)
+
+    sources = {category: f"{args.prefix}_{category}" for category in CATEGORIES}
+    sources = {category: name for category, name in sources.items() if client.collection_exists(name)}
+    if args.target in sources.values():
+        raise ValueError(f"target collection 이 기존 collection 과 같습니다: {args.target}")
+
+    counts, id_maps = {}, {}
+    for category, source in sources.items():
+        start = time.perf_counter()
+        id_maps[category] = copy_category(client, source, args.target, args.scroll_size, args.dry_run)
+        counts[category] = len(set(id_maps[category].values()))
+        print(
+            f"{source} -> {args.target} (category={category}): {len(id_maps[category])}개 point "
+            f"(중복 제외 {counts[category]}개), {time.perf_counter() - start:.1f}초"
+        )
+
+    if args.dry_run:
+        raise SystemExit("dry run: 복사하지 않았습니다")
+
+    print("-" * 90)
+    matched = True
+    for category in sources:
+        migrated = client.count(args.target, count_filter=category_filter(category), exact=True).count
+        ok = migrated == counts[category]
+        matched &= ok
+        print(f"{category:<20} 기존 {counts[category]:>7}개, 이동 후 {migrated:>7}개 {'O' if ok else 'X'}")
+    all_collection = f"{args.prefix}_all"
+    if client.collection_exists(all_collection):
+        total = client.count(all_collection, exact=True).count
+        print(f"{all_collection} {total}개 (복사하지 않음, 카테고리 합 {sum(counts.values())}개)")
+
+    if args.verify:
+        print("-" * 90)
+        print(f"{'category':<20} {'top10 일치':>10} {'기존 p50(ms)':>13} {'category filter p50(ms)':>24}")
+        for category, source in sources.items():
+            result = compare_search(client, source, args.target, category, id_maps[category], args.verify)
+            print(
+                f"{category:<20} {result['overlap'] * 100:>9.1f}% "
+                f"{result['old_p50_ms']:>13.2f} {result['new_p50_ms']:>24.2f}"
+            )
+
+    if args.drop_old:
+        if not matched:
+            raise SystemExit("point 수가 맞지 않아 기존 collection 을 삭제하지 않습니다")
+        for name in [*sources.values(), all_collection]:
+            if client.collection_exists(name):
+                client.delete_collection(name)
+                print(f"기존 collection 삭제: {name}")
+    print("-" * 90)
@@ -1,8 +1,7 @@
 import os
+import time
 from pathlib import Path
 
-import MySQLdb
-
 from findata.config_manager import JsonConfigManager
 
 
@@ -13,6 +12,9 @@ conf = JsonConfigManager(path=conf_path).values
 
 # DB 연결
 def get_conn():
+    # MySQL 드라이버는 실제 연결할 때만 필요 (sqlite 로 테스트할 때는 없어도 됨)
+    import MySQLdb
+
     return MySQLdb.connect(
         host=os.getenv("DB_HOST"),
         user=os.getenv("DB_USER"),
@@ -92,17 +94,70 @@ OPTION_KEEP = {
 }
 
 
-# 기본 상품 저장
-def save_fin_product(cur, p: dict, category_en: str, eng_to_han: dict):
+# 테이블별 upsert 기준 key (products/models.py 의 PK / UniqueConstraint 와 동일)
+TABLE_UNIQUE_KEYS = {
+    "fin_products": ["fin_prdt_cd"],
+    **{f"{category_en}_option": keys for category_en, keys in OPTION_UNIQUE_KEYS.items()},
+}
+
+
+def create_sqlite_tables(conn) -> None:
+    """
+    products/models.py 와 같은 테이블/unique key를 가진 SQLite 스키마 (dialect="sqlite" 로컬 테스트/벤치마크용)
+    """
+    product_cols = sorted(COMMON_BASE_FIELDS | {"company_type", "category", "description"})
+    conn.execute(
+        f"CREATE TABLE fin_products ({', '.join(f'{c} TEXT' for c in product_cols)}, PRIMARY KEY (fin_prdt_cd))"
+    )
+    for category_en, fields in OPTION_KEEP.items():
+        table = f"{category_en}_option"
+        cols = ["fin_prdt_cd", *sorted(fields)]
+        conn.execute(
+            f"CREATE TABLE {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            f"{', '.join(f'{c} TEXT' for c in cols)}, UNIQUE ({', '.join(TABLE_UNIQUE_KEYS[table])}))"
+        )
+
+
+def build_upsert_query(table: str, cols: list[str], dialect: str = "mysql") -> str:
+    """
+    한 row용 upsert 쿼리 (executemany에 그대로 사용)
+    - unique key는 제외하고 일반 필드만 업데이트
+    - dialect: "mysql" (ON DUPLICATE KEY UPDATE) / "sqlite" (ON CONFLICT ... DO UPDATE, 로컬 테스트용)
+    """
+    unique_keys = TABLE_UNIQUE_KEYS[table]
+    update_cols = [c for c in cols if c not in unique_keys]
+
+    if dialect == "mysql":
+        placeholders = ",".join(["%s"] * len(cols))
+        update_clause = ",".join([f"{c}=VALUES({c})" for c in update_cols])
+        return f"""
+        INSERT INTO {table} ({",".join(cols)})
+        VALUES ({placeholders})
+        ON DUPLICATE KEY UPDATE
+            {update_clause}
+    """
+    elif dialect == "sqlite":
+        placeholders = ",".join(["?"] * len(cols))
+        update_clause = ",".join([f"{c}=excluded.{c}" for c in update_cols])
+        return f"""
+        INSERT INTO {table} ({",".join(cols)})
+        VALUES ({placeholders})
+        ON CONFLICT ({",".join(unique_keys)}) DO UPDATE SET
+            {update_clause}
     """
-    fin_products
+    raise ValueError(f"지원하지 않는 dialect: {dialect}")
+
+
+def build_fin_product_row(p: dict, category_en: str, eng_to_han: dict) -> tuple[list[str], list]:
+    """
+    fin_products 한 row의 (컬럼, 값)
     - 3카테고리에 공통으로 존재하는 필드만 저장
     - company_type, category, description 은 별도 추가
     """
     cols = []
     vals = []
 
-    for eng_key in COMMON_BASE_FIELDS:
+    for eng_key in sorted(COMMON_BASE_FIELDS):
         han_key = eng_to_han.get(eng_key)
         if han_key:
             cols.append(eng_key)
@@ -116,87 +171,152 @@ def save_fin_product(cur, p: dict, category_en: str, eng_to_han: dict):
 
     cols.append("description")
     vals.append(p.get("상품설명"))
-
-    placeholders = ",".join(["%s"] * len(vals))
-
-    query = f"""
-        INSERT INTO fin_products ({",".join(cols)})
-        VALUES ({placeholders})
-        ON DUPLICATE KEY UPDATE
-            {",".join([f"{c}=VALUES({c})" for c in cols])}
-    """
-
-    cur.execute(query, vals)
+    return cols, vals
 
 
-# 옵션 저장 (카테고리별)
-def upsert_option(cur, category_en: str, fin_prdt_cd: str, p: dict, opt: dict, eng_to_han: dict):
+def build_option_row(
+    category_en: str, fin_prdt_cd: str, p: dict, opt: dict, eng_to_han: dict
+) -> tuple[list[str], list]:
     """
-    옵션 테이블 3종
-    - table: fixed_deposit_option / installment_deposit_option / jeonse_loan_option
+    옵션 테이블 한 row의 (컬럼, 값)
     - OPTION_KEEP[category_en] 에 정의된 필드를
       (opt 에 있으면 opt에서, 없으면 p에서) 가져와 1 row로 저장
+    - unique key 컬럼의 NULL 은 빈 문자열로 저장 (products.models.option_key_value 와 같은 규칙)
     """
-    table = f"{category_en}_option"
-    allowed_fields = OPTION_KEEP[category_en]
-    unique_keys = OPTION_UNIQUE_KEYS[category_en]
-
-    cols = []
-    vals = []
+    cols = ["fin_prdt_cd"]  # fin_prdt_cd 강제 삽입
+    vals = [fin_prdt_cd]
 
     # Unique Key + 기타 옵션 필드 모두 컬럼화
-    for eng_key in allowed_fields:
+    for eng_key in sorted(OPTION_KEEP[category_en]):
         han_key = eng_to_han.get(eng_key)
 
         if not han_key:
             continue
 
         value = opt.get(han_key, p.get(han_key))
+        if value is None and eng_key in OPTION_UNIQUE_KEYS[category_en]:
+            value = ""
         cols.append(eng_key)
         vals.append(value)
+    return cols, vals
 
-    # fin_prdt_cd 강제 삽입
-    cols.insert(0, "fin_prdt_cd")
-    vals.insert(0, fin_prdt_cd)
-
-    placeholders = ",".join(["%s"] * len(vals))
-
-    # ON DUPLICATE KEY UPDATE에서 unique key는 제외하고 일반 필드만 업데이트
-    update_cols = [c for c in cols if c not in unique_keys]
-
-    update_clause = ",".join([f"{c}=VALUES({c})" for c in update_cols])
 
-    query = f"""
-        INSERT INTO {table} ({",".join(cols)})
-        VALUES ({placeholders})
-        ON DUPLICATE KEY UPDATE
-            {update_clause}
+# 기본 상품 저장
+def save_fin_product(cur, p: dict, category_en: str, eng_to_han: dict, dialect: str = "mysql"):
     """
-
-    cur.execute(query, vals)
+    fin_products 한 건 저장 (row 단위)
+    """
+    cols, vals = build_fin_product_row(p, category_en, eng_to_han)
+    cur.execute(build_upsert_query("fin_products", cols, dialect), vals)
 
 
-# 전체 저장
-def save_to_db_final(data: list[dict]):
-    conn = get_conn()
-    cur = conn.cursor()
+# 옵션 저장 (카테고리별)
+def upsert_option(
+    cur, category_en: str, fin_prdt_cd: str, p: dict, opt: dict, eng_to_han: dict, dialect: str = "mysql"
+):
+    """
+    옵션 테이블 3종 한 건 저장 (row 단위)
+    - table: fixed_deposit_option / installment_deposit_option / jeonse_loan_option
+    """
+    cols, vals = build_option_row(category_en, fin_prdt_cd, p, opt, eng_to_han)
+    cur.execute(build_upsert_query(f"{category_en}_option", cols, dialect), vals)
 
-    print(f"save_to_db_final: {len(data)}건 저장 시작")
 
+def group_rows(data: list[dict]) -> dict[tuple[str, tuple[str, ...]], list[list]]:
+    """
+    상품/옵션 row를 (테이블, 컬럼) 기준으로 묶음
+    - fin_products 가 옵션 테이블보다 먼저 오도록 (FK)
+    return : {(table, cols): [vals, ...]}
+    """
+    products = {}
+    options = {}
     for p in data:
-        category_kor = p["상품카테고리"]
-        category_en = conf.category[category_kor]
+        category_en = conf.category[p["상품카테고리"]]
         fin_prdt_cd = p["금융상품코드"]
-
         eng_to_han = conf.tags[category_en]
 
-        save_fin_product(cur, p, category_en, eng_to_han)
+        cols, vals = build_fin_product_row(p, category_en, eng_to_han)
+        products.setdefault(("fin_products", tuple(cols)), []).append(vals)
 
         for opt in p.get("옵션", []):
-            upsert_option(cur, category_en, fin_prdt_cd, p, opt, eng_to_han)
+            cols, vals = build_option_row(category_en, fin_prdt_cd, p, opt, eng_to_han)
+            options.setdefault((f"{category_en}_option", tuple(cols)), []).append(vals)
+    return {**products, **options}
+
+
+def fetch_existing_keys(cur, table: str) -> set[tuple]:
+    """
+    테이블에 이미 있는 unique key 목록 (inserted/updated 집계용)
+    """
+    cur.execute(f"SELECT {','.join(TABLE_UNIQUE_KEYS[table])} FROM {table}")
+    return {tuple(row) for row in cur.fetchall()}
+
 
-    conn.commit()
-    cur.close()
-    conn.close()
+def bulk_save_to_db_final(data: list[dict], conn=None, dialect: str = "mysql", batch_size: int = 500) -> dict:
+    """
+    상품/옵션을 테이블별로 묶어서 batch_size 단위 executemany로 저장 (하나의 transaction)
+    - MySQLdb(pymysql) 의 executemany 는 INSERT ... VALUES 를 multi-row VALUES 한 문장으로 보낸다.
+    - 저장 전에 기존 unique key를 조회해서 inserted/updated 건수를 집계
+
+    Args:
+        data (list[dict]): 상품 리스트
+        conn: DB connection (None이면 get_conn()으로 MySQL 연결 후 종료 시 close)
+        dialect (str): "mysql" / "sqlite"
+        batch_size (int): executemany 한 번에 보내는 row 수
+    Returns:
+        stats (dict): table -> {"inserted": int, "updated": int}
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_conn()
+    cur = conn.cursor()
+
+    print(f"save_to_db_final: {len(data)}건 저장 시작")
+    start = time.perf_counter()
+    groups = group_rows(data)
+
+    stats = {}
+    try:
+        existing = {}
+        for table, cols in groups:
+            if table not in existing:
+                existing[table] = fetch_existing_keys(cur, table)
+                stats[table] = {"inserted": 0, "updated": 0}
+
+            unique_idx = [cols.index(key) for key in TABLE_UNIQUE_KEYS[table]]
+            for vals in groups[(table, cols)]:
+                key = tuple(vals[i] for i in unique_idx)
+                if key in existing[table]:
+                    stats[table]["updated"] += 1
+                else:
+                    stats[table]["inserted"] += 1
+                    # 옵션 key 의 NULL 은 build_option_row 에서 빈 문자열로 저장하므로 두 번째 실행부터 updated
+                    existing[table].add(key)
+
+            query = build_upsert_query(table, list(cols), dialect)
+            rows = groups[(table, cols)]
+            for i in range(0, len(rows), batch_size):
+                cur.executemany(query, rows[i : i + batch_size])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        if own_conn:
+            conn.close()
+
+    elapsed = time.perf_counter() - start
+    total = sum(s["inserted"] + s["updated"] for s in stats.values())
+    for table, s in stats.items():
+        print(f"  {table:<28} inserted {s['inserted']:>6}  updated {s['updated']:>6}")
+    print(f"DB 저장 완료: {total} rows ({elapsed:.2f}초, {total / max(elapsed, 1e-9):.0f} rows/sec)")
+    return stats
 
-    print("DB 저장 완료")
+
+# 전체 저장
+def save_to_db_final(data: list[dict], batch_size: int = 500) -> dict:
+    """
+    API 상품 데이터를 fin_products / 옵션 테이블에 upsert (bulk_save_to_db_final 참고)
+    """
+    return bulk_save_to_db_final(data, batch_size=batch_size)
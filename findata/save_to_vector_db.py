@@ -1,8 +1,9 @@
 import argparse
 from pathlib import Path
 
-from findata.call_findata_api import fetch_findata
+from findata.call_findata_api import fetch_findata, fetch_findata_all
 from findata.simple_chunk import chunk
+from findata.snapshot import iter_products, load_products
 from findata.vector_db import save_vector_db
 
 
@@ -12,6 +13,7 @@ save_path = BASE_DIR / "findata" / "qdrant_localdb"
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="This is saving findata to qdrant vector db")
     # ["fixed_deposit", "installment_deposit", "jeonse_loan", "all", "all_apart"] 중 하나
+    # 모두 같은 collection(QDRANT_COLLECTION)에 저장, "all" 은 세 카테고리를 한 번에 / "all_apart" 는 카테고리씩
     parser.add_argument(
         "--category",
         "-c",
@@ -26,30 +28,55 @@ if __name__ == "__main__":
         default="local",
         help="category of finance data",
     )
+    parser.add_argument(
+        "--batch_size",
+        "-b",
+        type=int,
+        default=64,
+        help="number of chunks per embedding forward pass",
+    )
+    parser.add_argument(
+        "--num_workers",
+        "-w",
+        type=int,
+        default=0,
+        help="number of CPU processes for embedding (0 or 1: single process)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="read products from findata/data/snapshot instead of calling the API",
+    )
     args = parser.parse_args()
+    embed_kwargs = {"batch_size": args.batch_size, "num_workers": args.num_workers}
+
+    # snapshot 은 해당 카테고리 파일만 읽고, chunk() 는 상품을 하나씩 받아서 처리
+    if args.snapshot:
+        load_category, load_all = iter_products, load_products
+    else:
+        load_category, load_all = fetch_findata, fetch_findata_all
+
     if args.category == "all":
-        data = []
-        data.extend(fetch_findata(category="fixed_deposit"))
-        data.extend(fetch_findata(category="installment_deposit"))
-        data.extend(fetch_findata(category="jeonse_loan"))
+        data = load_all(("fixed_deposit", "installment_deposit", "jeonse_loan"))
 
-        save_vector_db(chunk(data), category=args.category, path=save_path, save_to=args.save_to)
+        save_vector_db(chunk(data), category=args.category, path=save_path, save_to=args.save_to, **embed_kwargs)
 
     elif args.category == "all_apart":
-        data1 = fetch_findata(category="fixed_deposit")
-        save_vector_db(chunk(data1), category="fixed_deposit", path=save_path, save_to=args.save_to)
+        data1 = load_category("fixed_deposit")
+        save_vector_db(chunk(data1), category="fixed_deposit", path=save_path, save_to=args.save_to, **embed_kwargs)
 
-        data2 = fetch_findata(category="installment_deposit")
+        data2 = load_category("installment_deposit")
         save_vector_db(
             chunk(data2),
             category="installment_deposit",
             path=save_path,
             save_to=args.save_to,
+            **embed_kwargs,
         )
 
-        data3 = fetch_findata(category="jeonse_loan")
-        save_vector_db(chunk(data3), category="jeonse_loan", path=save_path, save_to=args.save_to)
+        data3 = load_category("jeonse_loan")
+        save_vector_db(chunk(data3), category="jeonse_loan", path=save_path, save_to=args.save_to, **embed_kwargs)
 
     else:
-        data = fetch_findata(category=args.category)
-        save_vector_db(chunk(data), category=args.category, path=save_path, save_to=args.save_to)
+        data = load_category(args.category)
+        save_vector_db(chunk(data), category=args.category, path=save_path, save_to=args.save_to, **embed_kwargs)
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -128,6 +130,22 @@ def make_embedding_ready_text_jeonse_loan(product: dict) -> str:
     return text
 
 
+def make_embedding_ready_text(product: dict) -> str:
+    """
+    상품카테고리에 맞는 make_embedding_ready_text_* 함수로 변환
+    arguments : (Dict) 금융 데이터 한건 json
+    return : (str) json을 자연어로 풀어쓴 string
+    """
+
+    if product["상품카테고리"] == "정기예금":
+        return make_embedding_ready_text_deposit(product)
+    elif product["상품카테고리"] == "적금":
+        return make_embedding_ready_text_installment(product)
+    elif product["상품카테고리"] == "전세자금대출":
+        return make_embedding_ready_text_jeonse_loan(product)
+    raise ValueError(f"지원하지 않는 상품카테고리: {product['상품카테고리']}")
+
+
 def make_embedding_ready_sentence_deposit(data_list: list[dict]) -> list[str]:
     """
     JSON 데이터 -> 문장을 리스트로 반환하는 함수
@@ -139,23 +157,18 @@ def make_embedding_ready_sentence_deposit(data_list: list[dict]) -> list[str]:
     return [make_embedding_ready_text_deposit(data) for data in data_list]
 
 
-def chunk(json_data_list: list[dict]) -> list[str]:
+def chunk(json_data_list: Iterable[dict]) -> list[str]:
     """
     모든 금융데이터 List[Dict]를 chunk하는 함수
     후에 조정 필요
-    arguments : (List[Dict]) 모든 금융 데이터 json List[Dict]
+    arguments : (Iterable[Dict]) 모든 금융 데이터 json (list 또는 snapshot.iter_products 처럼 하나씩 주는 iterator)
     return : (List[str]) 모든 금융 데이터의 chunk data List
     """
 
     splitter = RecursiveCharacterTextSplitter(chunk_size=250, chunk_overlap=30)  # , separators=["\n\n", ",", ".", " "])
     docs = []
     for json_product in json_data_list:
-        if json_product["상품카테고리"] == "정기예금":
-            text = make_embedding_ready_text_deposit(json_product)
-        elif json_product["상품카테고리"] == "적금":
-            text = make_embedding_ready_text_installment(json_product)
-        elif json_product["상품카테고리"] == "전세자금대출":
-            text = make_embedding_ready_text_jeonse_loan(json_product)
+        text = make_embedding_ready_text(json_product)
         base_doc = Document(page_content=text, metadata=json_product)
         # chunk 분리
         chunks = splitter.split_documents([base_doc])
@@ -0,0 +1,194 @@
+"""
+금융상품 snapshot (Arrow IPC, 카테고리별 상품/옵션 테이블)
+
+findata_all.pkl(중첩 dict pickle)을 대체하는 저장 형식
+- findata/data/snapshot/{category}_products.arrow : 상품 1건 = 1 row ("옵션" 제외)
+- findata/data/snapshot/{category}_options.arrow  : 옵션 1건 = 1 row, product_idx 로 상품 row 번호를 가리킴
+  (상품 순서대로 저장하므로 product_idx 오름차순)
+- 압축하지 않은 IPC file 이라 memory map 으로 열면 읽는 column/batch 만 실제로 접근
+- 카테고리마다 파일이 나뉘어 있어 한 카테고리만 읽을 때 다른 카테고리는 열지 않음
+
+금리 column 은 float64 로 저장하고, 읽을 때 정수 값은 int 로 돌려서
+API json 을 읽은 원래 dict 와 같은 값이 되도록 함
+
+실행 명령어 (기존 pickle 변환)
+python -m findata.snapshot --from_pickle findata/data/findata_all.pkl
+"""
+
+import argparse
+import pickle
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from findata.config_manager import JsonConfigManager
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+conf = JsonConfigManager(path=BASE_DIR / "findata/config.json").values
+snapshot_path = BASE_DIR / "findata" / "data" / "snapshot"
+
+CATEGORIES = ("fixed_deposit", "installment_deposit", "jeonse_loan")
+# 문자열이 아닌 column 타입 (나머지는 모두 string)
+COLUMN_TYPES = {
+    "최고한도": pa.int64(),
+    "저축금리": pa.float64(),
+    "최고우대금리": pa.float64(),
+    "대출금리최저": pa.float64(),
+    "대출금리최고": pa.float64(),
+    "전월취급평균금리": pa.float64(),
+}
+FLOAT_COLUMNS = {name for name, dtype in COLUMN_TYPES.items() if pa.types.is_floating(dtype)}
+
+
+def build_schema(rows: list[dict], extra: tuple[pa.Field, ...] = ()) -> pa.Schema:
+    """
+    rows 에 나온 key 순서대로 schema 생성 (COLUMN_TYPES 외에는 string)
+    """
+    names = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    fields = [pa.field(name, COLUMN_TYPES.get(name, pa.string())) for name in names]
+    return pa.schema([*extra, *fields])
+
+
+def to_tables(products: list[dict]) -> tuple[pa.Table, pa.Table]:
+    """
+    한 카테고리 상품 리스트 -> (상품 테이블, 옵션 테이블)
+    """
+    base_rows = [{k: v for k, v in p.items() if k != "옵션"} for p in products]
+    option_rows = [{"product_idx": i, **opt} for i, p in enumerate(products) for opt in p.get("옵션", [])]
+
+    product_schema = build_schema(base_rows)
+    option_schema = build_schema(
+        [{k: v for k, v in row.items() if k != "product_idx"} for row in option_rows],
+        extra=(pa.field("product_idx", pa.int32()),),
+    )
+    return (
+        pa.Table.from_pylist(base_rows, schema=product_schema),
+        pa.Table.from_pylist(option_rows, schema=option_schema),
+    )
+
+
+def write_table(table: pa.Table, file_path: Path) -> None:
+    """
+    IPC file 로 저장 (tmp 파일에 쓰고 교체)
+    """
+    tmp_path = file_path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=1024)
+    tmp_path.replace(file_path)
+
+
+def write_snapshot(products: list[dict], path: Path = snapshot_path) -> dict[str, int]:
+    """
+    상품 리스트를 카테고리별 Arrow IPC 파일로 저장
+
+    Args:
+        products (list[dict]): fetch_findata_all / create_description 결과
+        path (Path): snapshot 폴더
+    Returns:
+        counts (dict): category -> 상품 수
+    """
+    by_category = {}
+    for product in products:
+        by_category.setdefault(conf.category[product["상품카테고리"]], []).append(product)
+
+    path.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    for category, rows in by_category.items():
+        product_table, option_table = to_tables(rows)
+        write_table(product_table, path / f"{category}_products.arrow")
+        write_table(option_table, path / f"{category}_options.arrow")
+        counts[category] = product_table.num_rows
+        print(f"[snapshot] {category}: 상품 {product_table.num_rows}건, 옵션 {option_table.num_rows}건")
+    return counts
+
+
+def open_table(file_path: Path) -> pa.Table:
+    """
+    IPC file 을 memory map 으로 열기 (데이터 복사 없이 필요한 부분만 읽음)
+    """
+    return pa.ipc.open_file(pa.memory_map(str(file_path), "r")).read_all()
+
+
+def open_snapshot(category: str, path: Path = snapshot_path) -> tuple[pa.Table, pa.Table]:
+    """
+    한 카테고리의 (상품 테이블, 옵션 테이블)
+    """
+    if category not in CATEGORIES:
+        raise ValueError(f"지원하지 않는 카테고리: {category}")
+    return open_table(path / f"{category}_products.arrow"), open_table(path / f"{category}_options.arrow")
+
+
+def snapshot_categories(path: Path = snapshot_path) -> list[str]:
+    """
+    snapshot 에 저장된 카테고리 목록
+    """
+    return [category for category in CATEGORIES if (path / f"{category}_products.arrow").exists()]
+
+
+def restore_numbers(row: dict) -> dict:
+    """
+    float64 로 저장된 금리 중 정수 값은 int 로 (API json 의 3 / 3.1 구분 유지)
+    """
+    for name in FLOAT_COLUMNS.intersection(row):
+        value = row[name]
+        if value is not None and value.is_integer():
+            row[name] = int(value)
+    return row
+
+
+def iter_products(category: str, path: Path = snapshot_path) -> Iterator[dict]:
+    """
+    한 카테고리 상품을 record batch 단위로 dict 변환하며 하나씩 반환
+    - 옵션도 상품 batch 에 해당하는 row 만 dict 로 변환 (메모리는 batch 크기만큼만 사용)
+    return : 상품 dict (API 수집 결과와 같은 한글 key, "옵션" 포함)
+    """
+    product_table, option_table = open_snapshot(category, path)
+
+    # 옵션 테이블은 product_idx 순서로 저장되어 있으므로 상품 batch 마다 해당 범위의 옵션 row 만 잘라서 변환
+    product_idx = option_table.column("product_idx").to_numpy()
+    if np.any(product_idx[1:] < product_idx[:-1]):
+        option_table = option_table.sort_by("product_idx")
+        product_idx = option_table.column("product_idx").to_numpy()
+
+    start = 0
+    for batch in product_table.to_batches():
+        end = start + batch.num_rows
+        lo, hi = np.searchsorted(product_idx, [start, end])
+        options = {}
+        for row in option_table.slice(lo, hi - lo).to_pylist():
+            options.setdefault(row.pop("product_idx"), []).append(restore_numbers(row))
+
+        for idx, row in enumerate(batch.to_pylist(), start=start):
+            row = restore_numbers(row)
+            row["옵션"] = options.get(idx, [])
+            yield row
+        start = end
+
+
+def load_products(categories: Iterable[str] | None = None, path: Path = snapshot_path) -> list[dict]:
+    """
+    여러 카테고리 상품을 list 로 반환 (categories=None 이면 snapshot 에 있는 전체)
+    """
+    if categories is None:
+        categories = snapshot_categories(path)
+    products = []
+    for category in categories:
+        products.extend(iter_products(category, path))
+    return products
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="convert findata pickle to arrow snapshot")
+    parser.add_argument("--from_pickle", type=str, required=True, help="pickle path of list[dict] products")
+    args = parser.parse_args()
+
+    with open(args.from_pickle, "rb") as f:
+        data = pickle.load(f)
+    write_snapshot(data)
+    assert load_products() == data, "snapshot 결과가 pickle 과 다름"
+    print("변환 완료, 원본과 동일함을 확인했습니다.")
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import openai
+
+from finbot.stub_openai import start_stub_server
+from findata.describe import (
+    DESC_MODEL,
+    RateLimiter,
+    describe_products,
+    load_desc_cache,
+    request_description,
+)
+from findata.save_to_db_final import TABLE_UNIQUE_KEYS, bulk_save_to_db_final, create_sqlite_tables
+
+
+PRODUCTS = [
+    {
+        "상품카테고리": "정기예금",
+        "금융상품코드": "FD001",
+        "금융회사명": "테스트은행",
+        "금융상품명": "테스트 정기예금",
+        "공시제출월": "202501",
+        "옵션": [
+            {"저축금리유형명": "단리", "저축개월": "12", "저축금리": 3.0, "최고우대금리": 3.5},
+            {"저축금리유형명": "단리", "저축개월": "24", "저축금리": 3.1, "최고우대금리": 3.6},
+        ],
+    },
+    {
+        "상품카테고리": "전세자금대출",
+        "금융상품코드": "JL001",
+        "금융회사명": "테스트은행",
+        "금융상품명": "테스트 전세자금대출",
+        "공시제출월": "202501",
+        # 대출상환유형이 없는 옵션 (unique key 에 NULL)
+        "옵션": [{"대출상환유형": None, "대출금리유형": "변동금리", "대출금리최저": 4.1}],
+    },
+]
+
+
+class BulkSaveToDbFinalTest(unittest.TestCase):
+    """
+    bulk_save_to_db_final 을 SQLite 에 두 번 실행했을 때 두 번째 실행은 전부 updated 인지 확인
+    """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_sqlite_tables(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def count_rows(self) -> dict[str, int]:
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLE_UNIQUE_KEYS}
+
+    def test_second_run_inserts_nothing(self):
+        first = bulk_save_to_db_final(PRODUCTS, conn=self.conn, dialect="sqlite")
+        counts = self.count_rows()
+        second = bulk_save_to_db_final(PRODUCTS, conn=self.conn, dialect="sqlite")
+
+        self.assertEqual(sum(s["inserted"] for s in first.values()), 5)
+        self.assertEqual({table: s["inserted"] for table, s in second.items()}, dict.fromkeys(second, 0))
+        self.assertEqual(sum(s["updated"] for s in second.values()), 5)
+        self.assertEqual(self.count_rows(), counts)
+
+    def test_null_option_key_saved_as_empty_string(self):
+        bulk_save_to_db_final(PRODUCTS, conn=self.conn, dialect="sqlite")
+        rows = self.conn.execute("SELECT rpay_type_nm FROM jeonse_loan_option").fetchall()
+        self.assertEqual(rows, [("",)])
+
+
+def make_deposit(n: int) -> dict:
+    return {
+        "상품카테고리": "정기예금",
+        "금융회사명": "테스트은행",
+        "금융상품명": f"테스트 예금 {n}",
+        "가입대상": "제한없음",
+        "가입방법": "인터넷",
+        "우대조건": "없음",
+        "만기후이자율": "1%",
+    }
+
+
+class DescribeProductsTest(unittest.TestCase):
+    """
+    findata.describe 를 로컬 stub OpenAI 서버(finbot.stub_openai)로 확인 (실제 API 호출 없음)
+    """
+
+    def setUp(self):
+        os.environ.setdefault("OPENAI_API_KEY", "stub")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.tmp.name) / "desc_cache.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def start_server(self, **kwargs):
+        server = start_stub_server(latency=kwargs.pop("latency", 0.05), **kwargs)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def describe(self, products: list[dict], server, **kwargs) -> list[dict]:
+        kwargs.setdefault("cache_path", self.cache_path)
+        kwargs.setdefault("rpm", 0)
+        return describe_products([dict(p) for p in products], base_url=server.url, **kwargs)
+
+    def test_concurrency_limit(self):
+        server = self.start_server(latency=0.2)
+        products = [make_deposit(n) for n in range(12)]
+        described = self.describe(products, server, concurrency=4)
+
+        self.assertEqual(server.stats.requests, 12)
+        self.assertEqual(server.stats.max_in_flight, 4)
+        self.assertTrue(all(p["상품설명"].startswith("stub 응답") for p in described))
+
+    def test_cache_hit_skips_requests(self):
+        server = self.start_server()
+        products = [make_deposit(n) for n in range(5)]
+        first = self.describe([*products, products[0]], server)
+        # 같은 텍스트는 한 번만 요청
+        self.assertEqual(server.stats.requests, 5)
+        self.assertEqual(len(load_desc_cache(self.cache_path)), 5)
+
+        second = self.describe(products, server)
+        self.assertEqual(server.stats.requests, 5)
+        self.assertEqual([p["상품설명"] for p in second], [p["상품설명"] for p in first[:5]])
+
+    def test_no_cache_file_without_use_cache(self):
+        server = self.start_server()
+        self.describe([make_deposit(0)], server, use_cache=False)
+        self.describe([make_deposit(0)], server, use_cache=False)
+
+        self.assertEqual(server.stats.requests, 2)
+        self.assertFalse(self.cache_path.exists())
+
+    def test_rate_limited_requests_are_retried(self):
+        server = self.start_server(rate_limit_every=3)
+        products = [make_deposit(n) for n in range(6)]
+        described = self.describe(products, server, concurrency=2)
+
+        self.assertGreater(server.stats.requests, 6)
+        self.assertTrue(all(p["상품설명"].startswith("stub 응답") for p in described))
+        self.assertEqual(len(load_desc_cache(self.cache_path)), 6)
+
+    def test_rate_limit_gives_up_after_retries(self):
+        server = self.start_server(rate_limit_every=1)
+
+        async def request():
+            async with openai.AsyncOpenAI(api_key="stub", base_url=server.url, max_retries=0) as client:
+                return await request_description(
+                    client, "text", DESC_MODEL, asyncio.Semaphore(1), RateLimiter(0), retries=2, backoff=0.01
+                )
+
+        with self.assertRaises(openai.RateLimitError):
+            asyncio.run(request())
+        self.assertEqual(server.stats.requests, 3)
+
+    def test_non_retryable_error_raises(self):
+        server = self.start_server()
+        with self.assertRaises(openai.NotFoundError):
+            describe_products([make_deposit(0)], base_url=server.url.replace("/v1", "/v0"), cache_path=self.cache_path)
+        self.assertEqual(load_desc_cache(self.cache_path), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
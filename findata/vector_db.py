@@ -1,13 +1,34 @@
+import hashlib
+import json
 import os
 import sys
+import time
 import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 
+import numpy as np
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, VectorParams
-from sentence_transformers import SentenceTransformer
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    MatchValue,
+    OverwritePayloadOperation,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    SetPayload,
+    VectorParams,
+)
 from tqdm import tqdm
 
+from findata.snapshot import conf
+
 
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
@@ -15,25 +36,58 @@ load_dotenv("../.env")
 QDRANT_API_KEY = os.getenv("OPENAI_API_KEY")
 QDRANT_URL = os.getenv("QDRANT_URL")
 
+# 카테고리(fixed_deposit, installment_deposit, jeonse_loan) 전체를 collection 1개에 저장하고
+# payload "category" 로 구분 (카테고리 검색은 category filter, "all" 검색은 filter 없이)
+QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "finance_products")
+CATEGORY_FIELD = "category"
+# 상품 식별 key (product_key(): 카테고리 + 금융회사코드 + 금융상품코드), 검색 결과를 상품 단위로 묶을 때 사용
+PRODUCT_KEY_FIELD = "product_key"
+
+# rag_search 상품 조건 filter(rag_flow/query_filters.py)에서 쓰는 payload key
+# 옵션은 list[dict] 이므로 "옵션[].key" 로 nested 필드에 index
+# category 는 tenant index (같은 category 의 point 를 저장소에서 가까이 두어 category filter 검색이 빠르도록)
+PAYLOAD_INDEXES = {
+    CATEGORY_FIELD: KeywordIndexParams(type="keyword", is_tenant=True),
+    PRODUCT_KEY_FIELD: PayloadSchemaType.KEYWORD,
+    "금융상품코드": PayloadSchemaType.KEYWORD,
+    "회사유형": PayloadSchemaType.KEYWORD,
+    "가입제한": PayloadSchemaType.KEYWORD,
+    "옵션[].저축개월": PayloadSchemaType.KEYWORD,
+    "옵션[].저축금리": PayloadSchemaType.FLOAT,
+    "옵션[].최고우대금리": PayloadSchemaType.FLOAT,
+    "옵션[].대출금리최저": PayloadSchemaType.FLOAT,
+}
+
+# point id 생성용 고정 namespace (값을 바꾸면 모든 point id가 바뀌어 전체 재임베딩이 일어남)
+POINT_ID_NAMESPACE = uuid.UUID("6f1c2a4e-3b7d-5e90-9a8b-0c1d2e3f4a5b")
+
+
+def create_collection(client: QdrantClient, collection_name: str, vector_size: int = 768) -> None:
+    """
+    collection 이 없으면 생성
+    - payload_m : category 별 HNSW link 를 추가로 만들어 category filter 검색도 category 안에서 graph 탐색
+      (카테고리별 collection 으로 나누었을 때와 같은 검색 비용, m 은 기본값이라 "all" 검색도 그대로)
+    """
+
+    if not client.collection_exists(collection_name):
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+            hnsw_config=HnswConfigDiff(payload_m=16),
+        )
+
 
 def get_qdrant_local(
-    collection_name: str = "finance_products",
-    category: str = "fixed_deposit",
+    collection_name: str = QDRANT_COLLECTION,
     vector_size: int = 768,
     path: str = "./qdrant_localdb",
 ) -> QdrantClient:
-    db_collection_name = collection_name + "_" + category
     client = QdrantClient(path=path)
-
-    if not client.collection_exists(db_collection_name):
-        client.create_collection(
-            collection_name=db_collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )
+    create_collection(client, collection_name, vector_size)
     return client
 
 
-def get_qdrant_server(collection_name: str, vector_size: int = 768) -> QdrantClient:
+def get_qdrant_server(collection_name: str = QDRANT_COLLECTION, vector_size: int = 768) -> QdrantClient:
     """
     Qdrant 서버 모드로 접속하는 함수
     - collection이 없으면 자동 생성
@@ -49,50 +103,236 @@ def get_qdrant_server(collection_name: str, vector_size: int = 768) -> QdrantCli
     #     api_key=QDRANT_API_KEY,
     # )
 
-    if not client.collection_exists(collection_name):
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+    create_collection(client, collection_name, vector_size)
+    return client
+
+
+def create_payload_indexes(client: QdrantClient, collection_name: str) -> None:
+    """
+    PAYLOAD_INDEXES 중 collection 에 아직 없는 payload index 생성 (서버 모드)
+    - filter 를 건 검색이 전체 point 를 훑지 않고 index 로 후보를 좁히도록
+    - local 모드(QdrantClient(path=...))는 payload index 를 지원하지 않으므로 호출하지 않음
+    """
+
+    existing = client.get_collection(collection_name).payload_schema or {}
+    for field_name, schema in PAYLOAD_INDEXES.items():
+        if field_name not in existing:
+            client.create_payload_index(collection_name=collection_name, field_name=field_name, field_schema=schema)
+            print(f"payload index 생성: {collection_name}.{field_name} ({getattr(schema, 'value', schema.type)})")
+
+
+def iter_doc_batches(chunked_docs: list, stream_size: int) -> Iterator[list]:
+    """
+    Chunk 리스트를 stream_size 단위로 잘라서 순서대로 반환하는 제너레이터
+    arguments:
+        (List) chunked_docs: Chunking된 금융데이터(또는 임베딩 대상) 리스트
+        (int) stream_size: 한 번에 임베딩할 chunk 개수
+    return:
+        Iterator[List[Document]]: chunk 묶음
+    """
+
+    for start in range(0, len(chunked_docs), stream_size):
+        yield chunked_docs[start : start + stream_size]
+
+
+def encode_docs(model, texts: list[str], batch_size: int = 64, pool: dict | None = None) -> np.ndarray:
+    """
+    SentenceTransformer 배치 인코딩 함수
+    - pool이 주어지면 multi-process pool로 나누어 인코딩
+    arguments:
+        (SentenceTransformer) model: 임베딩 모델
+        (List[str]) texts: 임베딩할 문장 리스트
+        (int) batch_size: 모델 forward 한 번에 들어가는 문장 수
+        (dict) pool: start_multi_process_pool()로 생성한 pool
+    return:
+        np.ndarray: (len(texts), vector_size) 임베딩 행렬
+    """
+
+    if pool is not None:
+        return model.encode(texts, pool=pool, batch_size=batch_size, convert_to_numpy=True)
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
+
+def product_key(metadata: dict) -> str:
+    """
+    상품 식별 key: 카테고리 + 금융회사코드 + 금융상품코드
+    - 금융상품코드만으로는 상품이 구분되지 않음 (은행/카테고리가 다른 상품이 같은 코드를 쓰기도 함, 예: 24000, WR0001B)
+    arguments:
+        (dict) metadata: 상품 dict 또는 chunk metadata (상품카테고리, 금융회사코드, 금융상품코드)
+    return:
+        (str) "{category}:{금융회사코드}:{금융상품코드}"
+    """
+
+    category = conf.category[metadata["상품카테고리"]]
+    return f"{category}:{metadata['금융회사코드']}:{metadata['금융상품코드']}"
+
+
+def make_point_id(key: str, chunk_id: int, content_hash: str) -> str:
+    """
+    상품 key + 상품 내 chunk 순번 + chunk 내용 hash로 결정적인 point id 생성
+    - 같은 chunk는 실행할 때마다 같은 id를 가지므로 중복 point가 생기지 않는다.
+    - chunk 내용이 바뀌면 id도 바뀌어 새로 임베딩된다.
+    arguments:
+        (str) key: product_key() 결과
+        (int) chunk_id: 상품 안에서의 chunk 순번
+        (str) content_hash: chunk text의 sha256
+    return:
+        (str) uuid5 문자열
+    """
+
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{key}:{chunk_id}:{content_hash}"))
+
+
+def is_expired(end_day: str | None, today: date | None = None) -> bool:
+    """
+    공시종료일(YYYYMMDD)이 오늘 이전이면 True
+    - fetch_findata()와 같은 기준 (종료일 당일도 만료로 처리)
+    """
+
+    if not end_day:
+        return False
+    today = today or date.today()
+    return end_day[:8] <= today.strftime("%Y%m%d")
+
+
+def category_filter(category: str | None) -> Filter | None:
+    """
+    category 하나의 point 만 고르는 filter ("all" 또는 None 이면 전체 -> None)
+    """
+
+    if not category or category == "all":
+        return None
+    return Filter(must=[FieldCondition(key=CATEGORY_FIELD, match=MatchValue(value=category))])
+
+
+def hash_payload(payload: dict) -> str:
+    """
+    payload_hash 계산 (payload_hash key 자체는 제외)
+    """
+
+    payload = {key: value for key, value in payload.items() if key != "payload_hash"}
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def build_points_plan(chunked_docs: list) -> list[dict]:
+    """
+    Chunk마다 point id, payload를 미리 계산
+    - chunk_id는 상품(product_key: 카테고리 + 금융회사코드 + 금융상품코드) 안에서의 순번
+      (같은 코드의 다른 은행/카테고리 상품이나 카테고리별/"all" 실행 여부에 따라 순번이 달라지지 않도록)
+    - category: 상품카테고리의 영문 이름 (collection 안에서 카테고리 구분)
+    - product_key: product_key() 결과 (rag_flow/retrieval.py 에서 chunk 를 상품 단위로 묶는 key)
+    - content_hash: chunk text hash (id에 포함, 바뀌면 재임베딩)
+    - payload_hash: payload 전체 hash (바뀌면 임베딩 없이 payload만 갱신)
+    arguments:
+        (List[Document]) chunked_docs: Chunking된 금융데이터 리스트
+    return:
+        List[Dict]: {"id", "doc", "payload", "payload_hash"} 리스트
+    """
+
+    plan = []
+    chunk_counter = {}
+    for doc in chunked_docs:
+        key = product_key(doc.metadata)
+        chunk_id = chunk_counter.get(key, 0)
+        chunk_counter[key] = chunk_id + 1
+
+        content_hash = hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()
+        payload = {
+            **doc.metadata,
+            CATEGORY_FIELD: conf.category[doc.metadata["상품카테고리"]],
+            PRODUCT_KEY_FIELD: key,
+            "chunk_id": chunk_id,
+            "text": doc.page_content,
+            "content_hash": content_hash,
+        }
+        payload_hash = hash_payload(payload)
+        payload["payload_hash"] = payload_hash
+
+        plan.append(
+            {
+                "id": make_point_id(key, chunk_id, content_hash),
+                "doc": doc,
+                "payload": payload,
+                "payload_hash": payload_hash,
+            }
         )
+    return plan
 
-    return client
+
+def scan_existing_points(
+    client: QdrantClient, collection_name: str, category: str | None = None, scroll_size: int = 1000
+) -> dict[str, dict]:
+    """
+    Collection에 저장된 point들의 id와 비교용 payload만 조회 (vector는 받지 않음)
+    - category를 주면 해당 카테고리 point만 ("all"이면 전체)
+    return:
+        Dict[str, Dict]: point id -> {"payload_hash", "공시종료일"}
+    """
+
+    existing = {}
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=category_filter(category),
+            limit=scroll_size,
+            offset=offset,
+            with_payload=["payload_hash", "공시종료일"],
+            with_vectors=False,
+        )
+        for record in records:
+            existing[str(record.id)] = record.payload or {}
+        if offset is None:
+            break
+    return existing
 
 
 def save_vector_db(
     chunked_docs: list[str],
-    collection_name: str = "finance_products",
+    collection_name: str = QDRANT_COLLECTION,
     category: str = "fixed_deposit",
     vector_size: int = 768,
     path: str = "./qdrant_localdb",
     save_to: str = "local",
+    batch_size: int = 64,
+    num_workers: int = 0,
+    upsert_batch_size: int = 200,
+    delete_stale: bool = True,
 ) -> QdrantClient:
     """
-    VectorDB에 Chunked data 저장하는 함수 (Qdrant 서버 기반)
-    - BGE-m3 임베딩
-    - Qdrant 서버에 직접 업로드
-
-    VectorDB에 Chunked data 저장하는 함수
-    - "BAAI/bge-m3" Embedding Model 사용
-    - Qdrant VectorDB 사용
+    VectorDB에 Chunked data 저장하는 함수 (증분 갱신)
+    - "BM-K/KoSimCSE-roberta-multitask" Embedding Model 사용
+    - point id는 (product_key, chunk_id, content hash)로 결정되므로 재실행해도 중복이 생기지 않음
+    - 내용이 바뀐 chunk만 임베딩 + upsert, payload만 바뀐 chunk는 payload만 갱신
+    - 모든 카테고리를 collection 1개에 저장 (payload category), 변경분 비교와 삭제는 category 안에서만
+    - 이번 실행에 없는 point(사라진 상품, 바뀌기 전 chunk)와 공시종료일이 지난 point는 삭제
+    - chunk를 batch_size 단위로 묶어서 스트리밍 임베딩
+    - num_workers > 1 이면 CPU multi-process pool로 인코딩
+    - 서버 모드에서는 이전 묶음의 Qdrant upsert와 다음 묶음의 임베딩을 겹쳐서 실행
+    - 서버 모드에서는 상품 조건 filter용 payload index(PAYLOAD_INDEXES)도 생성
     arguments:
-        (List[str]) chunked_docs: Chunking된 금융데이터 리스트
+        (List[Document]) chunked_docs: Chunking된 금융데이터 리스트 (해당 category의 전체 상품)
         (str) collection_name: 금융데이터 DB 이름
-        (str) category: 세부 카테고리
+        (str) category: 세부 카테고리 ("all"이면 전체 카테고리)
         (int) vector_size: embedding vector size
         (str) path: VectorDB 저장 경로
+        (str) save_to: "local" 또는 "server"
+        (int) batch_size: 모델 forward 한 번에 들어가는 chunk 수
+        (int) num_workers: 인코딩 프로세스 수 (0, 1이면 단일 프로세스)
+        (int) upsert_batch_size: Qdrant upsert 한 번에 보내는 point 수
+        (bool) delete_stale: chunked_docs에 없는 기존 point 삭제 여부
     return:
         QdrantClient: Qdrant VectorDB Client
     """
 
-    # bge-m3 임베딩 모델 로드
-    model = SentenceTransformer("BM-K/KoSimCSE-roberta-multitask")
-    db_collection_name = f"{collection_name}_{category}"
+    db_collection_name = collection_name
     print(f"Qdrant Client를 {save_to}에서 불러옵니다......")
     # Qdrant 초기화
     if save_to == "local":
         client = get_qdrant_local(
             collection_name=collection_name,
-            category=category,
             vector_size=vector_size,
             path=path,
         )
@@ -101,43 +341,159 @@ def save_vector_db(
             collection_name=db_collection_name,
             vector_size=vector_size,
         )
+        create_payload_indexes(client, db_collection_name)
     print("Qdrant Client Loaded......")
-    points = []
-    for i, doc in enumerate(tqdm(chunked_docs, desc="임베딩 + 업로드 중")):
-        vec = model.encode([doc.page_content], convert_to_numpy=True)[0]
-        point_id = str(uuid.uuid4())
-        payload = {**doc.metadata, "chunk_id": i, "text": doc.page_content}
-        points.append(PointStruct(id=point_id, vector=vec, payload=payload))
-    batch_size = 200
-    for i in range(0, len(points), batch_size):
-        client.upsert(collection_name=db_collection_name, points=points[i : i + batch_size])
-    # client.upsert(collection_name=db_collection_name, points=points)
-
-    print(f"\n 업로드 완료: 총 {len(points)}개 chunk (Document 기반)")
+
+    # 변경분 계산
+    today = date.today()
+    plan = [
+        item for item in build_points_plan(chunked_docs) if not is_expired(item["payload"].get("공시종료일"), today)
+    ]
+    existing = scan_existing_points(client, db_collection_name, category)
+
+    planned_ids = {item["id"] for item in plan}
+    to_embed = [item for item in plan if item["id"] not in existing]
+    to_update = [
+        item
+        for item in plan
+        if item["id"] in existing and existing[item["id"]].get("payload_hash") != item["payload_hash"]
+    ]
+    to_delete = [
+        point_id
+        for point_id, payload in existing.items()
+        if is_expired(payload.get("공시종료일"), today) or (delete_stale and point_id not in planned_ids)
+    ]
+    unchanged = len(plan) - len(to_embed) - len(to_update)
+    print(
+        f"변경분: 신규/변경 {len(to_embed)}개, payload 갱신 {len(to_update)}개, "
+        f"삭제 {len(to_delete)}개, 유지 {unchanged}개"
+    )
+
+    if to_embed:
+        embed_and_upsert(
+            client,
+            db_collection_name,
+            to_embed,
+            save_to=save_to,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            upsert_batch_size=upsert_batch_size,
+        )
+
+    # payload 만 바뀐 point 는 point 마다 payload 가 달라서 upsert_batch_size 개씩 한 요청에 묶어서 덮어쓰기
+    for i in range(0, len(to_update), upsert_batch_size):
+        client.batch_update_points(
+            collection_name=db_collection_name,
+            update_operations=[
+                OverwritePayloadOperation(overwrite_payload=SetPayload(payload=item["payload"], points=[item["id"]]))
+                for item in to_update[i : i + upsert_batch_size]
+            ],
+        )
+
+    for i in range(0, len(to_delete), upsert_batch_size):
+        client.delete(
+            collection_name=db_collection_name,
+            points_selector=PointIdsList(points=to_delete[i : i + upsert_batch_size]),
+        )
+
+    print(f"\n 저장 완료: 총 {len(plan)}개 chunk (Document 기반, category {category})")
     return client
 
 
-def get_ready_search(category="fixed_deposit", save_to="local"):
+def embed_and_upsert(
+    client: QdrantClient,
+    collection_name: str,
+    plan: list[dict],
+    save_to: str = "local",
+    batch_size: int = 64,
+    num_workers: int = 0,
+    upsert_batch_size: int = 200,
+) -> None:
+    """
+    build_points_plan()으로 만든 chunk들을 스트리밍 임베딩 후 Qdrant에 upsert
+    arguments:
+        (QdrantClient) client: Qdrant VectorDB Client
+        (str) collection_name: 저장할 collection 이름
+        (List[Dict]) plan: build_points_plan()의 결과 중 임베딩이 필요한 항목
+        (str) save_to: "local" 또는 "server"
+        (int) batch_size: 모델 forward 한 번에 들어가는 chunk 수
+        (int) num_workers: 인코딩 프로세스 수 (0, 1이면 단일 프로세스)
+        (int) upsert_batch_size: Qdrant upsert 한 번에 보내는 point 수
+    """
+
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer("BM-K/KoSimCSE-roberta-multitask")
+
+    pool = None
+    if num_workers > 1:
+        pool = model.start_multi_process_pool(target_devices=["cpu"] * num_workers)
+    # pool을 쓸 때는 모든 프로세스가 놀지 않도록 한 번에 더 많은 chunk를 넘긴다.
+    stream_size = batch_size * max(num_workers, 1) * 4
+
+    # local 모드의 sqlite 저장소는 생성한 스레드에서만 쓸 수 있으므로 서버 모드에서만 upsert를 겹친다.
+    uploader = ThreadPoolExecutor(max_workers=1) if save_to == "server" else None
+    pending = None
+
+    def upsert(points: list[PointStruct]) -> None:
+        for i in range(0, len(points), upsert_batch_size):
+            client.upsert(collection_name=collection_name, points=points[i : i + upsert_batch_size])
+
+    total = 0
+    start_time = time.perf_counter()
+    try:
+        with tqdm(total=len(plan), desc="임베딩 + 업로드 중") as pbar:
+            for items in iter_doc_batches(plan, stream_size):
+                texts = [item["doc"].page_content for item in items]
+                vecs = encode_docs(model, texts, batch_size=batch_size, pool=pool)
+                points = [
+                    PointStruct(id=item["id"], vector=vec.tolist(), payload=item["payload"])
+                    for item, vec in zip(items, vecs, strict=True)
+                ]
+                total += len(points)
+
+                if uploader is None:
+                    upsert(points)
+                else:
+                    # 직전 upsert가 끝날 때까지 기다려서 메모리에 쌓이는 묶음을 1개로 제한
+                    if pending is not None:
+                        pending.result()
+                    pending = uploader.submit(upsert, points)
+                pbar.update(len(items))
+
+            if pending is not None:
+                pending.result()
+    finally:
+        if uploader is not None:
+            uploader.shutdown(wait=True)
+        if pool is not None:
+            model.stop_multi_process_pool(pool)
+
+    elapsed = time.perf_counter() - start_time
+    print(f" 임베딩 + 업로드: {total}개 chunk, {total / elapsed:.1f} chunks/sec ({elapsed:.1f}초)")
+
+
+def get_ready_search(save_to="local"):
     """
     임베딩 모델 로드 + Qdrant 서버 접속 반환
+    - 카테고리 검색은 query_filter=category_filter(category)
     """
 
+    from sentence_transformers import SentenceTransformer
+
     model = SentenceTransformer("BM-K/KoSimCSE-roberta-multitask")
-    # 컬렉션 이름 구성
-    db_collection_name = f"finance_products_{category}"
 
     print(">>> 실행됨: get_ready_search()")
     print(">>> BGE 모델 로딩 완료")
 
     if save_to == "local":
         client = get_qdrant_local(
-            collection_name="finance_products",
-            category=category,
+            collection_name=QDRANT_COLLECTION,
             vector_size=768,
         )
     elif save_to == "server":
         client = get_qdrant_server(
-            collection_name=db_collection_name,
+            collection_name=QDRANT_COLLECTION,
             vector_size=768,
         )
 
@@ -0,0 +1,57 @@
+"""
+gunicorn 설정
+gunicorn finbot.wsgi:application -c gunicorn.conf.py
+GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn finbot.asgi:application -c gunicorn.conf.py
+
+- GUNICORN_WORKER_CLASS : sync (기본, WSGI) / uvicorn_worker.UvicornWorker (ASGI, chatbot/async_views.py)
+  -> sync worker 는 LLM 답변을 기다리는 동안 요청 1개에 묶이지만
+     uvicorn worker 는 event loop 하나로 여러 대화를 동시에 처리
+
+- GUNICORN_PRELOAD=1 (기본) : master 에서 finbot.wsgi 와 embedding 모델 weight 를 로드한 뒤 worker 를 fork
+  -> worker 들이 모델 메모리를 copy-on-write 로 공유 (worker 를 늘려도 모델은 1벌)
+- Qdrant/OpenAI client, LangGraph app 은 소켓/thread 를 갖고 있으므로 fork 후 worker 마다 생성
+  (FINBOT_WARMUP 은 master 가 아니라 각 worker 에서 실행)
+- TORCH_NUM_THREADS : worker 당 torch thread 수 (기본: CPU 코어 수 / worker 수)
+"""
+
+import os
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "180"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+torch_threads = int(os.getenv("TORCH_NUM_THREADS") or max(1, (os.cpu_count() or 1) // workers))
+# torch import 전에 설정해야 OpenMP/MKL thread pool 크기에 반영됨
+os.environ.setdefault("OMP_NUM_THREADS", str(torch_threads))
+os.environ.setdefault("MKL_NUM_THREADS", str(torch_threads))
+
+# master 에서 finbot.wsgi import 시 warm-up 하지 않도록 환경변수에서 빼두고 worker 에서 실행
+worker_warmup = os.environ.pop("FINBOT_WARMUP", "")
+
+
+def when_ready(server):
+    """
+    master: app 로드 후, worker fork 전
+    """
+    if preload_app:
+        from finbot.singleton.warmup import preload_for_fork
+
+        preload_for_fork(torch_threads)
+
+
+def post_worker_init(worker):
+    """
+    worker: fork + app 로드 후, 요청을 받기 전
+    """
+    import psutil
+
+    from finbot.singleton.warmup import configure_torch_threads, warm_up_from_env
+
+    configure_torch_threads(torch_threads)
+    warm_up_from_env(worker_warmup)
+    info = psutil.Process().memory_full_info()
+    pss = f", PSS {info.pss / 2**20:.0f}MB" if hasattr(info, "pss") else ""
+    worker.log.info(f"worker {worker.pid} 준비 완료: RSS {info.rss / 2**20:.0f}MB{pss}, USS {info.uss / 2**20:.0f}MB")
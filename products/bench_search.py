@@ -0,0 +1,130 @@
+"""
+상품 검색 벤치마크 (products/search_index.py)
+- 합성 상품 N개 (은행/저축은행 이름 + 상품명 조합)
+- 기존 방식: SQLite in-memory DB 에서 REPLACE(..., ' ', '') LIKE '%q%' (views.search 의 Replace + icontains 와 같은 SQL)
+- 인덱스 방식: ProductSearchIndex.search + 첫 페이지(5개) 상품코드 (views.search 의 Paginator 와 같음)
+- 질의 종류별 latency p50/p95, 인덱스 생성 시간
+- 결과 일치: 인덱스 결과 집합 == 정규화한 상품명/회사명에 질의가 포함된 상품 (MySQL icontains 처럼 영문 대소문자 무시)
+
+실행 명령어
+python -m products.bench_search --products 100000
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+
+import numpy as np
+
+from products.search_index import ProductSearchIndex, normalize_search_text
+
+
+COMPANIES = [
+    "우리은행",
+    "국민은행",
+    "신한은행",
+    "하나은행",
+    "농협은행주식회사",
+    "중소기업은행",
+    "한국산업은행",
+    "부산은행",
+    "대구은행",
+    "광주은행",
+    "제주은행",
+    "전북은행",
+    "경남은행",
+    "케이뱅크",
+    "카카오뱅크",
+    "토스뱅크",
+    "SBI저축은행",
+    "OK저축은행",
+    "웰컴저축은행",
+    "페퍼저축은행",
+]
+PREFIXES = ["WON", "KB Star", "쏠편한", "하나의", "NH올원", "IBK", "BNK", "DGB", "e-", "스마트", "비대면", "첫"]
+WORDS = ["정기예금", "자유적금", "정기적금", "전세자금대출", "청년", "주택", "플러스", "행복", "드림", "든든"]
+SUFFIXES = ["", " 1호", " 2호", "(비대면)", " 특판", " 플러스", " 프리미엄"]
+QUERIES = {
+    "회사명": ["우리은행", "카카오 뱅크", "SBI저축은행", "농협"],
+    "상품명": ["정기예금", "전세자금", "kb star", "쏠편한 정기"],
+    "2글자": ["청년", "적금", "드림", "특판"],
+    "1글자": ["첫", "행"],
+    "없음": ["비트코인", "주식형펀드"],
+}
+
+
+def make_products(n: int, seed: int = 0) -> list[tuple[str, str, str]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        words = rng.sample(WORDS, rng.randint(1, 2))
+        name = f"{rng.choice(PREFIXES)} {' '.join(words)}{rng.choice(SUFFIXES)}"
+        rows.append((f"P{i:07d}", name, rng.choice(COMPANIES)))
+    return rows
+
+
+def sqlite_search(conn: sqlite3.Connection, query: str) -> list[str]:
+    pattern = f"%{query.replace(' ', '')}%"
+    sql = (
+        "SELECT fin_prdt_cd FROM fin_products "
+        "WHERE REPLACE(fin_prdt_nm, ' ', '') LIKE ? OR REPLACE(kor_co_nm, ' ', '') LIKE ? ORDER BY fin_prdt_cd"
+    )
+    return [code for (code,) in conn.execute(sql, (pattern, pattern))]
+
+
+def brute_force(rows: list[tuple[str, str, str]], query: str) -> set[str]:
+    query = normalize_search_text(query)
+    return {
+        code
+        for code, name, company in rows
+        if query in normalize_search_text(name) or query in normalize_search_text(company)
+    }
+
+
+def measure(func, queries: list[str], repeat: int) -> tuple[float, float]:
+    """
+    return (float, float) : latency p50, p95 (ms)
+    """
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            func(query)
+            latencies.append(time.perf_counter() - start)
+    return float(np.percentile(latencies, 50) * 1000), float(np.percentile(latencies, 95) * 1000)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="product search: REPLACE + LIKE scan vs n-gram inverted index")
+    parser.add_argument("--products", "-n", type=int, default=100_000)
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="index search repeats per query")
+    args = parser.parse_args()
+
+    rows = make_products(args.products)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE fin_products (fin_prdt_cd TEXT PRIMARY KEY, fin_prdt_nm TEXT, kor_co_nm TEXT)")
+    conn.executemany("INSERT INTO fin_products VALUES (?, ?, ?)", rows)
+
+    start = time.perf_counter()
+    index = ProductSearchIndex(sorted(rows))
+    build_sec = time.perf_counter() - start
+    stats = index.stats()
+
+    print("-" * 90)
+    print(f"상품 {args.products:,}개, 인덱스 생성 {build_sec:.2f}초", end=" ")
+    print(f"(n-gram {stats['grams']:,}개, posting {stats['postings']:,})")
+    print(
+        f"{'질의':<8} {'결과 수(평균)':>12} {'scan p50(ms)':>13} {'scan p95(ms)':>13} "
+        f"{'index p50(ms)':>14} {'index p95(ms)':>14} {'결과 일치':>8}"
+    )
+    for kind, queries in QUERIES.items():
+        same = all(brute_force(rows, q) == set(index.search(q)[:]) for q in queries)
+        results = np.mean([len(index.search(q)) for q in queries])
+        scan = measure(lambda q: sqlite_search(conn, q), queries, 1)
+        indexed = measure(lambda q: index.search(q)[:5], queries, args.repeat)
+        print(
+            f"{kind:<8} {results:>12.0f} {scan[0]:>13.2f} {scan[1]:>13.2f} "
+            f"{indexed[0]:>14.3f} {indexed[1]:>14.3f} {'O' if same else 'X':>8}"
+        )
+    print("-" * 90)
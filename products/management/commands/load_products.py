@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from findata.save_to_db_final import conf
+from findata.snapshot import load_products
+from products.models import FinProduct, FixedDepositOption, InstallmentDepositOption, JeonseLoanOption
+
+
+OPTION_MANAGERS = {
+    "fixed_deposit": FixedDepositOption.objects,
+    "installment_deposit": InstallmentDepositOption.objects,
+    "jeonse_loan": JeonseLoanOption.objects,
+}
+
+
+def to_api_fields(row: dict, eng_to_han: dict) -> dict:
+    """
+    한글 key(상품/옵션 dict) -> 금융감독원 API 의 영문 key dict (row 에 있는 필드만)
+    """
+    return {eng_key: row[han_key] for eng_key, han_key in eng_to_han.items() if han_key in row}
+
+
+class Command(BaseCommand):
+    """
+    findata snapshot(findata/data/snapshot) 의 상품/옵션을 ORM bulk upsert 로 저장 (하나의 transaction)
+    - 각 Manager 의 bulk_upsert_from_api 사용 (batch_size 마다 INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE 한 문장)
+    - 상품은 baseList, 옵션은 optionList 와 같은 영문 key dict 로 바꿔서 (base, option) 으로 전달
+    python manage.py load_products --category jeonse_loan --batch_size 500
+    """
+
+    help = "Upsert the findata snapshot into fin_products and the option tables with bulk_upsert_from_api"
+
+    def add_arguments(self, parser):
+        # ["fixed_deposit", "installment_deposit", "jeonse_loan", "all"] 중 하나
+        parser.add_argument("--category", "-c", type=str, default="all")
+        parser.add_argument("--batch_size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        category = options["category"]
+        data = load_products(None if category == "all" else [category])
+        if not data:
+            self.stdout.write("저장할 데이터가 없습니다.")
+            return
+
+        products = []
+        option_rows = {category_en: [] for category_en in OPTION_MANAGERS}
+        for p in data:
+            category_en = conf.category[p["상품카테고리"]]
+            eng_to_han = conf.tags[category_en]
+
+            base = to_api_fields(p, eng_to_han)
+            products.append(
+                {**base, "company_type": p.get("회사유형"), "category": category_en, "description": p.get("상품설명")}
+            )
+            for opt in p.get("옵션", []):
+                option_rows[category_en].append((base, to_api_fields(opt, eng_to_han)))
+
+        batch_size = options["batch_size"]
+        with transaction.atomic():
+            FinProduct.objects.bulk_upsert_from_api(products, batch_size=batch_size)
+            for category_en, rows in option_rows.items():
+                if rows:
+                    OPTION_MANAGERS[category_en].bulk_upsert_from_api(rows, batch_size=batch_size)
+
+        options_total = sum(len(rows) for rows in option_rows.values())
+        self.stdout.write(f"상품 {len(products)}건, 옵션 {options_total}건을 저장했습니다.")
@@ -1,5 +1,23 @@
 from django.db import models
 
+from finbot.db import bulk_upsert
+from products.search_index import invalidate_product_search_index
+
+
+# 옵션 테이블 중복판단 기준 (Meta.constraints 의 UniqueConstraint 와 bulk upsert 에서 같이 사용)
+FIXED_DEPOSIT_OPTION_KEY = ("fin_prdt_cd", "intr_rate_type_nm", "save_trm", "dcls_month")
+INSTALLMENT_DEPOSIT_OPTION_KEY = ("fin_prdt_cd", "rsrv_type_nm", "intr_rate_type_nm", "save_trm", "dcls_month")
+JEONSE_LOAN_OPTION_KEY = ("fin_prdt_cd", "rpay_type_nm", "lend_rate_type_nm", "dcls_month")
+
+
+def option_key_value(value):
+    """
+    옵션 중복판단 key 값 정규화
+    - NULL 은 unique 제약에서 서로 다른 값으로 취급되어 upsert 가 매번 INSERT 가 되므로 빈 문자열로 저장
+    - upsert_from_api / bulk_upsert_from_api / findata.save_to_db_final 이 모두 같은 규칙으로 저장
+    """
+    return "" if value is None else value
+
 
 # 1. FinProduct (금융상품 기본 정보)
 # 금융상품 기본정보 테이블에 대한 Upsert 로직 담당
@@ -11,6 +29,9 @@ class FinProductManager(models.Manager):
         - 상품코드(fin_prdt_cd)를 기준으로 DB에서 기존 레코드가 존재하면 UPDATE
         - 존재하지 않으면 INSERT
         - 즉, '중복 저장 방지 + 자동 업데이트' 로직 구현
+
+    기능: bulk_upsert_from_api()
+        - 여러 상품을 bulk_create(update_conflicts=True)로 한 번에 upsert (row마다 SELECT 하지 않음)
     """
 
     def upsert_from_api(self, base: dict, *, description: str | None = None):
@@ -35,8 +56,34 @@ class FinProductManager(models.Manager):
             fin_prdt_cd=fin_prdt_cd,
             defaults=defaults,
         )
+        invalidate_product_search_index()
         return obj, created
 
+    def bulk_upsert_from_api(self, rows: list[dict], batch_size: int = 500) -> list:
+        """
+        baseList 여러 줄을 한 번에 upsert (batch_size 마다 INSERT 한 문장)
+        - rows 의 각 dict 는 upsert_from_api 의 base 와 같은 형식
+        """
+        objs = [
+            self.model(
+                fin_prdt_cd=base["fin_prdt_cd"],
+                kor_co_nm=base.get("kor_co_nm"),
+                fin_co_no=base.get("fin_co_no"),
+                fin_prdt_nm=base.get("fin_prdt_nm"),
+                join_way=base.get("join_way"),
+                company_type=base.get("company_type"),
+                category=base.get("category"),
+                dcls_strt_day=base.get("dcls_strt_day"),
+                dcls_end_day=base.get("dcls_end_day"),
+                dcls_month=base.get("dcls_month"),
+                description=base.get("description"),
+            )
+            for base in rows
+        ]
+        saved = bulk_upsert(self, objs, unique_fields=("fin_prdt_cd",), batch_size=batch_size)
+        invalidate_product_search_index()
+        return saved
+
 
 class FinProduct(models.Model):
     """
@@ -92,10 +139,10 @@ class FixedDepositOptionManager(models.Manager):
         """
 
         lookup = dict(  # Unique 판단 기준 (중복판단기준)
-            fin_prdt_cd=base["fin_prdt_cd"],
-            intr_rate_type_nm=option.get("intr_rate_type_nm"),
-            save_trm=option.get("save_trm"),
-            dcls_month=option.get("dcls_month") or base.get("dcls_month"),
+            fin_prdt_cd_id=base["fin_prdt_cd"],
+            intr_rate_type_nm=option_key_value(option.get("intr_rate_type_nm")),
+            save_trm=option_key_value(option.get("save_trm")),
+            dcls_month=option_key_value(option.get("dcls_month") or base.get("dcls_month")),
         )
 
         # 업데이트될 필드
@@ -117,6 +164,28 @@ class FixedDepositOptionManager(models.Manager):
         )
         return obj, created
 
+    def bulk_upsert_from_api(self, rows: list[tuple[dict, dict]], batch_size: int = 500) -> list:
+        """
+        (base, option) 여러 줄을 FIXED_DEPOSIT_OPTION_KEY 기준으로 한 번에 upsert
+        """
+        objs = [
+            self.model(
+                fin_prdt_cd_id=base["fin_prdt_cd"],
+                intr_rate_type_nm=option_key_value(option.get("intr_rate_type_nm")),
+                save_trm=option_key_value(option.get("save_trm")),
+                dcls_month=option_key_value(option.get("dcls_month") or base.get("dcls_month")),
+                join_member=base.get("join_member"),
+                mtrt_int=base.get("mtrt_int"),
+                spcl_cnd=base.get("spcl_cnd"),
+                join_deny=base.get("join_deny"),
+                max_limit=base.get("max_limit"),
+                intr_rate=option.get("intr_rate"),
+                intr_rate2=option.get("intr_rate2"),
+            )
+            for base, option in rows
+        ]
+        return bulk_upsert(self, objs, unique_fields=FIXED_DEPOSIT_OPTION_KEY, batch_size=batch_size)
+
 
 class FixedDepositOption(models.Model):
     """
@@ -158,7 +227,7 @@ class FixedDepositOption(models.Model):
         # DB 레벨에서 중복 방지 제약조건 설정
         constraints = [
             models.UniqueConstraint(
-                fields=["fin_prdt_cd", "intr_rate_type_nm", "save_trm", "dcls_month"],
+                fields=FIXED_DEPOSIT_OPTION_KEY,
                 name="uq_fixed_deposit_option_key",
             )
         ]
@@ -186,11 +255,11 @@ class InstallmentDepositOptionManager(models.Manager):
         """
 
         lookup = dict(
-            fin_prdt_cd=base["fin_prdt_cd"],
-            rsrv_type_nm=option.get("rsrv_type_nm"),
-            intr_rate_type_nm=option.get("intr_rate_type_nm"),
-            save_trm=option.get("save_trm"),
-            dcls_month=option.get("dcls_month") or base.get("dcls_month"),
+            fin_prdt_cd_id=base["fin_prdt_cd"],
+            rsrv_type_nm=option_key_value(option.get("rsrv_type_nm")),
+            intr_rate_type_nm=option_key_value(option.get("intr_rate_type_nm")),
+            save_trm=option_key_value(option.get("save_trm")),
+            dcls_month=option_key_value(option.get("dcls_month") or base.get("dcls_month")),
         )
 
         defaults = {
@@ -209,6 +278,29 @@ class InstallmentDepositOptionManager(models.Manager):
         )
         return obj, created
 
+    def bulk_upsert_from_api(self, rows: list[tuple[dict, dict]], batch_size: int = 500) -> list:
+        """
+        (base, option) 여러 줄을 INSTALLMENT_DEPOSIT_OPTION_KEY 기준으로 한 번에 upsert
+        """
+        objs = [
+            self.model(
+                fin_prdt_cd_id=base["fin_prdt_cd"],
+                rsrv_type_nm=option_key_value(option.get("rsrv_type_nm")),
+                intr_rate_type_nm=option_key_value(option.get("intr_rate_type_nm")),
+                save_trm=option_key_value(option.get("save_trm")),
+                dcls_month=option_key_value(option.get("dcls_month") or base.get("dcls_month")),
+                join_member=base.get("join_member"),
+                mtrt_int=base.get("mtrt_int"),
+                spcl_cnd=base.get("spcl_cnd"),
+                join_deny=base.get("join_deny"),
+                max_limit=base.get("max_limit"),
+                intr_rate=option.get("intr_rate"),
+                intr_rate2=option.get("intr_rate2"),
+            )
+            for base, option in rows
+        ]
+        return bulk_upsert(self, objs, unique_fields=INSTALLMENT_DEPOSIT_OPTION_KEY, batch_size=batch_size)
+
 
 class InstallmentDepositOption(models.Model):
     """
@@ -247,13 +339,7 @@ class InstallmentDepositOption(models.Model):
         db_table = "installment_deposit_option"
         constraints = [
             models.UniqueConstraint(
-                fields=[
-                    "fin_prdt_cd",
-                    "rsrv_type_nm",
-                    "intr_rate_type_nm",
-                    "save_trm",
-                    "dcls_month",
-                ],
+                fields=INSTALLMENT_DEPOSIT_OPTION_KEY,
                 name="uq_installment_deposit_option_key",
             )
         ]
@@ -276,10 +362,10 @@ class JeonseLoanOptionManager(models.Manager):
 
     def upsert_from_api(self, base: dict, option: dict):
         lookup = dict(
-            fin_prdt_cd=base["fin_prdt_cd"],
-            rpay_type_nm=option.get("rpay_type_nm"),
-            lend_rate_type_nm=option.get("lend_rate_type_nm"),
-            dcls_month=option.get("dcls_month") or base.get("dcls_month"),
+            fin_prdt_cd_id=base["fin_prdt_cd"],
+            rpay_type_nm=option_key_value(option.get("rpay_type_nm")),
+            lend_rate_type_nm=option_key_value(option.get("lend_rate_type_nm")),
+            dcls_month=option_key_value(option.get("dcls_month") or base.get("dcls_month")),
         )
 
         defaults = {
@@ -300,6 +386,28 @@ class JeonseLoanOptionManager(models.Manager):
         )
         return obj, created
 
+    def bulk_upsert_from_api(self, rows: list[tuple[dict, dict]], batch_size: int = 500) -> list:
+        """
+        (base, option) 여러 줄을 JEONSE_LOAN_OPTION_KEY 기준으로 한 번에 upsert
+        """
+        objs = [
+            self.model(
+                fin_prdt_cd_id=base["fin_prdt_cd"],
+                rpay_type_nm=option_key_value(option.get("rpay_type_nm")),
+                lend_rate_type_nm=option_key_value(option.get("lend_rate_type_nm")),
+                dcls_month=option_key_value(option.get("dcls_month") or base.get("dcls_month")),
+                loan_inci_expn=base.get("loan_inci_expn"),
+                erly_rpay_fee=base.get("erly_rpay_fee"),
+                dly_rate=base.get("dly_rate"),
+                loan_lmt=base.get("loan_lmt"),
+                lend_rate_min=option.get("lend_rate_min"),
+                lend_rate_max=option.get("lend_rate_max"),
+                lend_rate_avg=option.get("lend_rate_avg"),
+            )
+            for base, option in rows
+        ]
+        return bulk_upsert(self, objs, unique_fields=JEONSE_LOAN_OPTION_KEY, batch_size=batch_size)
+
 
 class JeonseLoanOption(models.Model):
     """
@@ -340,12 +448,7 @@ class JeonseLoanOption(models.Model):
         db_table = "jeonse_loan_option"  # ← 여기 때문에 실제 테이블 이름이 이걸로 고정
         constraints = [
             models.UniqueConstraint(
-                fields=[
-                    "fin_prdt_cd",
-                    "rpay_type_nm",
-                    "lend_rate_type_nm",
-                    "dcls_month",
-                ],
+                fields=JEONSE_LOAN_OPTION_KEY,
                 name="uq_jeonse_loan_option_key",
             )
         ]
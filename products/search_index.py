@@ -0,0 +1,236 @@
+"""
+금융상품 검색 인덱스 (products/views.py::search)
+
+상품명/회사명을 공백 제거 + 소문자로 정규화한 뒤 n-gram(1글자, 2글자) inverted index 를 프로세스 메모리에 만들어 둠
+- 검색: 질의의 2-gram posting 교집합만 부분 문자열 확인 (DB 전체 scan + row 별 REPLACE 대신)
+- 한글 상품명/회사명은 2글자 질의("우리", "적금")가 많아서 trigram 대신 1/2-gram 사용 (MySQL ngram parser 기본값과 같음)
+- 순위: 상품명 시작 > 상품명 포함 > 회사명 시작 > 회사명 포함, 같은 순위는 상품코드 순 (기존 검색 결과 순서)
+- 상품 데이터는 findata 적재 스크립트(별도 프로세스)가 갱신하므로
+  PRODUCT_SEARCH_INDEX_TTL 초가 지나면 다음 검색 때 백그라운드에서 다시 만들고, 그동안은 이전 인덱스로 검색
+"""
+
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+
+PRODUCT_SEARCH_INDEX_TTL = float(os.getenv("PRODUCT_SEARCH_INDEX_TTL", "600"))  # 초
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_text(text: str | None) -> str:
+    """
+    공백을 모두 제거하고 소문자로 (기존 Replace(" ", "") + icontains 와 같은 비교)
+    """
+    return WHITESPACE.sub("", text or "").casefold()
+
+
+def ngrams(text: str) -> set[str]:
+    """
+    1글자, 2글자 n-gram
+    """
+    return set(text) | {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+class SearchResults:
+    """
+    순위순 상품 번호 배열 (Paginator 에 그대로 넘기면 현재 페이지의 상품코드만 만듦)
+    """
+
+    def __init__(self, ids: np.ndarray, codes: list[str]):
+        self.ids = ids
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.codes[i] for i in self.ids[key].tolist()]
+        return self.codes[self.ids[key]]
+
+
+class ProductSearchIndex:
+    """
+    상품 n-gram inverted index (읽기 전용, 갱신은 새로 만들어서 교체)
+    - 상품명: n-gram -> 상품 번호 posting (+ 상품명 앞 1/2글자 posting, 순위용)
+    - 회사명: 종류가 적어서(은행/저축은행 수백 개) 회사명 -> 상품 번호로 두고 회사명마다 직접 비교
+    """
+
+    def __init__(self, rows: list[tuple[str, str | None, str | None]]):
+        """
+        parameter (list[tuple]) rows : (fin_prdt_cd, fin_prdt_nm, kor_co_nm), 상품코드 순으로 정렬된 목록
+        """
+        self.codes = [code for code, _, _ in rows]
+        self.names = [normalize_search_text(name) for _, name, _ in rows]
+
+        postings: dict[str, list[int]] = defaultdict(list)
+        prefixes: dict[str, list[int]] = defaultdict(list)
+        companies: dict[str, list[int]] = defaultdict(list)
+        for i, (name, (_, _, company)) in enumerate(zip(self.names, rows, strict=True)):
+            for gram in ngrams(name):
+                postings[gram].append(i)
+            for gram in {name[:1], name[:2]} - {""}:
+                prefixes[gram].append(i)
+            companies[normalize_search_text(company)].append(i)
+        # 상품 번호(= 상품코드 순서) 오름차순 배열
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.prefixes = {gram: np.array(ids, dtype=np.int32) for gram, ids in prefixes.items()}
+        self.companies = {company: np.array(ids, dtype=np.int32) for company, ids in companies.items() if company}
+        self.name_array = np.array(self.names, dtype=np.str_)  # 3글자 이상 질의의 부분 문자열 확인용
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def match_names(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        return (np.ndarray, np.ndarray) : 상품명에 query 가 포함된 상품, 그중 상품명이 query 로 시작하는 상품
+        """
+        if len(query) <= 2:  # posting 이 곧 결과
+            return self.postings.get(query, EMPTY), self.prefixes.get(query, EMPTY)
+
+        lists = [self.postings.get(query[i : i + 2]) for i in range(len(query) - 1)]
+        if any(ids is None for ids in lists):
+            return EMPTY, EMPTY
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        # 2-gram 을 모두 가져도 연속으로 있는지는 문자열로 확인
+        position = np.char.find(self.name_array[candidates], query)
+        return candidates[position >= 0], candidates[position == 0]
+
+    def match_companies(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        return (np.ndarray, np.ndarray) : 회사명이 query 로 시작하는 상품, 회사명 중간에 query 가 있는 상품
+        """
+        prefix, contains = [EMPTY], [EMPTY]
+        for company, ids in self.companies.items():
+            if company.startswith(query):
+                prefix.append(ids)
+            elif query in company:
+                contains.append(ids)
+        return np.sort(np.concatenate(prefix)), np.sort(np.concatenate(contains))
+
+    def search(self, query: str) -> SearchResults:
+        """
+        상품명 또는 회사명에 query 가 포함된 상품 (공백/대소문자 무시, 순위순)
+
+        parameter (str) query : 검색어
+        return SearchResults : len() 으로 전체 개수, slice 로 상품코드 목록
+        """
+        query = normalize_search_text(query)
+        if not query:  # 공백만 입력한 경우 (기존 icontains("") 처럼 전체 상품)
+            return SearchResults(np.arange(len(self.codes), dtype=np.int32), self.codes)
+
+        name_hits, name_prefix = self.match_names(query)
+        company_prefix, company_contains = self.match_companies(query)
+        ranked = np.concatenate(
+            [
+                name_prefix,
+                np.setdiff1d(name_hits, name_prefix, assume_unique=True),
+                np.setdiff1d(company_prefix, name_hits, assume_unique=True),
+                np.setdiff1d(company_contains, name_hits, assume_unique=True),
+            ]
+        )
+        return SearchResults(ranked, self.codes)
+
+    def stats(self) -> dict:
+        return {
+            "products": len(self.codes),
+            "grams": len(self.postings),
+            "postings": sum(len(ids) for ids in self.postings.values()),
+            "companies": len(self.companies),
+        }
+
+
+def build_product_search_index() -> ProductSearchIndex:
+    """
+    DB 의 FinProduct 전체로 인덱스 생성
+    """
+    from products.models import FinProduct
+
+    start = time.perf_counter()
+    rows = list(FinProduct.objects.order_by("fin_prdt_cd").values_list("fin_prdt_cd", "fin_prdt_nm", "kor_co_nm"))
+    index = ProductSearchIndex(rows)
+    print(f"상품 검색 인덱스 생성: {len(index)}개 상품, {time.perf_counter() - start:.2f}초")
+    return index
+
+
+class RefreshingIndex:
+    """
+    처음 사용할 때 인덱스를 만들고, ttl 이 지나면 백그라운드 thread 에서 다시 만들어 교체 (thread-safe)
+    """
+
+    def __init__(self, build=build_product_search_index, ttl: float = PRODUCT_SEARCH_INDEX_TTL):
+        self.build = build
+        self.ttl = ttl
+        self.index: ProductSearchIndex | None = None
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+    def refresh(self) -> None:
+        try:
+            index = self.build()
+            self.index = index
+        except Exception as e:
+            print(f"인덱스 갱신 실패, 이전 인덱스를 사용합니다: {e!r}")
+        finally:
+            self.refreshing = False
+
+    def get(self) -> ProductSearchIndex:
+        index = self.index
+        if index is None:
+            with self.lock:
+                if self.index is None:
+                    self.index = self.build()
+                return self.index
+        if time.monotonic() - index.built_at > self.ttl and not self.refreshing:
+            with self.lock:
+                if not self.refreshing:
+                    self.refreshing = True
+                    threading.Thread(target=self.refresh, daemon=True).start()
+        return index
+
+    def invalidate(self) -> None:
+        """
+        같은 프로세스에서 상품을 저장한 경우 다음 검색 때 새로 만들도록
+        """
+        self.index = None
+
+
+@lru_cache(maxsize=1)
+def get_product_search_index() -> RefreshingIndex:
+    """
+    상품 검색 인덱스 Singleton instance 생성
+
+    parameter () : None
+    return RefreshingIndex : .get() 으로 현재 ProductSearchIndex
+    """
+    print("Singleton 상품 검색 인덱스를 생성합니다....")
+    return RefreshingIndex()
+
+
+def invalidate_product_search_index() -> None:
+    """
+    상품 저장 후 호출 (이 프로세스에서 인덱스를 이미 만든 경우에만 다음 검색 때 새로 생성)
+    """
+    if get_product_search_index.cache_info().currsize:
+        get_product_search_index().invalidate()
+
+
+def search_products(query: str) -> SearchResults:
+    """
+    views 에서 사용: get_product_search_index().get().search(query) 와 같음
+    """
+    return get_product_search_index().get().search(query)
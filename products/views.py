@@ -1,12 +1,11 @@
 import random
 
 from django.core.paginator import Paginator
-from django.db.models import Q, Value
-from django.db.models.functions import Replace
 from django.shortcuts import render
 
 from accounts.models import Bookmark
 from products.models import FinProduct
+from products.search_index import search_products
 
 
 # 추천 상품 로직
@@ -122,23 +121,19 @@ def search(request):
     """
 
     query = request.GET.get("query", "")
-    clean_query = query.replace(" ", "")
     results = []
 
     if query:
-        results = (
-            FinProduct.objects.annotate(
-                product=Replace("fin_prdt_nm", Value(" "), Value("")),
-                company=Replace("kor_co_nm", Value(" "), Value("")),
-            )
-            .filter(Q(product__icontains=clean_query) | Q(company__icontains=clean_query))
-            .order_by("fin_prdt_cd")
-        )
+        # 공백을 무시한 상품명/회사명 부분 일치, 순위순 상품코드 (products/search_index.py 의 n-gram 인덱스)
+        results = search_products(query)
     # 페이지당 상품 수: 5
     # 페이지네이션 그룹 단위: 10
     paginator = Paginator(results, 5)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
+    # 현재 페이지의 상품만 DB 에서 조회 (순위 순서 유지)
+    products = FinProduct.objects.in_bulk(page_obj.object_list)
+    page_obj.object_list = [products[code] for code in page_obj.object_list if code in products]
 
     current_page = page_obj.number
     start_page = ((current_page - 1) // 10) * 10 + 1
@@ -0,0 +1,108 @@
+"""
+계산기 batch 벤치마크 (rag_flow/calculators.py)
+- 예금/적금/전세대출 시나리오 N개를 무작위로 만들어 scalar 함수 반복 vs NumPy batch 함수 시간 비교
+- batch 결과가 scalar 결과와 원 단위까지 같은지 모든 시나리오를 비교 (다르면 개수 출력)
+
+실행 명령어
+python -m rag_flow.bench_calculators --scenarios 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rag_flow.calculators import (
+    calculator_fixed_deposit,
+    calculator_fixed_deposit_batch,
+    calculator_installment_deposit,
+    calculator_installment_deposit_batch,
+    calculator_jeonse_loan,
+    calculator_jeonse_loan_batch,
+)
+
+
+DEPOSIT_FIELDS = ["원금", "세전이자", "세전만기금액", "세금", "세후수령액"]
+LOAN_FIELDS = ["대출액", "월이자", "연간이자"]
+
+
+def make_scenarios(n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {
+        "amounts": rng.integers(1, 1000, n) * 10_000,  # 1만원 ~ 1000만원
+        "months": rng.choice([1, 3, 6, 12, 24, 36], n),
+        "rates": np.round(rng.uniform(0.0, 5.0, n), 2),
+        "max_rates": np.round(rng.uniform(5.0, 8.0, n), 2),
+        "interest_types": rng.choice(["단리", "복리"], n),
+        "rate_types": rng.choice(["고정금리", "변동금리"], n),
+        "loan_amounts": rng.integers(1, 500, n) * 1_000_000,  # 100만원 ~ 5억원
+    }
+
+
+def run_scalar(s: dict[str, np.ndarray]) -> dict[str, list[dict]]:
+    amounts, months, rates = s["amounts"].tolist(), s["months"].tolist(), s["rates"].tolist()
+    interest_types = s["interest_types"].tolist()
+    fixed, installment, loan = [], [], []
+    for amount, month, rate, interest_type in zip(amounts, months, rates, interest_types, strict=True):
+        data = {"납입액": amount, "저축개월": month, "저축금리": rate, "저축금리유형명": interest_type, "우대조건": ""}
+        fixed.append(calculator_fixed_deposit(data))
+        installment.append(calculator_installment_deposit(data))
+    for amount, min_rate, max_rate, rate_type in zip(
+        s["loan_amounts"].tolist(), rates, s["max_rates"].tolist(), s["rate_types"].tolist(), strict=True
+    ):
+        data = {"대출액": amount, "대출금리유형": rate_type, "대출금리최저": min_rate, "대출금리최고": max_rate}
+        loan.append(calculator_jeonse_loan(data, use_max_rate=True))
+    return {"fixed_deposit": fixed, "installment_deposit": installment, "jeonse_loan": loan}
+
+
+def run_batch(s: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {
+        "fixed_deposit": calculator_fixed_deposit_batch(s["amounts"], s["months"], s["rates"], s["interest_types"]),
+        "installment_deposit": calculator_installment_deposit_batch(
+            s["amounts"], s["months"], s["rates"], s["interest_types"]
+        ),
+        "jeonse_loan": calculator_jeonse_loan_batch(
+            s["loan_amounts"], s["rates"], s["max_rates"], s["rate_types"], use_max_rate=True
+        ),
+    }
+
+
+def count_mismatches(scalar: list[dict], batch: np.ndarray, fields: list[str]) -> int:
+    """
+    return int : 한 필드라도 1원 이상 다른 시나리오 수
+    """
+    expected = np.array([[row[field] for field in fields] for row in scalar], dtype=np.int64)
+    actual = np.stack([batch[field] for field in fields], axis=1)
+    return int(np.any(expected != actual, axis=1).sum())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="scalar vs NumPy batch calculator benchmark")
+    parser.add_argument("--scenarios", "-n", type=int, default=100_000)
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="batch repeats (best time)")
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args.scenarios)
+
+    start = time.perf_counter()
+    scalar = run_scalar(scenarios)
+    scalar_sec = time.perf_counter() - start
+
+    batch_secs = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        batch = run_batch(scenarios)
+        batch_secs.append(time.perf_counter() - start)
+    batch_sec = min(batch_secs)
+
+    print("-" * 70)
+    print(f"시나리오 {args.scenarios:,}개 x 3 계산기 (예금, 적금, 전세대출)")
+    print(f"scalar : {scalar_sec * 1000:>10.1f}ms")
+    print(f"batch  : {batch_sec * 1000:>10.1f}ms  ({scalar_sec / batch_sec:.0f}배)")
+    for name, fields in [
+        ("fixed_deposit", DEPOSIT_FIELDS),
+        ("installment_deposit", DEPOSIT_FIELDS),
+        ("jeonse_loan", LOAN_FIELDS),
+    ]:
+        print(f"{name:<20} 불일치 {count_mismatches(scalar[name], batch[name], fields)}건 / {args.scenarios:,}")
+    print("-" * 70)
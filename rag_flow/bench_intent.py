@@ -0,0 +1,113 @@
+"""
+로컬 의도 분류 벤치마크 (rag_flow/intent.py)
+- data/intent_queries.jsonl 의 test split 으로 정확도/커버리지/latency 측정 (centroid 는 train split 으로 학습)
+- rules    : 규칙만 (결정한 질문의 정확도, 결정 비율), 규칙은 train split 으로만 맞췄으므로 test 는 held-out
+- centroid : 모든 질문을 centroid 로 분류했을 때 정확도
+- local    : 규칙 -> centroid(margin >= threshold), threshold 별로 LLM 없이 처리되는 비율과 그 정확도
+- --llm    : 같은 질문을 LLM 분류(llm_classify_query, gpt-4o-mini)로 돌려서 정확도, latency 비교 (OPENAI_API_KEY 필요)
+
+실행 명령어
+python -m rag_flow.bench_intent
+python -m rag_flow.bench_intent --thresholds 0.02 0.05 0.1 --llm
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rag_flow.intent import INTENT_MIN_MARGIN, LABELS, IntentClassifier, load_intent_queries
+
+
+def percentile_ms(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q) * 1000) if values else 0.0
+
+
+def evaluate(classifier: IntentClassifier, rows: list[dict]) -> dict:
+    """
+    return dict : coverage(로컬에서 결정한 비율), accuracy(결정한 것 중 정답 비율), p50/p95 latency
+    """
+    decided, correct, latencies = 0, 0, []
+    for row in rows:
+        start = time.perf_counter()
+        intent = classifier.classify(row["query"], row["task"])
+        latencies.append(time.perf_counter() - start)
+        if intent.label is not None:
+            decided += 1
+            correct += intent.label == row["label"]
+    return {
+        "coverage": decided / len(rows),
+        "accuracy": correct / decided if decided else 0.0,
+        "p50_ms": percentile_ms(latencies, 50),
+        "p95_ms": percentile_ms(latencies, 95),
+    }
+
+
+def print_row(name: str, result: dict) -> None:
+    print(
+        f"{name:<22} {result['coverage'] * 100:>8.1f}% {result['accuracy'] * 100:>8.1f}% "
+        f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="offline accuracy / latency benchmark of the local intent classifier")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.0, 0.02, INTENT_MIN_MARGIN, 0.1, 0.2])
+    parser.add_argument("--rules_only", action="store_true", help="skip the embedding model")
+    parser.add_argument("--llm", action="store_true", help="also classify the test split with the LLM")
+    args = parser.parse_args()
+
+    train, test = load_intent_queries("train"), load_intent_queries("test")
+    print(f"train {len(train)}개, test {len(test)}개")
+
+    encode = encode_batch = None
+    if not args.rules_only:
+        from finbot.singleton.embedding_model import get_embed_model
+
+        model = get_embed_model()
+        model.encode(["warm up"], convert_to_numpy=True)
+
+        def encode_batch(texts: list[str]) -> np.ndarray:
+            return model.encode(texts, convert_to_numpy=True)
+
+        def encode(text: str) -> np.ndarray:
+            return encode_batch([text])[0]
+
+        start = time.perf_counter()
+        IntentClassifier(encode=encode, encode_batch=encode_batch, examples=train).fit()
+        print(f"centroid 학습 : {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    for task in LABELS:
+        rows = [row for row in test if row["task"] == task]
+        print("-" * 70)
+        print(f"task={task} ({len(rows)}개)")
+        print(f"{'classifier':<22} {'coverage':>9} {'accuracy':>9} {'p50(ms)':>9} {'p95(ms)':>9}")
+        print_row("rules", evaluate(IntentClassifier(examples=train), rows))
+        if encode is None:
+            continue
+
+        # 규칙 없이 centroid 만 (threshold 0 -> 모두 결정)
+        centroid = IntentClassifier(encode, encode_batch, min_margin=0.0, examples=train, use_rules=False)
+        print_row("centroid", evaluate(centroid, rows))
+
+        for threshold in args.thresholds:
+            local = IntentClassifier(encode=encode, encode_batch=encode_batch, min_margin=threshold, examples=train)
+            print_row(f"rules+centroid >={threshold:g}", evaluate(local, rows))
+
+        if args.llm:
+            from rag_flow.graph_nodes import llm_classify_query
+
+            correct, latencies = 0, []
+            for row in rows:
+                start = time.perf_counter()
+                intent = llm_classify_query(row["query"])
+                latencies.append(time.perf_counter() - start)
+                correct += getattr(intent, f"{task}_method") == row["label"]
+            llm_result = {
+                "coverage": 1.0,
+                "accuracy": correct / len(rows),
+                "p50_ms": percentile_ms(latencies, 50),
+                "p95_ms": percentile_ms(latencies, 95),
+            }
+            print_row("llm (gpt-4o-mini)", llm_result)
+    print("-" * 70)
@@ -0,0 +1,195 @@
+"""
+LLM 응답 캐시 벤치마크 (finbot/singleton/llm_cache.py)
+- stub OpenAI 서버(고정 latency)로 캐시 대상 node 를 실제 node 함수 그대로 호출
+- fin_word_explain : 자주 묻는 금융 용어를 Zipf 분포로 뽑고 표현을 바꿔서 질문 ("X가 뭐야?" / "X란?" / "X 뜻 알려줘")
+- classify_feedback : 추천 상품 몇 개에 대해 자주 나오는 긍/부정 답변
+- nth_conversation : 재방문 사용자의 지난 질문 목록
+- node 별 hit rate(exact/semantic), hit/miss latency p50/p95, hit 1건 당 절약한 시간, 캐시 off 대비 전체 시간
+- --term_swap : 실제 embedding 모델로 fin_word_explain 의 유사 질문 재사용(LLM_CACHE_SEMANTIC_NODES)을 켜도 되는지 확인
+  같은 표현에 용어만 바꾼 질문 쌍("복리가 뭐야?" / "단리가 뭐야?")이 threshold 를 넘는 비율
+  (다른 용어의 설명을 돌려주는 오답 hit)과 같은 용어를 다른 표현으로 물은 쌍이 넘는 비율(의도한 hit)
+
+실행 명령어
+python -m rag_flow.bench_llm_cache --requests 300 --latency 0.3
+python -m rag_flow.bench_llm_cache --term_swap --thresholds 0.9 0.95 0.97 0.99
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+
+TERMS = [
+    "예금자보호",
+    "복리",
+    "단리",
+    "우대금리",
+    "중도해지이율",
+    "만기해지",
+    "DSR",
+    "LTV",
+    "기준금리",
+    "이자소득세",
+    "비과세종합저축",
+    "전세자금대출",
+    "변동금리",
+    "고정금리",
+    "거치기간",
+    "원리금균등상환",
+    "파킹통장",
+    "CMA",
+    "자유적립식",
+    "정액적립식",
+]
+PHRASES = ["{}가 뭐야?", "{}가 뭐야", "{}란?", "{} 뜻 알려줘", "{}에 대해 설명해줘"]
+PRODUCTS = [
+    {"금융상품명": "WON플러스예금", "금융회사명": "우리은행", "저축금리": 3.1},
+    {"금융상품명": "KB Star 정기예금", "금융회사명": "국민은행", "저축금리": 3.0},
+    {"금융상품명": "NH올원e예금", "금융회사명": "농협은행", "저축금리": 3.2},
+]
+FEEDBACKS = ["응", "네", "네 계산해줘", "좋아요", "아니", "아니요", "다른 상품 보여줘", "계산해줘"]
+HISTORIES = [
+    ["정기예금 추천해줘", "예금자보호가 뭐야?"],
+    ["적금 금리 높은 곳 알려줘", "복리 계산해줘"],
+    ["전세자금대출 추천해줘", "DSR이 뭐야?"],
+]
+
+
+def zipf_choice(rng: random.Random, items: list, s: float = 1.1):
+    weights = [1 / (rank + 1) ** s for rank in range(len(items))]
+    return rng.choices(items, weights=weights)[0]
+
+
+def make_workload(n_requests: int, seed: int = 0) -> list[tuple[str, dict]]:
+    """
+    return list[(node 이름, state)] : node 별로 n_requests 개씩
+    """
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(n_requests):
+        term = zipf_choice(rng, TERMS)
+        workload.append(("fin_word_explain", {"query": rng.choice(PHRASES).format(term)}))
+        product = zipf_choice(rng, PRODUCTS)
+        workload.append(("classify_feedback", {"query": zipf_choice(rng, FEEDBACKS), "product_data": product}))
+        questions = zipf_choice(rng, HISTORIES)
+        history = [{"role": "user", "content": question, "state": "old"} for question in questions]
+        workload.append(("nth_conversation", {"history": history}))
+    rng.shuffle(workload)
+    return workload
+
+
+def run(workload: list[tuple[str, dict]]) -> dict[str, float]:
+    """
+    return dict : node 별 총 실행 시간(초)
+    """
+    from rag_flow import graph_nodes
+
+    elapsed: dict[str, float] = {}
+    for node, state in workload:
+        start = time.perf_counter()
+        getattr(graph_nodes, node)(state)
+        elapsed[node] = elapsed.get(node, 0.0) + time.perf_counter() - start
+    return elapsed
+
+
+def term_swap_rates(encode, thresholds: list[float]) -> dict[float, dict]:
+    """
+    return dict : threshold -> 용어만 바꾼 쌍(false hit), 같은 용어 다른 표현 쌍(true hit) 중 cosine >= threshold 비율
+    """
+    import numpy as np
+
+    vectors = {}
+    for term in TERMS:
+        for phrase in PHRASES:
+            vector = np.asarray(encode(phrase.format(term)), dtype=np.float32)
+            vectors[(term, phrase)] = vector / np.linalg.norm(vector)
+
+    swap = [
+        float(vectors[(a, phrase)] @ vectors[(b, phrase)])
+        for phrase in PHRASES
+        for i, a in enumerate(TERMS)
+        for b in TERMS[i + 1 :]
+    ]
+    same = [
+        float(vectors[(term, p)] @ vectors[(term, q)])
+        for term in TERMS
+        for i, p in enumerate(PHRASES)
+        for q in PHRASES[i + 1 :]
+    ]
+    return {
+        threshold: {
+            "false_hit": float(np.mean(np.array(swap) >= threshold)),
+            "true_hit": float(np.mean(np.array(same) >= threshold)),
+            "max_swap": max(swap),
+        }
+        for threshold in thresholds
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="hit rate / latency benchmark of the LLM response cache")
+    parser.add_argument("--requests", "-n", type=int, default=300, help="requests per node")
+    parser.add_argument("--latency", "-l", type=float, default=0.3, help="stub LLM latency (seconds)")
+    parser.add_argument("--similarity", type=float, default=None, help="override LLM_CACHE_SIMILARITY")
+    parser.add_argument("--term_swap", action="store_true", help="measure false semantic hits on term-swap pairs")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.9, 0.95, 0.97, 0.99])
+    args = parser.parse_args()
+
+    if args.term_swap:
+        from finbot.singleton.embedding_cache import encode_query
+
+        rates = term_swap_rates(encode_query, args.thresholds)
+        print("-" * 70)
+        print(f"용어 {len(TERMS)}개 x 표현 {len(PHRASES)}개")
+        print(f"{'threshold':>9} {'용어 바꾼 쌍 hit':>22} {'같은 용어 쌍 hit':>16} {'용어 바꾼 쌍 최대':>24}")
+        for threshold, rate in rates.items():
+            print(
+                f"{threshold:>9.2f} {rate['false_hit'] * 100:>21.1f}% {rate['true_hit'] * 100:>15.1f}% "
+                f"{rate['max_swap']:>24.3f}"
+            )
+        print("-" * 70)
+        raise SystemExit(0)
+
+    from finbot.stub_openai import start_stub_server
+
+    server = start_stub_server(latency=args.latency)
+    os.environ["OPENAI_BASE_URL"] = server.url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    from finbot.singleton.llm_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    if args.similarity is not None:
+        cache.similarity = args.similarity
+    nodes = set(cache.nodes)
+    workload = make_workload(args.requests)
+
+    # node 의 실행 시간 print 는 숨김
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(workload[:3])  # warm-up (OpenAI client, embedding 모델)
+        cache.nodes = set()
+        off = run(workload)
+        cache.nodes = nodes
+        cache.clear()
+        on = run(workload)
+    stats = cache.stats()
+    server.shutdown()
+
+    print("-" * 100)
+    print(f"node 당 {args.requests}건, stub latency {args.latency * 1000:.0f}ms, similarity >= {cache.similarity}")
+    print(
+        f"{'node':<18} {'hit rate':>8} {'exact':>6} {'semantic':>8} {'hit p50/p95(ms)':>16} "
+        f"{'miss p50/p95(ms)':>17} {'saved p50/p95(ms)':>18} {'off(s)':>7} {'on(s)':>7}"
+    )
+    for node, summary in stats["nodes"].items():
+        print(
+            f"{node:<18} {summary['hit_rate'] * 100:>7.1f}% {summary['exact_hits']:>6} {summary['semantic_hits']:>8} "
+            f"{summary['hit_p50_ms']:>7.2f}/{summary['hit_p95_ms']:<8.2f} "
+            f"{summary['miss_p50_ms']:>8.1f}/{summary['miss_p95_ms']:<8.1f} "
+            f"{summary['saved_p50_ms']:>8.1f}/{summary['saved_p95_ms']:<9.1f} {off[node]:>7.1f} {on[node]:>7.1f}"
+        )
+    print(f"캐시 항목 {stats['size']}개 / 최대 {stats['maxsize']}개, evictions {stats['evictions']}")
+    print("-" * 100)
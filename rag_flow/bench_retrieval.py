@@ -0,0 +1,244 @@
+"""
+rag_search 검색 벤치마크 (rag_flow/retrieval.py)
+- snapshot 상품을 save_vector_db 와 같은 chunk / point id / payload 로 만들어 in-memory Qdrant 의
+  collection 1개(카테고리는 payload category)에 적재 (KoSimCSE 임베딩)
+- data/retrieval_queries.jsonl 의 라벨 질문(은행명, 상품명, "청년"/"비대면" 같은 용어, 풀어 쓴 질문)으로
+  dense / BM25 / hybrid(RRF) 를 비교
+- recall@k : 상위 k개 상품(서로 다른 상품 key) 안에 정답 상품이 하나라도 있는 질문 비율
+- MRR : 첫 정답 상품 순위의 역수 평균, latency : 질문 1건 검색 시간 p50/p95 (query 임베딩 포함)
+- 중복 : 상품으로 묶기 전 방식(query_points 상위 3개 chunk)에서 상위 3개가 서로 다른 상품 몇 개였는지 (평균)
+- --reranker 를 주면 hybrid 결과를 cross-encoder 로 rerank 한 경우도 비교 (모델 다운로드 필요)
+- 조건 질문("12개월", "저축은행", "금리 3% 이상" ...) : 상품 조건 filter 를 검색 전에 적용했을 때와 안 했을 때
+  상위 3개 결과 중 조건을 만족하는 비율, latency (in-memory Qdrant 는 payload index 가 없어 latency 는 참고용)
+
+실행 명령어
+python -m rag_flow.bench_retrieval
+python -m rag_flow.bench_retrieval --topk 30 60 100 --sparse_weights 0.5 1.0 2.0
+python -m rag_flow.bench_retrieval --reranker BAAI/bge-reranker-v2-m3 --rerank_budget_ms 300
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from findata.simple_chunk import chunk
+from findata.snapshot import iter_products
+from findata.vector_db import PRODUCT_KEY_FIELD, QDRANT_COLLECTION, build_points_plan, category_filter, encode_docs
+from rag_flow.query_filters import extract_filters
+from rag_flow.rerank import CrossEncoderReranker
+from rag_flow.retrieval import HybridRetriever
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+retrieval_queries_path = BASE_DIR / "rag_flow" / "data" / "retrieval_queries.jsonl"
+
+EMBED_MODEL_NAME = "BM-K/KoSimCSE-roberta-multitask"
+KS = (1, 3, 5, 10)
+CONSTRAINT_QUERIES = [
+    ("12개월 저축은행 정기예금 추천해줘", "fixed_deposit"),
+    ("금리 3% 이상 정기예금 있어?", "fixed_deposit"),
+    ("시중은행 6개월 예금 추천", "fixed_deposit"),
+    ("누구나 가입할 수 있는 1년 예금", "fixed_deposit"),
+    ("기본 금리 2.5% 넘는 3년 예금", "fixed_deposit"),
+    ("금리 4% 이상 적금 추천해줘", "installment_deposit"),
+    ("24개월 적금 중에 저축은행 상품", "installment_deposit"),
+    ("서민 전용 적금 알려줘", "installment_deposit"),
+    ("1금융권 12개월 적금 추천", "installment_deposit"),
+    ("금리 4% 이하 전세대출 추천", "jeonse_loan"),
+    ("저축은행 전세자금대출 있어?", "jeonse_loan"),
+]
+
+
+def load_retrieval_queries(path: Path = retrieval_queries_path) -> list[dict]:
+    """
+    라벨 질문 목록 {"query", "category": recommend_method, "type", "relevant": [상품 key]}
+    - 상품 key 는 findata.vector_db.product_key (같은 금융상품코드를 쓰는 다른 은행 상품을 구분)
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_collection(client: QdrantClient, model, categories: list[str], batch_size: int) -> None:
+    """
+    카테고리 상품을 모두 QDRANT_COLLECTION collection 1개에 적재 (in-memory Qdrant)
+    """
+    for category in categories:
+        plan = build_points_plan(chunk(iter_products(category)))
+        start = time.perf_counter()
+        vectors = encode_docs(model, [item["doc"].page_content for item in plan], batch_size=batch_size)
+        print(f"{category}: {len(plan)}개 chunk 임베딩 {time.perf_counter() - start:.1f}초")
+
+        if not client.collection_exists(QDRANT_COLLECTION):
+            client.create_collection(
+                collection_name=QDRANT_COLLECTION,
+                vectors_config=VectorParams(size=vectors.shape[1], distance=Distance.COSINE),
+            )
+        client.upsert(
+            collection_name=QDRANT_COLLECTION,
+            points=[
+                PointStruct(id=item["id"], vector=vector.tolist(), payload=item["payload"])
+                for item, vector in zip(plan, vectors, strict=True)
+            ],
+        )
+
+
+def product_ranking(payloads: list[dict]) -> list[str]:
+    """
+    순위순 payload -> 상품 key 순위 (같은 상품의 chunk 가 있으면 처음 나온 순위만)
+    """
+    return list(dict.fromkeys(payload[PRODUCT_KEY_FIELD] for payload in payloads))
+
+
+def distinct_top_chunks(client: QdrantClient, encode, rows: list[dict], top: int = 3) -> float:
+    """
+    return float : 상품으로 묶기 전 검색(query_points 상위 top 개 chunk)의 서로 다른 상품 수 평균
+    """
+    counts = []
+    for row in rows:
+        points = client.query_points(
+            collection_name=QDRANT_COLLECTION,
+            query=encode(row["query"]),
+            query_filter=category_filter(row["category"]),
+            limit=top,
+        ).points
+        counts.append(len({point.payload[PRODUCT_KEY_FIELD] for point in points}))
+    return float(np.mean(counts))
+
+
+def evaluate(search, rows: list[dict]) -> dict:
+    """
+    parameter (callable) search : (query, category) -> 순위순 상품 payload 목록
+    return dict : recall@k, MRR, latency p50/p95, 질문 type 별 recall@3
+    """
+    hits = {k: 0 for k in KS}
+    reciprocal_ranks, latencies = [], []
+    by_type = defaultdict(list)
+    for row in rows:
+        start = time.perf_counter()
+        payloads = search(row["query"], row["category"])
+        latencies.append(time.perf_counter() - start)
+
+        ranking = product_ranking(payloads)
+        relevant = set(row["relevant"])
+        first = next((rank for rank, key in enumerate(ranking, start=1) if key in relevant), None)
+        for k in KS:
+            hits[k] += first is not None and first <= k
+        reciprocal_ranks.append(1 / first if first else 0.0)
+        by_type[row["type"]].append(first is not None and first <= 3)
+    return {
+        **{f"recall@{k}": hits[k] / len(rows) for k in KS},
+        "mrr": float(np.mean(reciprocal_ranks)),
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "types": {name: float(np.mean(values)) for name, values in by_type.items()},
+    }
+
+
+def evaluate_filters(retriever: HybridRetriever, push_down: bool, top: int = 3) -> dict:
+    """
+    return dict : 상위 top 개 결과 중 질문 조건을 만족하는 비율, latency p50
+    """
+    satisfied, latencies = [], []
+    for query, category in CONSTRAINT_QUERIES:
+        product_filter = extract_filters(query, category)
+        start = time.perf_counter()
+        hits = retriever.search(query, category, top, product_filter=product_filter if push_down else None)
+        latencies.append(time.perf_counter() - start)
+        satisfied.extend(product_filter.matches(hit.payload) for hit in hits)
+    return {"satisfied": float(np.mean(satisfied)), "p50_ms": float(np.percentile(latencies, 50) * 1000)}
+
+
+def payloads_of(retriever: HybridRetriever, limit: int):
+    """
+    return callable : (query, category) -> retriever.search 결과 payload 목록
+    """
+    return lambda query, category: [p.payload for p in retriever.search(query, category, limit)]
+
+
+def print_row(name: str, result: dict, types: list[str]) -> None:
+    recalls = " ".join(f"{result[f'recall@{k}'] * 100:>8.1f}" for k in KS)
+    by_type = " ".join(f"{result['types'][t] * 100:>8.1f}" for t in types)
+    print(f"{name:<26} {recalls} {result['mrr']:>6.3f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {by_type}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="offline recall@k / latency of dense, BM25 and hybrid search")
+    parser.add_argument("--topk", type=int, nargs="+", default=[30, 60], help="candidates per retriever before fusion")
+    parser.add_argument("--rrf_k", type=int, default=60)
+    parser.add_argument("--sparse_weights", type=float, nargs="+", default=[1.0], help="BM25 weight (dense is 1.0)")
+    parser.add_argument("--batch_size", "-b", type=int, default=64)
+    parser.add_argument("--reranker", default="", help="cross-encoder model, e.g. BAAI/bge-reranker-v2-m3")
+    parser.add_argument("--rerank_top", type=int, default=10)
+    parser.add_argument("--rerank_budget_ms", type=float, default=300)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    rows = load_retrieval_queries()
+    types = sorted({row["type"] for row in rows})
+    model = SentenceTransformer(EMBED_MODEL_NAME)
+    client = QdrantClient(":memory:")
+    load_collection(client, model, sorted({row["category"] for row in rows}), args.batch_size)
+
+    def encode(query: str) -> np.ndarray:
+        return model.encode([query], convert_to_numpy=True)[0]
+
+    limit = max(KS)  # 상품 10개 (검색 결과가 이미 서로 다른 상품)
+    results = []
+    dense = HybridRetriever(client, encode, mode="dense")
+    results.append(("dense", evaluate(payloads_of(dense, limit), rows)))
+
+    bm25 = HybridRetriever(client, encode)
+    bm25.bm25()  # index 생성 시간은 latency 에서 제외
+
+    def bm25_search(query: str, category: str) -> list[dict]:
+        return [payload for _, payload in bm25.sparse_search(query, category, limit)]
+
+    results.append(("bm25", evaluate(bm25_search, rows)))
+
+    for topk in args.topk:
+        for sparse_weight in args.sparse_weights:
+            hybrid = HybridRetriever(client, encode, topk=topk, rrf_k=args.rrf_k, sparse_weight=sparse_weight)
+            hybrid.index = bm25.index
+            results.append((f"hybrid top{topk} w{sparse_weight:g}", evaluate(payloads_of(hybrid, limit), rows)))
+
+    if args.reranker:
+        from sentence_transformers import CrossEncoder
+
+        cross_encoder = CrossEncoder(args.reranker, max_length=256, device="cpu")
+
+        def predict(pairs: list[tuple[str, str]]) -> np.ndarray:
+            return cross_encoder.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+
+        reranker = CrossEncoderReranker(predict, max_candidates=args.rerank_top, budget_ms=args.rerank_budget_ms)
+        reranker.warm_up()
+        reranked = HybridRetriever(client, encode, topk=args.topk[0], rrf_k=args.rrf_k, reranker=reranker)
+        reranked.index = bm25.index
+        name = f"hybrid+rerank top{args.rerank_top}"
+        results.append((name, evaluate(payloads_of(reranked, limit), rows)))
+
+    print("-" * 110)
+    counts = ", ".join(f"{t} {sum(row['type'] == t for row in rows)}" for t in types)
+    print(f"라벨 질문 {len(rows)}개 ({counts}), recall@k 는 상위 k개 상품 기준")
+    distinct = distinct_top_chunks(client, encode, rows)
+    print(f"상품으로 묶기 전 dense 상위 3개 chunk 의 서로 다른 상품 수: 평균 {distinct:.2f}개 (묶은 뒤 3개)")
+    header = " ".join(f"{f'R@{k}':>8}" for k in KS)
+    type_header = " ".join(f"{t + '@3':>8}" for t in types)
+    print(f"{'retriever':<26} {header} {'MRR':>6} {'p50(ms)':>8} {'p95(ms)':>8} {type_header}")
+    for name, result in results:
+        print_row(name, result, types)
+    print("-" * 110)
+    print(f"조건 질문 {len(CONSTRAINT_QUERIES)}개, 상위 3개 중 조건 만족 비율 (hybrid, topk {args.topk[0]})")
+    for push_down in (False, True):
+        retriever = HybridRetriever(client, encode, topk=args.topk[0])
+        retriever.index = bm25.index
+        result = evaluate_filters(retriever, push_down)
+        name = "filter 적용" if push_down else "filter 없음"
+        print(f"{name:<12} {result['satisfied'] * 100:>6.1f}%  p50 {result['p50_ms']:.2f}ms")
+    print("-" * 110)
@@ -0,0 +1,90 @@
+"""
+답변 streaming 벤치마크 (ChatSession.ask vs ChatSession.stream)
+- stub OpenAI 서버로 첫 token 까지 latency, token 당 latency 를 재현
+- ask    : graph 가 끝나야 답변을 받으므로 사용자가 첫 글자를 보는 시간 = 전체 시간
+- stream : 첫 token 이 node 에서 나오는 즉시 전달 (TTFT, time to first token)
+- normal_chat, fin_word_explain 질문으로 측정 (LLM 응답 캐시는 끔)
+
+실행 명령어
+python -m rag_flow.bench_stream --turns 10 --latency 0.5 --tokens 150 --token_latency 0.02
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+import uuid
+
+
+QUERIES = {
+    "normal_chat": ["오늘 날씨 어때?", "심심한데 얘기 좀 하자", "점심 뭐 먹지?"],
+    "fin_word_explain": ["예금자보호가 뭐야?", "복리랑 단리 차이가 뭐야?", "DSR 뜻 알려줘"],
+}
+
+
+def run_turns(queries: list[str], n_turns: int, streaming: bool) -> tuple[list[float], list[float]]:
+    """
+    return (list[float], list[float]) : turn 별 (첫 token 까지 시간, 전체 시간) 초
+    """
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from rag_flow import graph_flow
+
+    graph_flow.app_graph = graph_flow.graph.compile(checkpointer=MemorySaver())
+    first_tokens, totals = [], []
+    for turn in range(n_turns):
+        thread = {"configurable": {"thread_id": uuid.uuid4().hex}}
+        chat = graph_flow.ChatSession("예전 대화")
+        query = queries[turn % len(queries)]
+        chat.state["history"].append({"role": "user", "content": query, "state": "new"})
+        start = time.perf_counter()
+        if streaming:
+            first = None
+            for kind, _ in chat.stream(query, thread):
+                if kind == "token" and first is None:
+                    first = time.perf_counter() - start
+        else:
+            chat.ask(query, thread)
+        total = time.perf_counter() - start
+        first_tokens.append(first if streaming and first is not None else total)
+        totals.append(total)
+    return first_tokens, totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="time-to-first-token benchmark of streamed chat answers")
+    parser.add_argument("--turns", "-t", type=int, default=10)
+    parser.add_argument("--latency", "-l", type=float, default=0.5, help="stub latency until the first token")
+    parser.add_argument("--tokens", type=int, default=150, help="tokens per stub answer")
+    parser.add_argument("--token_latency", type=float, default=0.02, help="stub seconds per token")
+    args = parser.parse_args()
+
+    from finbot.stub_openai import start_stub_server
+
+    server = start_stub_server(latency=args.latency, tokens=args.tokens, token_latency=args.token_latency)
+    os.environ["OPENAI_BASE_URL"] = server.url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["LLM_CACHE_NODES"] = ""  # 같은 질문을 반복하므로 캐시 없이 측정
+    os.environ.setdefault("INTENT_CLASSIFIER", "rules")  # 분류 LLM 호출 없이 node 로 바로
+
+    results = {}
+    for node, queries in QUERIES.items():
+        for streaming in (False, True):
+            # node 의 실행 시간 print 는 숨김
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_turns(queries, 1, streaming)  # warm-up (graph compile, OpenAI client)
+                results[(node, streaming)] = run_turns(queries, args.turns, streaming)
+    server.shutdown()
+
+    print("-" * 80)
+    print(f"stub: 첫 token {args.latency * 1000:.0f}ms, {args.tokens} token x {args.token_latency * 1000:.0f}ms")
+    print(f"{'node':<18} {'mode':<7} {'TTFT p50(ms)':>13} {'TTFT p95(ms)':>13} {'전체 p50(ms)':>13}")
+    for (node, streaming), (first_tokens, totals) in results.items():
+        p95 = statistics.quantiles(first_tokens, n=20)[-1] * 1000 if len(first_tokens) > 1 else first_tokens[0] * 1000
+        print(
+            f"{node:<18} {'stream' if streaming else 'ask':<7} {statistics.median(first_tokens) * 1000:>13.1f} "
+            f"{p95:>13.1f} {statistics.median(totals) * 1000:>13.1f}"
+        )
+    print("-" * 80)
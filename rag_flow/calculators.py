@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def calculator_fixed_deposit(data: dict, use_favor: bool = False):
     """
     정기예금(거치식) 계산 함수
@@ -190,3 +193,144 @@ def calculator_jeonse_loan(data: dict, use_max_rate: bool = False):
         "월이자": int(monthly_interest),
         "연간이자": int(monthly_interest * 12),
     }
+
+
+# ---------------------------
+# batch 계산 (NumPy)
+# ---------------------------
+# 여러 시나리오(상품 x 기간 x 납입액)를 한 번에 계산. 결과는 위 함수와 원 단위까지 같음 (int() 처럼 소수점 버림)
+TAX_RATE = 0.154
+
+DEPOSIT_RESULT_DTYPE = np.dtype(
+    [
+        ("원금", np.int64),
+        ("세전이자", np.int64),
+        ("세전만기금액", np.int64),
+        ("세금", np.int64),
+        ("세후수령액", np.int64),
+        ("적용금리(%)", np.float64),
+        ("기간(개월)", np.int64),
+    ]
+)
+LOAN_RESULT_DTYPE = np.dtype(
+    [
+        ("적용금리(%)", np.float64),
+        ("대출액", np.int64),
+        ("월이자", np.int64),
+        ("연간이자", np.int64),
+    ]
+)
+
+
+def deposit_result(principal, interest, maturity, annual_rate, months) -> np.ndarray:
+    """
+    세금을 적용해서 예금/적금 batch 결과 structured array 생성
+    """
+    tax = interest * TAX_RATE
+    result = np.empty(principal.shape, dtype=DEPOSIT_RESULT_DTYPE)
+    result["원금"] = np.trunc(principal)
+    result["세전이자"] = np.trunc(interest)
+    result["세전만기금액"] = np.trunc(maturity)
+    result["세금"] = np.trunc(tax)
+    result["세후수령액"] = np.trunc(maturity - tax)
+    result["적용금리(%)"] = annual_rate * 100
+    result["기간(개월)"] = months
+    return result
+
+
+def calculator_fixed_deposit_batch(principals, months, rates, interest_types="단리") -> np.ndarray:
+    """
+    calculator_fixed_deposit 의 batch 버전 (인자는 broadcast 되므로 상품 배열 x 기간 배열 비교도 가능)
+
+    parameter (array_like) principals : 납입액
+    parameter (array_like) months : 저축개월
+    parameter (array_like) rates : 적용할 금리(%) (저축금리 또는 최고우대금리)
+    parameter (array_like) interest_types : "단리" / "복리" (그 외는 단리)
+    return np.ndarray : DEPOSIT_RESULT_DTYPE structured array (원금, 세전이자, 세전만기금액, 세금, 세후수령액, ...)
+    """
+    principal, months, rates, interest_types = np.broadcast_arrays(
+        np.asarray(principals, dtype=np.float64),
+        np.asarray(months, dtype=np.int64),
+        np.asarray(rates, dtype=np.float64),
+        np.asarray(interest_types),
+    )
+    annual_rate = rates / 100
+
+    simple_interest = principal * annual_rate * (months / 12)
+    compound_maturity = principal * ((1 + annual_rate / 12) ** months)
+    compound = interest_types == "복리"
+    maturity = np.where(compound, compound_maturity, principal + simple_interest)
+    interest = np.where(compound, compound_maturity - principal, simple_interest)
+    return deposit_result(principal, interest, maturity, annual_rate, months)
+
+
+def calculator_installment_deposit_batch(monthly_payments, months, rates, interest_types="복리") -> np.ndarray:
+    """
+    calculator_installment_deposit 의 batch 버전
+
+    parameter (array_like) monthly_payments : 월 납입액
+    parameter (array_like) months : 저축개월
+    parameter (array_like) rates : 적용할 금리(%) (저축금리 또는 최고우대금리)
+    parameter (array_like) interest_types : "단리" / "복리" (빈 값은 복리)
+    return np.ndarray : DEPOSIT_RESULT_DTYPE structured array
+    """
+    interest_types = np.asarray(interest_types)
+    if interest_types.dtype == object:  # None 이 섞인 경우 (DB 의 빈 값)
+        interest_types = np.array([t or "" for t in interest_types.ravel()]).reshape(interest_types.shape)
+    monthly, months, rates, interest_types = np.broadcast_arrays(
+        np.asarray(monthly_payments, dtype=np.float64),
+        np.asarray(months, dtype=np.int64),
+        np.asarray(rates, dtype=np.float64),
+        np.where(interest_types == "", "복리", interest_types),
+    )
+    simple = interest_types == "단리"
+    if not np.all(simple | (interest_types == "복리")):
+        raise ValueError("저축금리유형명은 '단리' 또는 '복리'여야 합니다.")
+
+    annual_rate = rates / 100
+    total_principal = monthly * months
+
+    # 단리: 이자 = A * r * (n(n+1)/2) / 12
+    simple_interest = monthly * annual_rate * (months * (months + 1) / 2) / 12
+
+    # 복리: 만기금 = A * { ((1+r/12)^n - 1) / (r/12) } * (1+r/12), 금리가 0이면 원금
+    monthly_rate = annual_rate / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        compound_maturity = monthly * ((1 + monthly_rate) ** months - 1) / monthly_rate * (1 + monthly_rate)
+    compound_maturity = np.where(monthly_rate == 0, total_principal, compound_maturity)
+
+    maturity = np.where(simple, total_principal + simple_interest, compound_maturity)
+    interest = np.where(simple, simple_interest, compound_maturity - total_principal)
+    return deposit_result(total_principal, interest, maturity, annual_rate, months)
+
+
+def calculator_jeonse_loan_batch(
+    loan_amounts, min_rates, max_rates=None, rate_types="고정금리", use_max_rate: bool = False
+) -> np.ndarray:
+    """
+    calculator_jeonse_loan 의 batch 버전
+
+    parameter (array_like) loan_amounts : 대출액
+    parameter (array_like) min_rates : 대출금리최저(%)
+    parameter (array_like) max_rates : 대출금리최고(%) (변동금리 + use_max_rate 일 때 사용)
+    parameter (array_like) rate_types : "고정금리" / "변동금리" (그 외는 고정금리)
+    parameter (bool) use_max_rate : True 면 변동금리 상품은 최고금리 사용
+    return np.ndarray : LOAN_RESULT_DTYPE structured array (적용금리(%), 대출액, 월이자, 연간이자)
+    """
+    loan_amount, min_rates, max_rates, rate_types = np.broadcast_arrays(
+        np.asarray(loan_amounts, dtype=np.float64),
+        np.asarray(min_rates, dtype=np.float64),
+        np.asarray(min_rates if max_rates is None else max_rates, dtype=np.float64),
+        np.asarray(rate_types),
+    )
+    # 고정금리는 최저금리, 변동금리는 use_max_rate 에 따라 최저/최고금리
+    annual_rate = (max_rates if use_max_rate else min_rates) / 100
+    annual_rate = np.where(rate_types == "변동금리", annual_rate, min_rates / 100)
+    monthly_interest = loan_amount * annual_rate / 12
+
+    result = np.empty(loan_amount.shape, dtype=LOAN_RESULT_DTYPE)
+    result["적용금리(%)"] = annual_rate * 100
+    result["대출액"] = np.trunc(loan_amount)
+    result["월이자"] = np.trunc(monthly_interest)
+    result["연간이자"] = np.trunc(monthly_interest * 12)
+    return result
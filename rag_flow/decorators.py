@@ -1,14 +1,12 @@
+import inspect
 import time
 from functools import wraps
 
 
 def timing_decorator(func):
-    """노드 실행 시간 측정 데코레이터"""
+    """노드 실행 시간 측정 데코레이터 (async 노드도 지원)"""
 
-    @wraps(func)
-    def wrapper(state):
-        start_time = time.time()
-        result = func(state)
+    def finish(result, start_time):
         execution_time = time.time() - start_time
 
         # 실행 시간 추가
@@ -18,18 +16,46 @@ def timing_decorator(func):
         print(f"{func.__name__} executed in {execution_time:.3f} seconds")
         return result
 
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(state):
+            start_time = time.time()
+            return finish(await func(state), start_time)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(state):
+        start_time = time.time()
+        return finish(func(state), start_time)
+
     return wrapper
 
 
 def error_handling_decorator(func):
-    """에러 처리 데코레이터"""
+    """에러 처리 데코레이터 (async 노드도 지원)"""
+
+    def failed(e):
+        print(f"Error in {func.__name__}: {e}")
+        return {"error": str(e), "error_node": func.__name__, "status": "failed"}
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(state):
+            try:
+                return await func(state)
+            except Exception as e:
+                return failed(e)
+
+        return async_wrapper
 
     @wraps(func)
     def wrapper(state):
         try:
             return func(state)
         except Exception as e:
-            print(f"Error in {func.__name__}: {e}")
-            return {"error": str(e), "error_node": func.__name__, "status": "failed"}
+            return failed(e)
 
     return wrapper
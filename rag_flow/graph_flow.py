@@ -1,12 +1,22 @@
+from functools import lru_cache
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Command
 
-from finbot.singleton.chat_checkpoint import memory, memory_store
+from finbot.singleton.chat_checkpoint import CHAT_CHECKPOINT_DURABILITY, get_checkpoint
+from finbot.singleton.lazy import LazySingleton
 from rag_flow.graph_nodes import (
     ChatState,
+    aclassify_feedback,
+    aclassify_query,
     add_to_history,
+    afin_word_explain,
     after_calculate,
     agent_method_router,
+    anormal_chat,
+    anth_conversation,
+    arag_search,
     before_calculate,
     calc_fixed_deposit,
     calc_installment_deposit,
@@ -14,9 +24,8 @@ from rag_flow.graph_nodes import (
     calculator_method_router,
     check_findata,
     classify_feedback,
+    classify_query,
     conditional_about_history,
-    conditional_about_query,
-    conditional_about_recommend,
     feedback_or_not_method_router,
     feedback_router,
     fill_calculator_data,
@@ -30,7 +39,6 @@ from rag_flow.graph_nodes import (
     normal_chat,
     nth_conversation,
     rag_search,
-    recommend_method_router,
     user_feedback,
     using_only_user_input_data,
 )
@@ -55,6 +63,30 @@ class ChatSession:
             self.state["history"].append({"role": "user", "content": user_history, "state": "old"})
             self.state["visited"] = True
 
+    def graph_input(self, query: str, need_user_feedback: bool = False):
+        """
+        이번 turn 에 graph 에 넣을 입력 (ask / stream 공통)
+
+        Args:
+            query (str): 사용자의 질문 query
+            need_user_feedback (bool): interrupt 된 graph 를 사용자 답변으로 이어서 실행할지 여부
+        Returns:
+            state (dict) 또는 Command(resume=...)
+        """
+
+        self.state["recommend_mode"] = False
+
+        # history 유무에 따라 분기
+        if not self.state["history"]:
+            self.state["visited"] = False
+            return self.state
+
+        self.state["visited"] = True
+        self.state["query"] = query
+        if need_user_feedback:
+            return Command(resume=query, update=self.state)
+        return self.state
+
     def ask(self, query: str, thread: dict, need_user_feedback: bool = False):
         """
         사용자의 질문을 받고 Langgraph를 거쳐 답변을 생성
@@ -67,40 +99,90 @@ class ChatSession:
             answer (str): Langgraph state의 answer
         """
 
-        self.state["recommend_mode"] = False
+        graph_input = self.graph_input(query, need_user_feedback)
+        self.state = app_graph.invoke(graph_input, thread, durability=CHAT_CHECKPOINT_DURABILITY)
+        return self.state
 
-        # history 유무에 따라 분기
-        if not self.state["history"]:
-            visited = False
-            self.state["visited"] = False
-        else:
-            visited = True
-            self.state["visited"] = True
+    def stream(self, query: str, thread: dict, need_user_feedback: bool = False):
+        """
+        ask 와 같지만 LLM 답변 token 을 생성되는 대로 전달 (chatbot.views.chat_stream 에서 SSE 로 전송)
+
+        Args:
+            query (str): 사용자의 질문 query
+            thread (dict): 영속성을 위한 사용자 정보, 채팅룸 정보
+        Yields:
+            ("token", str): node 가 stream_writer 로 보낸 답변 조각
+            ("done", dict): 마지막 state (ask 의 반환값과 같음, interrupt 되면 "__interrupt__" 포함)
+        """
 
-        if not visited:
-            self.state = app_graph.invoke(self.state, thread)
-        else:
-            if not need_user_feedback:
-                self.state["query"] = query
-                self.state = app_graph.invoke(self.state, thread)
+        graph_input = self.graph_input(query, need_user_feedback)
+        state, interrupts = None, None
+        for mode, chunk in app_graph.stream(
+            graph_input, thread, stream_mode=["custom", "values"], durability=CHAT_CHECKPOINT_DURABILITY
+        ):
+            if mode == "custom":
+                if "token" in chunk:
+                    yield "token", chunk["token"]
+            elif "__interrupt__" in chunk:
+                interrupts = list(chunk["__interrupt__"])
             else:
-                self.state["query"] = query
-                self.state = app_graph.invoke(Command(resume=query, update=self.state), thread)
+                state = chunk
+        if interrupts:
+            state = {**state, "__interrupt__": interrupts}
+        self.state = state
+        yield "done", state
+
+    async def aask(self, query: str, thread: dict, need_user_feedback: bool = False):
+        """
+        ask 의 async 버전 (ASGI view 에서 사용, LLM / Qdrant 호출 중에 event loop 를 막지 않음)
+        """
+
+        graph_input = self.graph_input(query, need_user_feedback)
+        self.state = await app_graph.ainvoke(graph_input, thread, durability=CHAT_CHECKPOINT_DURABILITY)
         return self.state
 
+    async def astream(self, query: str, thread: dict, need_user_feedback: bool = False):
+        """
+        stream 의 async 버전 (ASGI view 의 SSE 응답에서 사용)
+        """
+
+        graph_input = self.graph_input(query, need_user_feedback)
+        state, interrupts = None, None
+        async for mode, chunk in app_graph.astream(
+            graph_input, thread, stream_mode=["custom", "values"], durability=CHAT_CHECKPOINT_DURABILITY
+        ):
+            if mode == "custom":
+                if "token" in chunk:
+                    yield "token", chunk["token"]
+            elif "__interrupt__" in chunk:
+                interrupts = list(chunk["__interrupt__"])
+            else:
+                state = chunk
+        if interrupts:
+            state = {**state, "__interrupt__": interrupts}
+        self.state = state
+        yield "done", state
+
+
+def sync_and_async(func, afunc) -> RunnableLambda:
+    """
+    invoke / stream 에서는 func, ainvoke / astream 에서는 afunc 를 실행하는 node
+    (afunc 가 없는 계산기 node 는 ainvoke 에서 thread pool 로 실행됨)
+    """
+    return RunnableLambda(func, afunc=afunc, name=func.__name__)
+
 
 # Node 정의
 
 graph = StateGraph(ChatState)
 graph.add_node("conditional_about_history", conditional_about_history)
 graph.add_node("first_hello", first_conversation)
-graph.add_node("Nth_hello", nth_conversation)
+graph.add_node("Nth_hello", sync_and_async(nth_conversation, anth_conversation))
 
-graph.add_node("conditional_about_query", conditional_about_query)
-graph.add_node("conditional_about_recommend", conditional_about_recommend)
-graph.add_node("rag_search", rag_search)
+graph.add_node("classify_query", sync_and_async(classify_query, aclassify_query))
+graph.add_node("rag_search", sync_and_async(rag_search, arag_search))
 graph.add_node("human_feedback", human_feedback)
-graph.add_node("classify_feedback", classify_feedback)
+graph.add_node("classify_feedback", sync_and_async(classify_feedback, aclassify_feedback))
 graph.add_node("before_calculate", before_calculate)
 
 graph.add_node("check_findata", check_findata)
@@ -116,8 +198,8 @@ graph.add_node("calc_jeonse_loan", calc_jeonse_loan)
 graph.add_node("after_calculate", after_calculate)
 
 
-graph.add_node("fin_word_explain", fin_word_explain)
-graph.add_node("normal_chat", normal_chat)
+graph.add_node("fin_word_explain", sync_and_async(fin_word_explain, afin_word_explain))
+graph.add_node("normal_chat", sync_and_async(normal_chat, anormal_chat))
 graph.add_node("add_to_history", add_to_history)
 
 # Graph flow 구성
@@ -129,31 +211,21 @@ graph.add_conditional_edges(
     {
         "first_hello": "first_hello",
         "Nth_hello": "Nth_hello",
-        "agent_mode": "conditional_about_query",
+        "agent_mode": "classify_query",
     },
 )
 graph.add_edge("first_hello", "add_to_history")
 graph.add_edge("Nth_hello", "add_to_history")
 graph.add_conditional_edges(
-    "conditional_about_query",
+    "classify_query",
     agent_method_router,
     {
-        "recommend_mode": "conditional_about_recommend",
+        "recommend_mode": "rag_search",
         "calculate_mode": "before_calculate",
         "explain_mode": "fin_word_explain",
         "normal_mode": "normal_chat",
     },
 )
-graph.add_conditional_edges(
-    "conditional_about_recommend",
-    recommend_method_router,
-    {
-        "fixed_deposit": "rag_search",
-        "installment_deposit": "rag_search",
-        "jeonse_loan": "rag_search",
-        "all": "rag_search",
-    },
-)
 graph.add_edge("rag_search", "human_feedback")
 graph.add_edge("human_feedback", "classify_feedback")
 graph.add_conditional_edges(
@@ -161,7 +233,7 @@ graph.add_conditional_edges(
     feedback_router,
     {
         "yes": "before_calculate",
-        "no": "conditional_about_query",
+        "no": "classify_query",
     },
 )
 graph.add_edge("before_calculate", "check_findata")
@@ -208,5 +280,17 @@ graph.add_edge("fin_word_explain", "add_to_history")
 graph.add_edge("normal_chat", "add_to_history")
 graph.add_edge("add_to_history", END)
 
+
+@lru_cache(maxsize=1)
+def get_app_graph():
+    """
+    graph compile (처음 대화할 때 한 번)
+    - compile 할 때 langgraph 가 node 함수가 참조하는 전역 객체를 살펴보므로
+      import 시점에 compile 하면 lazy singleton(ai_client, qdrant_client)이 바로 초기화됨
+    """
+    checkpointer, store = get_checkpoint()
+    return graph.compile(checkpointer=checkpointer, store=store)
+
+
 # 인스턴스 생성
-app_graph = graph.compile(checkpointer=memory, store=memory_store)
+app_graph = LazySingleton(get_app_graph)
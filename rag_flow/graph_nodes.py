@@ -1,17 +1,22 @@
+import asyncio
 import json
 from functools import partial
 from pathlib import Path
 from typing import Annotated, Literal, TypedDict
 
+from langgraph.config import get_stream_writer
 from langgraph.types import interrupt
 from pydantic import BaseModel
 
-from finbot.singleton.ai_client import ai_client
-from finbot.singleton.embedding_model import embed_model
-from finbot.singleton.vectordb import qdrant_client
+from finbot.singleton.ai_client import ai_client, async_ai_client
+from finbot.singleton.llm_cache import acached_llm_response, cached_llm_response
+from finbot.singleton.vectordb import async_qdrant_client
 from findata.config_manager import JsonConfigManager
 from rag_flow.calculators import calculator_fixed_deposit, calculator_installment_deposit, calculator_jeonse_loan
 from rag_flow.decorators import error_handling_decorator, timing_decorator
+from rag_flow.intent import classify_intent
+from rag_flow.query_filters import ProductFilter, extract_filters
+from rag_flow.retrieval import RetrievedProduct, get_retriever
 from rag_flow.utils import number_to_korean_large
 
 
@@ -43,7 +48,8 @@ class ChatState(TypedDict, total=False):
 
     visited: bool
     mode: Literal["first_hello", "Nth_hello", "agent_mode"]
-    agent_method: Literal["rag_search", "calculator", "finword_explain", "normal_chat"]  # query의도에 따라 나뉘는 분기
+    # query의도에 따라 나뉘는 분기
+    agent_method: Literal["recommend_mode", "calculate_mode", "explain_mode", "normal_mode"]
     recommend_method: Literal["fixed_deposit", "installment_deposit", "jeonse_loan", "all"]
     recommend_mode: bool  # recommend 로직에 들어오게 되면 True
     query: str  # user query
@@ -68,6 +74,58 @@ class ChatState(TypedDict, total=False):
     calculated_data: dict  # 계산된 데이터
 
 
+def stream_writer():
+    """
+    graph 의 custom stream writer (ChatSession.stream 으로 실행할 때 token 을 view 로 전달)
+    graph 밖에서 node 를 직접 호출하면(벤치마크 등) 아무것도 하지 않는 writer
+    """
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda chunk: None
+
+
+def stream_chat_completion(messages: list[dict], model: str = "gpt-4o-mini", max_tokens: int = 600) -> str:
+    """
+    OpenAI 답변을 stream=True 로 받으면서 token 이 올 때마다 {"token": ...} 을 custom stream 으로 전달
+
+    Args:
+        messages (list[dict]): LLM 에 보낼 messages
+    Returns:
+        str: 전체 답변 (invoke 로 실행해도 기존과 같은 answer)
+    """
+    write = stream_writer()
+    stream = ai_client.chat.completions.create(model=model, messages=messages, max_tokens=max_tokens, stream=True)
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content
+        if token:
+            parts.append(token)
+            write({"token": token})
+    return "".join(parts)
+
+
+async def astream_chat_completion(messages: list[dict], model: str = "gpt-4o-mini", max_tokens: int = 600) -> str:
+    """
+    stream_chat_completion 의 async 버전 (AsyncOpenAI, ainvoke / astream 경로)
+    """
+    write = stream_writer()
+    stream = await async_ai_client.chat.completions.create(
+        model=model, messages=messages, max_tokens=max_tokens, stream=True
+    )
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content
+        if token:
+            parts.append(token)
+            write({"token": token})
+    return "".join(parts)
+
+
 # 노드 정의
 
 
@@ -140,6 +198,24 @@ def first_conversation(state: ChatState) -> ChatState:
     return {"answer": answer}
 
 
+def nth_conversation_messages(state: ChatState) -> list[dict]:
+    """
+    nth_conversation 의 LLM messages (이전 질문들을 3단어로 요약)
+    """
+    histories = state["history"]
+    questions = [history["content"] for history in histories if history["role"] == "user"]
+
+    messages = [
+        {
+            "role": "system",
+            "content": "너는 주어지는 몇 개의 문장을 '3단어'로 요약해야해.",
+        }
+    ]
+    messages.append({"role": "user", "content": f"다음은 주어진 문장들이야 :\n{questions}"})  # 이전 질문들 모두
+    messages.append({"role": "user", "content": "주어진 문장들을 3단어로 요약해줘."})
+    return messages
+
+
 @timing_decorator
 @error_handling_decorator
 def nth_conversation(state: ChatState) -> ChatState:
@@ -153,87 +229,176 @@ def nth_conversation(state: ChatState) -> ChatState:
         Dict: state에 업데이트 할 answer.
     """
 
-    histories = state["history"]
-    questions = [history["content"] for history in histories if history["role"] == "user"]
+    messages = nth_conversation_messages(state)
+
+    def call() -> str:
+        completion = ai_client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        return completion.choices[0].message.content
+
+    summary = cached_llm_response("nth_conversation", "gpt-4o-mini", messages, call)
+
+    answer = f"안녕하세요. 지난번에는 {summary} 등 에 대해 물어보셨군요! 오늘은 무엇을 도와드릴까요?"
+
+    return {"answer": answer}
+
+
+@timing_decorator
+@error_handling_decorator
+async def anth_conversation(state: ChatState) -> ChatState:
+    """
+    nth_conversation 의 async 버전 (ainvoke / astream)
+    """
+
+    messages = nth_conversation_messages(state)
+
+    async def call() -> str:
+        completion = await async_ai_client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        return completion.choices[0].message.content
+
+    summary = await acached_llm_response("nth_conversation", "gpt-4o-mini", messages, call)
+
+    answer = f"안녕하세요. 지난번에는 {summary} 등 에 대해 물어보셨군요! 오늘은 무엇을 도와드릴까요?"
+
+    return {"answer": answer}
+
+
+class QueryIntent(BaseModel):
+    """
+    classify_query 의 structured output (agent_method, recommend_method 를 한 번의 LLM 호출로 분류)
+    """
+
+    agent_method: Literal["recommend_mode", "calculate_mode", "explain_mode", "normal_mode"]
+    recommend_method: Literal["fixed_deposit", "installment_deposit", "jeonse_loan", "all"]
 
+
+def classify_query_messages(user_query: str) -> list[dict]:
+    """
+    llm_classify_query 의 LLM messages
+    """
+    instructions = (
+        "agent_method\n"
+        "- recommend_mode : 질문의 의미가 금융 상품에 대한 추천을 원할 때\n"
+        "- calculate_mode : 질문의 의미를 생각했을 때, 계산이 필요한 작업이 필요할 때\n"
+        "- explain_mode : 금융 도메인에 대한 지식 이해를 위해 설명이 필요할 때\n"
+        "- normal_mode : 위 세가지 의도가 담기지 않은 모든 경우\n"
+        "recommend_method\n"
+        "- fixed_deposit : 예금 상품에 대한 정보를 원할 때\n"
+        "- installment_deposit : 적금 상품에 대한 정보를 원할 때\n"
+        "- jeonse_loan : 대출 관련 상품에 대한 정보를 원할 때\n"
+        "- all : 위 세가지 의도가 담기지 않은 모든 경우 (추천이 아닌 질문도 'all')"
+    )
     messages = [
         {
             "role": "system",
-            "content": "너는 주어지는 몇 개의 문장을 '3단어'로 요약해야해.",
-        }
+            "content": "너는 질문을 보고 목적을 생각해서 agent_method 와 recommend_method 를 분류 해야해.",
+        },
+        {"role": "user", "content": f"다음은 분류 기준이야:\n{instructions}"},
+        {"role": "user", "content": f"질문: {user_query}"},
     ]
-    messages.append({"role": "user", "content": f"다음은 주어진 문장들이야 :\n{questions}"})  # 이전 질문들 모두
-    messages.append({"role": "user", "content": "주어진 문장들을 3단어로 요약해줘."})
+    return messages
 
-    completion = ai_client.chat.completions.create(model="gpt-4o-mini", messages=messages)
 
-    summary = completion.choices[0].message.content
+def parsed_query_intent(completion) -> QueryIntent:
+    intent = completion.choices[0].message.parsed
+    if intent is None:  # 모델이 답변을 거부한 경우
+        intent = QueryIntent(agent_method="normal_mode", recommend_method="all")
+    return intent
 
-    answer = f"안녕하세요. 지난번에는 {summary} 등 에 대해 물어보셨군요! 오늘은 무엇을 도와드릴까요?"
 
-    return {"answer": answer}
+def llm_classify_query(user_query: str) -> QueryIntent:
+    """
+    LLM 으로 agent_method, recommend_method 를 한 번에 분류 (로컬 의도 분류가 확신하지 못할 때 사용)
+    - structured output 으로 JSON schema 를 강제하므로 라벨 외의 답변은 나오지 않음
+
+    Args:
+        user_query (str): 사용자 질문
+    Returns:
+        QueryIntent: agent_method, recommend_method (추천이 아니면 recommend_method 는 "all")
+    """
+    completion = ai_client.chat.completions.parse(
+        model="gpt-4o-mini",
+        messages=classify_query_messages(user_query),
+        response_format=QueryIntent,
+        max_tokens=50,
+    )
+    return parsed_query_intent(completion)
+
+
+async def allm_classify_query(user_query: str) -> QueryIntent:
+    """
+    llm_classify_query 의 async 버전
+    """
+    completion = await async_ai_client.chat.completions.parse(
+        model="gpt-4o-mini",
+        messages=classify_query_messages(user_query),
+        response_format=QueryIntent,
+        max_tokens=50,
+    )
+    return parsed_query_intent(completion)
+
+
+def classify_query_locally(user_query: str) -> tuple[dict | None, str | None]:
+    """
+    로컬 의도 분류(rag_flow/intent.py)로 classify_query 결과를 결정
+
+    Returns:
+        (dict | None, str | None): (로컬에서 결정한 state update, 없으면 None), 로컬에서 분류한 agent_method
+    """
+    agent_method = classify_intent(user_query, "agent")
+    if agent_method is not None and agent_method != "recommend_mode":
+        return {"agent_method": agent_method}, agent_method
+    if agent_method == "recommend_mode" and (recommend_method := classify_intent(user_query, "recommend")):
+        return {"agent_method": agent_method, "recommend_method": recommend_method}, agent_method
+    return None, agent_method
 
 
 @timing_decorator
 # @error_handling_decorator
-def conditional_about_query(state: ChatState) -> dict:
+def classify_query(state: ChatState) -> dict:
     """
-    query에 따라 분기 발생. user의 의도에 따라 4가지로 분기.
-    1. 금융 상품 추천
+    query에 따라 분기 발생. user의 의도에 따라 4가지로 분기하고, 추천이면 상품 종류도 함께 분류.
+    1. 금융 상품 추천 (예금 / 적금 / 대출 / 그외)
     2. 계산기
     3. 금융 용어 상담
     4. 일반 채팅
 
+    로컬 의도 분류(rag_flow/intent.py)가 확신하면 LLM 을 호출하지 않고,
+    아니면 LLM 한 번으로 두 가지를 같이 분류 (추천 경로에서 LLM 호출 2번 -> 1번)
+
     Args:
         state (TypedDict): Graph의 state
     Returns:
         Dict: state에 업데이트 할 method dict,
-                agent_method = ("recommend", "calculator", "fin_word_explain", "normal_chat")
+                agent_method = ("recommend_mode", "calculate_mode", "explain_mode", "normal_mode")
+                recommend_method = ("fixed_deposit", "installment_deposit", "jeonse_loan", "all")
     """
-    four_branch = (
-        "recommend : 질문의 의미가 금융 상품에 대한 추천을 원하면 'recommend'를 반환"
-        "calculator : 질문의 의미를 생각했을 때, 계산이 필요한 작업이 필요하면 'calculator'를 반환"
-        "fin_word_explain : 금융 도메인에 대한 지식 이해를 위해 설명이 필요할 때, 'fin_word_explain'을 반환"
-        "normal_chat : 위 세가지 의도가 담기지 않은 모든 경우에, 'normal_chat'을 반환"
-    )
     user_query = state["query"]
-    messages = [
-        {
-            "role": "system",
-            "content": "너는 질문을 보고 목적을 생각해서 4가지 중에 하나로 분류 해야해.",
-        },
-        {"role": "user", "content": f"다음은 '4가지 경우야':\n{four_branch}"},
-        {
-            "role": "user",
-            "content": f"질문: {user_query}\n을 보고 4가지 경우 중 하나를 출력해줘. \
-                다른 설명은 필요없고 recommend_mode, calculate_mode, explain_mode, normal_mode\
-                    이 4가지 중에 무조건 하나를 반환해야해. 부연설명 붙이지 말고 마침표도 붙이지 마.",
-        },
-    ]
+    update, agent_method = classify_query_locally(user_query)
+    if update is not None:
+        return update
 
-    completion = ai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        max_tokens=400,
-    )
+    intent = llm_classify_query(user_query)
+    return {
+        # 로컬에서 추천으로 확신한 경우는 상품 종류만 LLM 결과 사용
+        "agent_method": agent_method or intent.agent_method,
+        "recommend_method": intent.recommend_method,
+    }
 
-    answer = completion.choices[0].message.content
 
-    if answer in ["recommend_mode", "calculate_mode", "explain_mode", "normal_mode"]:
-        method = answer
-    elif ("recommend" in answer) or ("rec" in answer) or ("추천" in answer):
-        method = "recommend_mode"
-    elif ("calculate" in answer) or ("calculator" in answer) or ("cal" in answer) or ("계산" in answer):
-        method = "calculate_mode"
-    elif (
-        ("finword" in answer) or ("explain" in answer) or ("fin" in answer) or ("word" in answer) or ("설명" in answer)
-    ):
-        method = "explain_mode"
-    else:
-        method = "normal_mode"
+@timing_decorator
+async def aclassify_query(state: ChatState) -> dict:
+    """
+    classify_query 의 async 버전 (로컬 분류는 embedding 계산이 있어서 thread 에서 실행)
+    """
+    user_query = state["query"]
+    update, agent_method = await asyncio.to_thread(classify_query_locally, user_query)
+    if update is not None:
+        return update
 
+    intent = await allm_classify_query(user_query)
     return {
-        "agent_method": method,
+        "agent_method": agent_method or intent.agent_method,
+        "recommend_method": intent.recommend_method,
     }
 
 
@@ -285,79 +450,50 @@ def db_search(state: ChatState) -> ChatState:
     return {"answer": answer}
 
 
-@timing_decorator
-# @error_handling_decorator
-def conditional_about_recommend(state: ChatState) -> dict:
-    """
-    query에 따라 분기 발생. user의 의도에 따라 4가지로 분기.
-    1. 예금 추천
-    2. 적금 추천
-    3. 대출 추천
-    4. 그외 추천
-
-    Args:
-        state (TypedDict): Graph의 state
-    Returns:
-        Dict: state에 업데이트 할 method dict,
-                agent_method = ("fixed_deposit", "installment_deposit", "jeonse_loan", "all")
-    """
-    four_branch = (
-        "fixed_deposit : 질문의 의미가 예금 상품에 대한 정보를 원하면 'fixed_deposit'를 반환"
-        "installment_deposit : 질문의 의미를 생각했을 때, 적금 상품에 대한 정보를 원하면 'installment_deposit'를 반환"
-        "jeonse_loan : 질문의 의미가 대출 관련 상품에 대한 정보를 원하면, 'jeonse_loan'을 반환"
-        "all : 위 세가지 의도가 담기지 않은 모든 경우에, 'all'을 반환"
-    )
-    user_query = state["query"]
-    messages = [
-        {
-            "role": "system",
-            "content": "너는 질문을 보고 목적을 생각해서 4가지 중에 하나로 분류 해야해.",
-        },
-        {"role": "user", "content": f"다음은 '4가지 경우야':\n{four_branch}"},
-        {
-            "role": "user",
-            "content": f"질문: {user_query}\n을 보고 4가지 경우 중 하나를 출력해줘. \
-                다른 설명은 필요없고 fixed_deposit, installment_deposit, jeonse_loan, all\
-                    이 4가지 중에 무조건 하나를 반환해야해. 부연설명 붙이지 말고 마침표도 붙이지 마.",
-        },
-    ]
+# recommend_method 별 검색 카테고리 (payload category, "all" 은 전체)와 로그 문구
+RAG_CATEGORIES = {
+    "fixed_deposit": "예금 추천",
+    "installment_deposit": "적금 추천",
+    "jeonse_loan": "대출 추천",
+    "all": "any 추천",
+}
 
-    completion = ai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        max_tokens=400,
-    )
 
-    answer = completion.choices[0].message.content
+def rag_category(state: ChatState) -> str:
+    category = state["recommend_method"] if state["recommend_method"] in RAG_CATEGORIES else "all"
+    print("*" * 10, RAG_CATEGORIES[category], "*" * 10)
+    return category
 
-    if answer in ["fixed_deposit", "installment_deposit", "jeonse_loan", "all"]:
-        method = answer
-    elif ("예금" in answer) or ("fix" in answer):
-        method = "fixed_deposit"
-    elif ("적금" in answer) or ("install" in answer):
-        method = "installment_deposit"
-    elif ("대출" in answer) or ("loan" in answer) or ("jeo" in answer):
-        method = "jeonse_loan"
-    else:
-        method = "all"
 
-    return {
-        "recommend_method": method,
-    }
+def query_product_filter(state: ChatState) -> ProductFilter:
+    """
+    질문에서 저축개월/회사유형/금리/가입제한 조건 추출 (rag_search / arag_search 공통)
+    """
+    product_filter = extract_filters(state["query"], state["recommend_method"])
+    if product_filter:
+        print(f"상품 조건 : {product_filter.describe()}")
+    return product_filter
 
 
-def recommend_method_router(
-    state: ChatState,
-) -> Literal["fixed_deposit", "installment_deposit", "jeonse_loan", "all"]:
+def rag_result(hits: list[RetrievedProduct]) -> dict:
     """
-    recommend Method에 따라 라우팅
-
-    Args:
-        state (TypedDict): Graph의 state
-    Returns:
-        Literal: ["fixed_deposit", "installment_deposit", "jeonse_loan", "all"] 중 하나의 값으로 제한
+    rag_search / arag_search 공통: 1위 상품을 추천 상품으로 state 에 저장
     """
-    return state["recommend_method"]
+    for rank, hit in enumerate(hits, start=1):
+        ranks = f"dense {hit.dense_rank}위, BM25 {hit.sparse_rank}위"
+        if hit.rerank_score is not None:
+            ranks += f", rerank {hit.rerank_score:.3f}"
+        print(f"검색 {rank}위 : {hit.payload.get('금융상품명')} ({ranks})")
+    top = hits[0]
+    vector_db_answer = top.payload
+    # 추천받은 상품을 view로 연결
+    product_code = vector_db_answer["금융상품코드"]
+    return {
+        "recommend_mode": True,
+        "need_user_feedback": True,
+        "product_code": product_code,
+        "product_data": vector_db_answer,
+    }
 
 
 @timing_decorator
@@ -374,25 +510,10 @@ def rag_search(state: ChatState) -> ChatState:
 
     topk = 3
     user_query = state["query"]
-    q_vec = embed_model.encode([user_query], convert_to_numpy=True)[0]
-    if state["recommend_method"] == "fixed_deposit":
-        print("*" * 10, "예금 추천", "*" * 10)
-        hits = qdrant_client.query_points(collection_name="finance_products_fixed_deposit", query=q_vec, limit=topk)
-    elif state["recommend_method"] == "installment_deposit":
-        print("*" * 10, "적금 추천", "*" * 10)
-        hits = qdrant_client.query_points(
-            collection_name="finance_products_installment_deposit",
-            query=q_vec,
-            limit=topk,
-        )
-    elif state["recommend_method"] == "jeonse_loan":
-        print("*" * 10, "대출 추천", "*" * 10)
-        hits = qdrant_client.query_points(collection_name="finance_products_jeonse_loan", query=q_vec, limit=topk)
-    else:
-        print("*" * 10, "any 추천", "*" * 10)
-        hits = qdrant_client.query_points(collection_name="finance_products_all", query=q_vec, limit=topk)
-
-    vector_db_answer = hits.points[0].payload
+    # dense + BM25 hybrid 검색 (RAG_RETRIEVER=dense 면 기존 dense 검색만), 질문의 상품 조건은 검색 전에 filter
+    # 결과는 서로 다른 상품 topk 개 (chunk 를 금융상품코드로 묶음)
+    product_filter = query_product_filter(state)
+    hits = get_retriever().search(user_query, rag_category(state), limit=topk, product_filter=product_filter)
 
     # messages = [
     #     {
@@ -419,16 +540,21 @@ def rag_search(state: ChatState) -> ChatState:
     #     # tools=
     # )
     # answer = completion.choices[0].message.content
-    recommend_mode = True
-    # 추천받은 상품을 view로 연결
-    product_code = vector_db_answer["금융상품코드"]
-    return {
-        # "answer": answer,
-        "recommend_mode": recommend_mode,
-        "need_user_feedback": True,
-        "product_code": product_code,
-        "product_data": vector_db_answer,
-    }
+    return rag_result(hits)
+
+
+@timing_decorator
+async def arag_search(state: ChatState) -> ChatState:
+    """
+    rag_search 의 async 버전 (query embedding, BM25 는 thread 에서, dense 검색은 AsyncQdrantClient)
+    """
+
+    topk = 3
+    product_filter = query_product_filter(state)
+    hits = await get_retriever().asearch(
+        state["query"], rag_category(state), topk, async_qdrant_client, product_filter=product_filter
+    )
+    return rag_result(hits)
 
 
 @timing_decorator
@@ -447,20 +573,12 @@ def human_feedback(state: ChatState) -> ChatState:
     return {"query": human_text, "need_user_feedback": False}
 
 
-@timing_decorator
-# @error_handling_decorator
-def classify_feedback(state: ChatState) -> ChatState:
+def classify_feedback_messages(state: ChatState) -> list[dict]:
     """
-    사용자의 중간 feedback에 대한 긍, 부정 판단
-
-    Args:
-        state (TypedDict): Graph의 state
-    Returns:
-        Dict: Graph의 state update
+    classify_feedback 의 LLM messages
     """
     product_data = state["product_data"]
     user_feedback = state["query"]
-    print("classify_feedback input: ", user_feedback)
     messages = [
         {
             "role": "system",
@@ -479,18 +597,13 @@ def classify_feedback(state: ChatState) -> ChatState:
             "content": f"'답': {user_feedback}\n을 보고 계산, 기타 중에 한 단어만 출력해. 마침표도 필요없어.",
         },
     ]
+    return messages
 
-    # completion = ai_client.chat.completions.create(
-    #     model="gpt-4o-mini",
-    #     messages=messages,
-    #     max_tokens=100,
-    # )
-    completion = ai_client.responses.create(
-        model="gpt-5.1",
-        input=messages,
-    )
-    # pos_or_neg = completion.choices[0].message.content
-    pos_or_neg = completion.output_text
+
+def feedback_label(pos_or_neg: str) -> str:
+    """
+    LLM 답변('계산' / '기타' 등)을 feedback_router 의 "yes" / "no" 로 변환
+    """
     pos_word = [
         "yes",
         "sure",
@@ -520,6 +633,54 @@ def classify_feedback(state: ChatState) -> ChatState:
         pos_or_neg = "yes"
     elif any([word in pos_or_neg for word in neg_word]):
         pos_or_neg = "no"
+    return pos_or_neg
+
+
+@timing_decorator
+# @error_handling_decorator
+def classify_feedback(state: ChatState) -> ChatState:
+    """
+    사용자의 중간 feedback에 대한 긍, 부정 판단
+
+    Args:
+        state (TypedDict): Graph의 state
+    Returns:
+        Dict: Graph의 state update
+    """
+    print("classify_feedback input: ", state["query"])
+    messages = classify_feedback_messages(state)
+
+    # completion = ai_client.chat.completions.create(
+    #     model="gpt-4o-mini",
+    #     messages=messages,
+    #     max_tokens=100,
+    # )
+    def call() -> str:
+        completion = ai_client.responses.create(
+            model="gpt-5.1",
+            input=messages,
+        )
+        # return completion.choices[0].message.content
+        return completion.output_text
+
+    pos_or_neg = feedback_label(cached_llm_response("classify_feedback", "gpt-5.1", messages, call))
+    print("classify_feedback output: ", pos_or_neg)
+    return {"pos_or_neg": pos_or_neg}
+
+
+@timing_decorator
+async def aclassify_feedback(state: ChatState) -> ChatState:
+    """
+    classify_feedback 의 async 버전
+    """
+    print("classify_feedback input: ", state["query"])
+    messages = classify_feedback_messages(state)
+
+    async def call() -> str:
+        completion = await async_ai_client.responses.create(model="gpt-5.1", input=messages)
+        return completion.output_text
+
+    pos_or_neg = feedback_label(await acached_llm_response("classify_feedback", "gpt-5.1", messages, call))
     print("classify_feedback output: ", pos_or_neg)
     return {"pos_or_neg": pos_or_neg}
 
@@ -553,20 +714,10 @@ def before_calculate(state: ChatState) -> ChatState:
     return {"need_user_feedback": True}
 
 
-@timing_decorator
-# @error_handling_decorator
-def fin_word_explain(state: ChatState) -> ChatState:
+def fin_word_explain_messages(user_query: str) -> list[dict]:
     """
-    금융 관련 용어에 대한 설명과 상담을 담당하는 Agent
-
-    Args:
-        state (TypedDict): Graph의 state
-    Returns:
-        Dict: Graph의 state update
+    fin_word_explain 의 LLM messages
     """
-
-    user_query = state["query"]
-
     messages = [
         {
             "role": "system",
@@ -580,31 +731,64 @@ def fin_word_explain(state: ChatState) -> ChatState:
             "content": f"질문: {user_query}\n 에 맞는 설명을 해줘.",
         },
     ]
-
-    completion = ai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        max_tokens=600,
-    )
-    answer = completion.choices[0].message.content
-
-    return {"answer": answer}
+    return messages
 
 
 @timing_decorator
 # @error_handling_decorator
-def normal_chat(state: ChatState) -> ChatState:
+def fin_word_explain(state: ChatState) -> ChatState:
     """
-    일반적인 채팅을 담당하는 Normal chat Agent
+    금융 관련 용어에 대한 설명과 상담을 담당하는 Agent
 
     Args:
         state (TypedDict): Graph의 state
     Returns:
-        Dict: Graph의 state
+        Dict: Graph의 state update
+    """
+
+    user_query = state["query"]
+    messages = fin_word_explain_messages(user_query)
+
+    streamed = []
+
+    def call() -> str:
+        streamed.append(True)
+        return stream_chat_completion(messages, max_tokens=600)
+
+    # 같은 용어를 묻는 질문이 많아서 비슷한 질문이면 이전 답변 재사용
+    answer = cached_llm_response("fin_word_explain", "gpt-4o-mini", messages, call, query=user_query)
+    if not streamed:  # 캐시 hit 이면 답변 전체를 한 번에 전달
+        stream_writer()({"token": answer})
+
+    return {"answer": answer}
+
+
+@timing_decorator
+async def afin_word_explain(state: ChatState) -> ChatState:
+    """
+    fin_word_explain 의 async 버전
     """
 
     user_query = state["query"]
+    messages = fin_word_explain_messages(user_query)
+
+    streamed = []
+
+    async def call() -> str:
+        streamed.append(True)
+        return await astream_chat_completion(messages, max_tokens=600)
+
+    answer = await acached_llm_response("fin_word_explain", "gpt-4o-mini", messages, call, query=user_query)
+    if not streamed:
+        stream_writer()({"token": answer})
+
+    return {"answer": answer}
+
 
+def normal_chat_messages(user_query: str) -> list[dict]:
+    """
+    normal_chat 의 LLM messages
+    """
     messages = [
         {
             "role": "system",
@@ -618,13 +802,33 @@ def normal_chat(state: ChatState) -> ChatState:
             "content": f"질문: {user_query}\n에 답해줘.",
         },
     ]
+    return messages
 
-    completion = ai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        max_tokens=600,
-    )
-    answer = completion.choices[0].message.content
+
+@timing_decorator
+# @error_handling_decorator
+def normal_chat(state: ChatState) -> ChatState:
+    """
+    일반적인 채팅을 담당하는 Normal chat Agent
+
+    Args:
+        state (TypedDict): Graph의 state
+    Returns:
+        Dict: Graph의 state
+    """
+
+    answer = stream_chat_completion(normal_chat_messages(state["query"]), max_tokens=600)
+
+    return {"answer": answer}
+
+
+@timing_decorator
+async def anormal_chat(state: ChatState) -> ChatState:
+    """
+    normal_chat 의 async 버전
+    """
+
+    answer = await astream_chat_completion(normal_chat_messages(state["query"]), max_tokens=600)
 
     return {"answer": answer}
 
@@ -0,0 +1,275 @@
+"""
+LLM 호출 전에 로컬에서 의도 분류 (graph_nodes.classify_query 의 fast path)
+1. 규칙: 키워드/정규식이 한 의도를 분명히 가리키면 바로 결정 (train split 질문으로만 맞춘 규칙)
+2. nearest-centroid: 라벨이 붙은 예시 질문(data/intent_queries.jsonl, split=train)의 KoSimCSE 임베딩 평균과 cosine 비교
+   1등과 2등의 유사도 차이(margin)가 INTENT_MIN_MARGIN 이상일 때만 결정
+3. 둘 다 확신이 없으면 None -> node 에서 기존 LLM 분류 사용
+
+INTENT_CLASSIFIER=rules 면 규칙만, off 면 항상 LLM
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+intent_queries_path = BASE_DIR / "rag_flow" / "data" / "intent_queries.jsonl"
+
+# "on": 규칙 + centroid / "rules": 규칙만 / "off": 항상 LLM
+INTENT_CLASSIFIER = os.getenv("INTENT_CLASSIFIER", "on")
+INTENT_MIN_MARGIN = float(os.getenv("INTENT_MIN_MARGIN", "0.05"))
+
+AGENT_METHODS = ("recommend_mode", "calculate_mode", "explain_mode", "normal_mode")
+RECOMMEND_METHODS = ("fixed_deposit", "installment_deposit", "jeonse_loan", "all")
+LABELS = {"agent": AGENT_METHODS, "recommend": RECOMMEND_METHODS}
+
+FIN_TERMS = re.compile(
+    r"예금|적금|금리|이자|대출|전세|복리|단리|상환|보증|세금|저축|예치|수수료|우대|적립|통장|신용|만기|"
+    r"DSR|LTV|소득세|금융|은행",
+    re.IGNORECASE,
+)
+PRODUCT_TERMS = re.compile(r"예금|적금|대출|상품|은행|저축|예치|통장")
+
+# 계산 요청으로 볼 수 있는 근거: 계산 용어, 또는 금액/기간 ("금리가 얼마야", "한도 얼마야" 는 계산이 아님)
+CALCULATE_TERMS = re.compile(r"계산|수령액|상환액|실수령|세후")
+AMOUNT_OR_PERIOD = re.compile(r"\d+\s*(만\s*원|만원|만|억|천|원|개월|년|달)")
+# 추천 동사가 있으면 금액/이자/세후 가 같이 나와도 추천 ("1000만원 예치할 예금 중 이자 많이 받는 상품 추천해줘")
+RECOMMEND_VERBS = re.compile(r"추천|골라|찾아")
+
+# agent task 규칙 (위에서부터 우선)
+# 규칙은 train split 으로만 맞춤 (test split 은 bench_intent 의 held-out 평가용)
+AGENT_RULES = [
+    (
+        "calculate_mode",
+        re.compile(
+            r"계산|수령액|상환액|실수령|세후|"
+            r"얼마\s*(야|예요|에요|가|나|받|돼|모여|내|붙|\?|$)|얼마나\s*(붙|나와|모여|나올)|"
+            r"\d+\s*(만\s*원|만원|억|천).*(이자|얼마|받)"
+        ),
+    ),
+    (
+        "explain_mode",
+        re.compile(
+            r"(이|가)?\s*뭐(야|예요|에요|지|임|니)\s*\??$|뭔지|무슨\s*뜻|뜻\s*(이|알려|좀)|이?란\s*\??$|개념|"
+            r"설명해|차이|어떻게\s*돼|어떤\s*영향|몇\s*퍼센트"
+        ),
+    ),
+    (
+        "recommend_mode",
+        re.compile(r"추천|골라|찾아|알려\s*줘|알아봐|뭐\s*있|있어\s*\?|있을까|있나요|어디가\s*좋"),
+    ),
+]
+CHITCHAT = re.compile(
+    r"^(안녕|반가|고마|감사|잘\s*자|ㅋ|ㅎ|또\s*올게|좋은\s*하루)|날씨|심심|배고|점심|음악|농담|기분|"
+    r"너(는|의)?\s*(누구|이름)|주말|퇴근"
+)
+
+# recommend task 규칙
+FIXED_DEPOSIT = re.compile(r"예금|예치|거치|목돈")
+INSTALLMENT_DEPOSIT = re.compile(r"적금|적립|매달|매월|월\s*\d+\s*만")
+JEONSE_LOAN = re.compile(r"전세|대출|보증금")
+
+
+@dataclass
+class Intent:
+    label: str | None  # None 이면 확신 없음 (LLM 으로)
+    source: str  # "rule", "centroid", "none"
+    confidence: float = 0.0  # rule: 1.0, centroid: margin
+
+
+def agent_rule(query: str) -> str | None:
+    """
+    agent_method 규칙 (금융 용어가 없으면 설명/추천으로 보지 않음, 계산 용어나 금액/기간이 없으면 계산으로 보지 않음)
+    - 추천 동사(추천/골라/찾아)가 있으면 계산 규칙보다 추천 규칙이 우선
+    """
+    has_fin_term = bool(FIN_TERMS.search(query))
+    for label, pattern in AGENT_RULES:
+        if not pattern.search(query):
+            continue
+        if label == "calculate_mode":
+            if not (CALCULATE_TERMS.search(query) or AMOUNT_OR_PERIOD.search(query)):
+                continue
+            if RECOMMEND_VERBS.search(query):
+                # "계산" 과 추천 동사가 같이 있으면 규칙으로 정하지 않음 (centroid / LLM)
+                if "계산" in query:
+                    return None
+                continue
+        if label == "explain_mode" and not has_fin_term:
+            continue
+        if label == "recommend_mode" and not PRODUCT_TERMS.search(query):
+            continue
+        return label
+    if not has_fin_term and CHITCHAT.search(query):
+        return "normal_mode"
+    return None
+
+
+def recommend_rule(query: str) -> str | None:
+    """
+    recommend_method 규칙 (상품 종류 키워드가 하나만 나오면 그 종류, 예금+적금 둘 다면 all)
+    """
+    matched = [
+        label
+        for label, pattern in (
+            ("jeonse_loan", JEONSE_LOAN),
+            ("installment_deposit", INSTALLMENT_DEPOSIT),
+            ("fixed_deposit", FIXED_DEPOSIT),
+        )
+        if pattern.search(query)
+    ]
+    if len(matched) == 1:
+        return matched[0]
+    if set(matched) == {"installment_deposit", "fixed_deposit"}:
+        return "all"
+    return None
+
+
+RULES = {"agent": agent_rule, "recommend": recommend_rule}
+
+
+def load_intent_queries(split: str | None = None, path: Path = intent_queries_path) -> list[dict]:
+    """
+    라벨이 붙은 질문 목록 {"query", "task": "agent" | "recommend", "label", "split": "train" | "test"}
+    """
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [row for row in rows if split is None or row["split"] == split]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+class NearestCentroid:
+    """
+    라벨별 임베딩 평균(centroid)과 cosine 유사도로 분류, 1등-2등 차이를 confidence 로 사용
+    """
+
+    def __init__(self, vectors: np.ndarray, labels: list[str]):
+        vectors = normalize(np.asarray(vectors, dtype=np.float32))
+        self.labels = sorted(set(labels))
+        label_array = np.array(labels)
+        self.centroids = normalize(np.stack([vectors[label_array == label].mean(axis=0) for label in self.labels]))
+
+    def predict(self, vector: np.ndarray) -> tuple[str, float]:
+        """
+        return (str, float) : (가장 가까운 라벨, 1등과 2등 cosine 차이)
+        """
+        sims = self.centroids @ normalize(np.asarray(vector, dtype=np.float32))
+        order = np.argsort(-sims)
+        return self.labels[order[0]], float(sims[order[0]] - sims[order[1]])
+
+
+class IntentClassifier:
+    """
+    규칙 -> centroid 순서로 의도 분류 (thread-safe 통계 포함)
+
+    parameter (callable) encode : query(str) -> 임베딩 벡터, None 이면 규칙만 사용
+    parameter (callable) encode_batch : list[str] -> 임베딩 행렬 (centroid 학습용)
+    parameter (float) min_margin : centroid 결과를 믿을 최소 margin
+    parameter (bool) use_rules : False 면 centroid 만 사용 (벤치마크용)
+    """
+
+    def __init__(
+        self,
+        encode=None,
+        encode_batch=None,
+        min_margin: float = INTENT_MIN_MARGIN,
+        examples: list[dict] | None = None,
+        use_rules: bool = True,
+    ):
+        self.use_rules = use_rules
+        self.encode = encode
+        self.encode_batch = encode_batch
+        self.min_margin = min_margin
+        self.examples = examples if examples is not None else load_intent_queries("train")
+        self.centroids: dict[str, NearestCentroid] | None = None
+        self.lock = threading.Lock()
+        self.counts: Counter[str] = Counter()
+
+    def fit(self) -> dict[str, NearestCentroid]:
+        """
+        예시 질문 임베딩으로 task 별 centroid 계산 (처음 한 번)
+        """
+        with self.lock:
+            if self.centroids is None:
+                centroids = {}
+                for task in LABELS:
+                    rows = [row for row in self.examples if row["task"] == task]
+                    vectors = self.encode_batch([row["query"] for row in rows])
+                    centroids[task] = NearestCentroid(vectors, [row["label"] for row in rows])
+                self.centroids = centroids
+        return self.centroids
+
+    def classify(self, query: str, task: str) -> Intent:
+        """
+        parameter (str) query : 사용자 질문
+        parameter (str) task : "agent" (agent_method) 또는 "recommend" (recommend_method)
+        return Intent : label 이 None 이면 LLM 으로 분류해야 함
+        """
+        intent = self._classify(query, task)
+        with self.lock:
+            self.counts[f"{task}:{intent.source}"] += 1
+        return intent
+
+    def _classify(self, query: str, task: str) -> Intent:
+        if self.use_rules and (label := RULES[task](query)):
+            return Intent(label, "rule", 1.0)
+        if self.encode is None:
+            return Intent(None, "none")
+        label, margin = self.fit()[task].predict(self.encode(query))
+        if margin >= self.min_margin:
+            return Intent(label, "centroid", margin)
+        return Intent(None, "none", margin)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
+
+
+@lru_cache(maxsize=1)
+def get_intent_classifier() -> IntentClassifier | None:
+    """
+    Intent Classifier Singleton instance 생성 (INTENT_CLASSIFIER=off 면 None)
+    - query 임베딩은 encode_query(캐시)를 사용하므로 추천 turn 의 rag_search 는 같은 벡터를 캐시에서 재사용
+    """
+    if INTENT_CLASSIFIER == "off":
+        return None
+    if INTENT_CLASSIFIER == "rules":
+        return IntentClassifier()
+
+    from finbot.singleton.embedding_cache import encode_query
+    from finbot.singleton.embedding_client import get_query_encoder
+
+    print("Singleton Intent Classifier를 생성합니다....")
+
+    def encode_batch(texts: list[str]) -> np.ndarray:
+        return get_query_encoder().encode(texts, convert_to_numpy=True)
+
+    return IntentClassifier(encode=encode_query, encode_batch=encode_batch)
+
+
+def classify_intent(query: str, task: str) -> str | None:
+    """
+    node 에서 사용: 로컬에서 확신할 수 있으면 라벨, 아니면 None (LLM 으로 분류)
+    임베딩 모델 오류 등으로 실패해도 None 을 반환해서 기존 LLM 경로로 진행
+    """
+    classifier = get_intent_classifier()
+    if classifier is None or not query:
+        return None
+    try:
+        intent = classifier.classify(query, task)
+    except Exception as e:
+        print(f"로컬 의도 분류 실패, LLM 으로 분류합니다: {e!r}")
+        return None
+    if intent.label is not None:
+        print(f"로컬 의도 분류 ({task}, {intent.source}, {intent.confidence:.3f}) : {intent.label}")
+    return intent.label
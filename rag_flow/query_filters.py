@@ -0,0 +1,195 @@
+"""
+사용자 질문에서 상품 조건을 뽑아 Qdrant payload filter 로 변환 (rag_search 의 ANN 검색 전에 적용)
+- 저축개월 : "12개월", "1년" -> 옵션 중 저축개월 == "12"
+- 회사유형 : "저축은행", "2금융권" -> 저축은행 / "시중은행", "1금융권" -> 은행 ("우리은행" 같은 은행 이름은 조건 아님)
+- 금리     : 예금/적금 "3% 이상" -> 옵션 중 최고우대금리 >= 3 ("기본 금리" 라고 하면 저축금리)
+             전세대출 "4% 이하" -> 옵션 중 대출금리최저 <= 4
+- 가입제한 : "누구나", "제한 없는" -> "1" / "서민" -> "2" (예금/적금만)
+
+옵션 조건(저축개월, 금리)은 같은 옵션 하나가 모두 만족해야 하므로 Qdrant nested filter 로 만들고,
+BM25 index 에서는 같은 조건을 PayloadColumns 배열로 한 번에 계산 (mask)
+payload index 는 적재할 때 findata/vector_db.py 의 create_payload_indexes 에서 생성
+"""
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+from qdrant_client import models
+
+
+MONTHS = re.compile(r"(\d{1,2})\s*개월")
+YEARS = re.compile(r"(?<!\d)([1-5])\s*년")
+RATE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:%|퍼센트|프로)\s*(이상|넘|초과|보다\s*높|이하|미만|보다\s*낮|아래)?")
+BASE_RATE = re.compile(r"기본\s*금리")
+SAVINGS_BANK = re.compile(r"저축\s*은행|2\s*금융권|제\s*2\s*금융")
+COMMERCIAL_BANK = re.compile(r"시중\s*은행|1\s*금융권|제\s*1\s*금융")
+NO_RESTRICTION = re.compile(r"누구나|제한\s*(이|은)?\s*없")
+LOW_INCOME = re.compile(r"서민")
+
+LOAN_CATEGORIES = ("jeonse_loan",)
+RATE_FIELDS = ("저축금리", "최고우대금리", "대출금리최저")
+
+
+class PayloadColumns:
+    """
+    payload 목록의 filter 대상 필드를 NumPy 배열로 (BM25 index 를 만들 때 한 번)
+    - 옵션은 옵션 1건 = 1 row, option_doc 으로 payload 번호를 가리킴
+    """
+
+    def __init__(self, payloads: list[dict]):
+        self.size = len(payloads)
+        self.category = np.array([p.get("category") or "" for p in payloads], dtype=np.str_)
+        self.company_type = np.array([p.get("회사유형") or "" for p in payloads], dtype=np.str_)
+        self.join_restriction = np.array([p.get("가입제한") or "" for p in payloads], dtype=np.str_)
+
+        option_doc, months = [], []
+        rates: dict[str, list[float]] = {field: [] for field in RATE_FIELDS}
+        for i, payload in enumerate(payloads):
+            for option in payload.get("옵션") or []:
+                option_doc.append(i)
+                months.append(str(option.get("저축개월") or ""))
+                for field in RATE_FIELDS:
+                    value = option.get(field)
+                    rates[field].append(np.nan if value is None else float(value))
+        self.option_doc = np.array(option_doc, dtype=np.int32)
+        self.months = np.array(months, dtype=np.str_)
+        self.rates = {field: np.array(values, dtype=np.float64) for field, values in rates.items()}
+
+
+@dataclass
+class ProductFilter:
+    months: str | None = None  # 옵션 저축개월 (payload 는 문자열)
+    company_type: str | None = None  # 회사유형
+    join_restriction: str | None = None  # 가입제한 코드
+    min_rate: float | None = None
+    max_rate: float | None = None
+    rate_field: str = "최고우대금리"  # 옵션 안의 금리 key
+
+    def __bool__(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.months, self.company_type, self.join_restriction, self.min_rate, self.max_rate)
+        )
+
+    def describe(self) -> str:
+        parts = []
+        if self.months:
+            parts.append(f"저축개월={self.months}")
+        if self.company_type:
+            parts.append(f"회사유형={self.company_type}")
+        if self.join_restriction:
+            parts.append(f"가입제한={self.join_restriction}")
+        if self.min_rate is not None:
+            parts.append(f"{self.rate_field}>={self.min_rate:g}")
+        if self.max_rate is not None:
+            parts.append(f"{self.rate_field}<={self.max_rate:g}")
+        return ", ".join(parts)
+
+    def option_conditions(self) -> list[models.FieldCondition]:
+        conditions = []
+        if self.months:
+            conditions.append(models.FieldCondition(key="저축개월", match=models.MatchValue(value=self.months)))
+        if self.min_rate is not None or self.max_rate is not None:
+            rate_range = models.Range(gte=self.min_rate, lte=self.max_rate)
+            conditions.append(models.FieldCondition(key=self.rate_field, range=rate_range))
+        return conditions
+
+    def to_qdrant(self) -> models.Filter | None:
+        """
+        return Filter | None : query_points(query_filter=...) 에 넘길 filter, 조건이 없으면 None
+        """
+        must = []
+        if self.company_type:
+            must.append(models.FieldCondition(key="회사유형", match=models.MatchValue(value=self.company_type)))
+        if self.join_restriction:
+            must.append(models.FieldCondition(key="가입제한", match=models.MatchValue(value=self.join_restriction)))
+        if option_conditions := self.option_conditions():
+            nested = models.Nested(key="옵션", filter=models.Filter(must=option_conditions))
+            must.append(models.NestedCondition(nested=nested))
+        return models.Filter(must=must) if must else None
+
+    def mask(self, columns: PayloadColumns) -> np.ndarray:
+        """
+        to_qdrant() 와 같은 조건을 payload 배열에 한 번에 적용 (BM25 검색용)
+
+        return np.ndarray : payload 별 조건 만족 여부 (bool)
+        """
+        allowed = np.ones(columns.size, dtype=bool)
+        if self.company_type:
+            allowed &= columns.company_type == self.company_type
+        if self.join_restriction:
+            allowed &= columns.join_restriction == self.join_restriction
+        if self.option_conditions():
+            ok = np.ones(len(columns.option_doc), dtype=bool)
+            if self.months:
+                ok &= columns.months == self.months
+            rate = columns.rates[self.rate_field]  # 없는 값(nan)은 비교 결과 False
+            if self.min_rate is not None:
+                ok &= rate >= self.min_rate
+            if self.max_rate is not None:
+                ok &= rate <= self.max_rate
+            has_option = np.zeros(columns.size, dtype=bool)
+            has_option[columns.option_doc[ok]] = True
+            allowed &= has_option
+        return allowed
+
+    def matches(self, payload: dict) -> bool:
+        """
+        payload 1건에 mask() 와 같은 조건 확인
+        """
+        if self.company_type and payload.get("회사유형") != self.company_type:
+            return False
+        if self.join_restriction and payload.get("가입제한") != self.join_restriction:
+            return False
+        if not self.option_conditions():
+            return True
+        return any(self.matches_option(option) for option in payload.get("옵션") or [])
+
+    def matches_option(self, option: dict) -> bool:
+        if self.months and option.get("저축개월") != self.months:
+            return False
+        rate = option.get(self.rate_field)
+        if self.min_rate is not None and (rate is None or rate < self.min_rate):
+            return False
+        if self.max_rate is not None and (rate is None or rate > self.max_rate):
+            return False
+        return True
+
+
+def extract_filters(query: str, recommend_method: str | None = None) -> ProductFilter:
+    """
+    parameter (str) query : 사용자 질문
+    parameter (str) recommend_method : "fixed_deposit", "installment_deposit", "jeonse_loan", "all"
+    return ProductFilter : 질문에 조건이 없으면 빈 filter (bool 값 False)
+    """
+    query = query or ""
+    loan = recommend_method in LOAN_CATEGORIES
+    product_filter = ProductFilter(rate_field="대출금리최저" if loan else "최고우대금리")
+
+    if not loan:
+        if match := MONTHS.search(query):
+            product_filter.months = str(int(match.group(1)))
+        elif match := YEARS.search(query):
+            product_filter.months = str(int(match.group(1)) * 12)
+        if BASE_RATE.search(query):
+            product_filter.rate_field = "저축금리"
+        if NO_RESTRICTION.search(query):
+            product_filter.join_restriction = "1"
+        elif LOW_INCOME.search(query):
+            product_filter.join_restriction = "2"
+
+    if SAVINGS_BANK.search(query):
+        product_filter.company_type = "저축은행"
+    elif COMMERCIAL_BANK.search(query):
+        product_filter.company_type = "은행"
+
+    if match := RATE.search(query):
+        rate, direction = float(match.group(1)), match.group(2) or ""
+        upper = direction.startswith(("이하", "미만", "아래")) or "낮" in direction
+        # 방향이 없으면 예금/적금은 "이상", 대출은 "이하"로 해석
+        if upper or (loan and not direction):
+            product_filter.max_rate = rate
+        else:
+            product_filter.min_rate = rate
+    return product_filter
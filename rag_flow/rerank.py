@@ -0,0 +1,97 @@
+"""
+hybrid 검색 결과(상품 단위) 상위 후보를 cross-encoder 로 다시 정렬 (rag_flow/retrieval.py 의 선택 단계)
+- (질문, 상품의 최고 점수 chunk text) 쌍을 CPU 에서 함께 인코딩해서 점수를 매김 (bi-encoder 인 KoSimCSE 보다 정확, 느림)
+- RAG_RERANKER_MODEL 이 비어 있으면 사용하지 않음 (기본값), 예: BAAI/bge-reranker-v2-m3, Dongjin-kr/ko-reranker
+- latency 예산: 쌍 1개당 평균 시간(지수 이동 평균)으로 RAG_RERANK_BUDGET_MS 안에 들어오는 후보 수만 rerank
+  나머지 후보는 fusion 순서 그대로 뒤에 붙임, 예산을 넘으면 로그
+"""
+
+import os
+import threading
+import time
+from dataclasses import replace
+from functools import lru_cache
+
+
+RAG_RERANKER_MODEL = os.getenv("RAG_RERANKER_MODEL", "")  # 비어 있으면 rerank 안 함
+RAG_RERANK_TOP = int(os.getenv("RAG_RERANK_TOP", "10"))  # rerank 할 최대 후보 상품 수
+RAG_RERANK_BUDGET_MS = float(os.getenv("RAG_RERANK_BUDGET_MS", "300"))
+RAG_RERANK_MAX_LENGTH = int(os.getenv("RAG_RERANK_MAX_LENGTH", "256"))  # 질문 + chunk(250자) 토큰 수 상한
+
+
+class CrossEncoderReranker:
+    """
+    parameter (callable) predict : list[(query, text)] -> 쌍별 점수 (CrossEncoder.predict)
+    parameter (int) max_candidates : rerank 할 최대 후보 수
+    parameter (float) budget_ms : rerank 1회 latency 예산 (0 이면 제한 없음)
+    """
+
+    def __init__(self, predict, max_candidates: int = RAG_RERANK_TOP, budget_ms: float = RAG_RERANK_BUDGET_MS):
+        self.predict = predict
+        self.max_candidates = max_candidates
+        self.budget_ms = budget_ms
+        self.pair_ms: float | None = None  # 쌍 1개당 평균 시간 (처음 rerank 후부터)
+        self.lock = threading.Lock()
+
+    def budget_candidates(self) -> int:
+        """
+        return int : 예산 안에서 rerank 할 후보 수 (최소 2개, 측정 전에는 max_candidates)
+        """
+        if not self.budget_ms or self.pair_ms is None:
+            return self.max_candidates
+        return max(2, min(self.max_candidates, int(self.budget_ms / self.pair_ms)))
+
+    def rerank(self, query: str, products: list) -> list:
+        """
+        parameter (str) query : 사용자 질문
+        parameter (list[RetrievedProduct]) products : fusion 순위순 상품
+        return list[RetrievedProduct] : 상위 후보는 cross-encoder 점수 순, 나머지는 기존 순서
+        """
+        n = min(len(products), self.budget_candidates())
+        if n < 2:
+            return products
+        head, tail = products[:n], products[n:]
+        start = time.perf_counter()
+        scores = self.predict([(query, product.payload.get("text") or "") for product in head])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            pair_ms = elapsed_ms / n
+            self.pair_ms = pair_ms if self.pair_ms is None else 0.8 * self.pair_ms + 0.2 * pair_ms
+        if self.budget_ms and elapsed_ms > self.budget_ms:
+            print(f"rerank 예산 초과: {n}개 {elapsed_ms:.0f}ms (예산 {self.budget_ms:.0f}ms)")
+
+        reranked = [replace(product, rerank_score=float(score)) for product, score in zip(head, scores, strict=True)]
+        reranked.sort(key=lambda product: -product.rerank_score)
+        return reranked + tail
+
+    def warm_up(self) -> None:
+        """
+        첫 요청의 초기화 비용을 미리 (두 번째 호출로 쌍 1개당 시간을 처음 측정)
+        """
+        self.predict([("warm up", "warm up")])
+        start = time.perf_counter()
+        self.predict([("warm up", "warm up")] * 2)
+        self.pair_ms = (time.perf_counter() - start) * 1000 / 2
+
+
+@lru_cache(maxsize=1)
+def get_reranker() -> CrossEncoderReranker | None:
+    """
+    Cross-encoder Reranker Singleton instance 생성 (RAG_RERANKER_MODEL 이 비어 있으면 None)
+    - 모델을 불러올 수 없으면 None (rerank 없이 fusion 순서 사용)
+    """
+    if not RAG_RERANKER_MODEL:
+        return None
+    print(f"Singleton Reranker를 생성합니다 ({RAG_RERANKER_MODEL})....")
+    try:
+        from sentence_transformers import CrossEncoder
+
+        model = CrossEncoder(RAG_RERANKER_MODEL, max_length=RAG_RERANK_MAX_LENGTH, device="cpu")
+    except Exception as e:
+        print(f"Reranker 를 불러올 수 없어 rerank 없이 검색합니다: {e!r}")
+        return None
+
+    def predict(pairs: list[tuple[str, str]]):
+        return model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+
+    return CrossEncoderReranker(predict)
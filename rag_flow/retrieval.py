@@ -0,0 +1,376 @@
+"""
+rag_search 의 hybrid 검색 (dense KoSimCSE + 로컬 BM25, reciprocal rank fusion), 결과는 서로 다른 상품 N개
+- 상품 하나가 chunk(250자) 여러 개로 나뉘어 있으므로 두 검색 모두 상품 key(payload "product_key",
+  카테고리 + 금융회사코드 + 금융상품코드)로 묶어서 상품 점수 = chunk 점수의 최댓값
+  (금융상품코드만으로는 은행/카테고리가 다른 상품이 같은 코드를 쓰는 경우 하나로 합쳐짐, 예: 24000, WR0001B)
+- dense : Qdrant query_points_groups (group_by product_key, 상품마다 점수가 가장 높은 chunk 1개)
+- sparse: collection 에 저장된 chunk text(payload "text", make_embedding_ready_text_* 결과)로 만든 BM25 index
+  한국어 형태소 분석기 없이 어절을 글자 2-gram 으로 나눔 ("우리은행의" -> "우리", "리은", "은행", "행의")
+  은행 이름, "청년", "비대면" 같이 글자가 그대로 일치해야 하는 질문을 dense 검색이 놓치는 경우를 보완
+- fusion: 상품 별 score = Σ weight / (RAG_RRF_K + 순위), 두 검색의 상위 RAG_TOPK 개 상품을 상품 key 로 합침
+- rerank: RAG_RERANKER_MODEL 을 설정하면 fusion 상위 상품을 cross-encoder 로 다시 정렬 (rag_flow/rerank.py)
+- BM25 index 는 처음 검색할 때 collection 을 scroll 해서 프로세스 메모리에 만들고
+  RAG_BM25_TTL 초가 지나면 백그라운드에서 다시 만듦 (만들 수 없으면 dense 결과만 사용)
+- 모든 카테고리가 collection 1개(QDRANT_COLLECTION)에 있으므로 카테고리 검색은
+  dense 는 payload category filter, BM25 는 category mask (카테고리 "all" 은 전체)
+
+- 질문의 상품 조건(rag_flow/query_filters.py)은 dense 는 Qdrant payload filter, BM25 는 같은 조건의 mask 로 적용
+  조건에 맞는 상품이 없으면 조건 없이 다시 검색
+
+RAG_RETRIEVER=dense 면 기존처럼 dense 검색만
+"""
+
+import asyncio
+import math
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache, partial
+
+import numpy as np
+
+from findata.vector_db import PRODUCT_KEY_FIELD, QDRANT_COLLECTION, category_filter, product_key
+from products.search_index import RefreshingIndex
+from rag_flow.query_filters import PayloadColumns, ProductFilter
+
+
+# "hybrid": dense + BM25 / "dense": dense 만
+RAG_RETRIEVER = os.getenv("RAG_RETRIEVER", "hybrid")
+RAG_TOPK = int(os.getenv("RAG_TOPK", "20"))  # fusion 전에 각 검색에서 가져오는 후보 상품 수
+RAG_RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+RAG_DENSE_WEIGHT = float(os.getenv("RAG_DENSE_WEIGHT", "1.0"))
+RAG_SPARSE_WEIGHT = float(os.getenv("RAG_SPARSE_WEIGHT", "1.0"))
+RAG_BM25_TTL = float(os.getenv("RAG_BM25_TTL", "3600"))  # 초
+
+WORD = re.compile(r"[0-9a-z가-힣]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    소문자 어절(한글/영문/숫자) -> 글자 2-gram (1글자 어절은 그대로)
+    """
+    tokens = []
+    for word in WORD.findall(text.casefold()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index (읽기 전용, 갱신은 새로 만들어서 교체)
+    - term -> (문서 번호 배열, 문서별 BM25 가중치 배열) 로 미리 계산해서 검색은 posting 을 더하기만 함
+
+    parameter (list[tuple]) points : (point id, payload), payload["text"] 로 색인
+    """
+
+    def __init__(self, points: list[tuple[str, dict]], k1: float = 1.2, b: float = 0.75):
+        self.ids = [point_id for point_id, _ in points]
+        self.payloads = [payload for _, payload in points]
+        docs = [Counter(tokenize(payload.get("text") or "")) for payload in self.payloads]
+        lengths = np.array([sum(doc.values()) for doc in docs], dtype=np.float32)
+        avgdl = float(lengths.mean()) if len(docs) and lengths.mean() > 0 else 1.0
+
+        term_docs: dict[str, list[int]] = defaultdict(list)
+        term_freqs: dict[str, list[int]] = defaultdict(list)
+        for i, doc in enumerate(docs):
+            for term, tf in doc.items():
+                term_docs[term].append(i)
+                term_freqs[term].append(tf)
+
+        n = len(docs)
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, doc_ids in term_docs.items():
+            doc_ids = np.array(doc_ids, dtype=np.int32)
+            tf = np.array(term_freqs[term], dtype=np.float32)
+            idf = math.log(1 + (n - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            norm = k1 * (1 - b + b * lengths[doc_ids] / avgdl)
+            self.postings[term] = (doc_ids, (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+        self.columns = PayloadColumns(self.payloads)  # 상품 조건 filter 용
+        # chunk -> 상품 번호 (상품 단위로 묶을 때 사용)
+        keys = [payload_product_key(payload, i) for i, payload in zip(self.ids, self.payloads, strict=True)]
+        _, self.doc_product = np.unique(np.array(keys, dtype=np.str_), return_inverse=True)
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores(self, query: str, allowed: np.ndarray | None = None) -> np.ndarray:
+        """
+        parameter (np.ndarray) allowed : 문서별 bool mask (상품 조건 filter), None 이면 전체
+        return np.ndarray : 문서별 BM25 점수 (allowed 가 아닌 문서는 0)
+        """
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term, count in Counter(tokenize(query)).items():
+            posting = self.postings.get(term)
+            if posting is not None:
+                doc_ids, weights = posting
+                scores[doc_ids] += count * weights
+        if allowed is not None:
+            scores[~allowed] = 0
+        return scores
+
+    def search(self, query: str, limit: int, allowed: np.ndarray | None = None) -> list[tuple[int, float]]:
+        """
+        return list[(int, float)] : 점수 순 (문서 번호, BM25 점수), 겹치는 term 이 없는 문서는 제외
+        """
+        scores = self.scores(query, allowed)
+        top = np.flatnonzero(scores > 0)
+        if len(top) > limit:
+            top = top[np.argpartition(-scores[top], limit - 1)[:limit]]
+        top = top[np.lexsort((top, -scores[top]))]  # 점수 내림차순, 같으면 문서 순서
+        return [(int(i), float(scores[i])) for i in top]
+
+    def search_products(self, query: str, limit: int, allowed: np.ndarray | None = None) -> list[tuple[int, float]]:
+        """
+        상품 key 단위 검색 (상품 점수 = 그 상품 chunk 점수의 최댓값)
+
+        return list[(int, float)] : 점수 순 (상품마다 점수가 가장 높은 chunk 의 문서 번호, 점수)
+        """
+        scores = self.scores(query, allowed)
+        top = np.flatnonzero(scores > 0)
+        top = top[np.lexsort((top, -scores[top]))]
+        # 점수 순으로 정렬했으므로 상품별 첫 chunk 가 최고 점수 chunk
+        _, first = np.unique(self.doc_product[top], return_index=True)
+        best = top[np.sort(first)][:limit]
+        return [(int(i), float(scores[i])) for i in best]
+
+
+def build_bm25_index(client, collection_name: str, scroll_size: int = 1000) -> BM25Index:
+    """
+    Qdrant collection 의 모든 point payload 로 BM25 index 생성 (vector 는 받지 않음)
+    """
+    start = time.perf_counter()
+    points = []
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name, limit=scroll_size, offset=offset, with_payload=True, with_vectors=False
+        )
+        points.extend((str(record.id), record.payload or {}) for record in records)
+        if offset is None:
+            break
+    index = BM25Index(points)
+    print(f"BM25 index 생성 ({collection_name}): {len(index)}개 chunk, {time.perf_counter() - start:.2f}초")
+    return index
+
+
+@dataclass
+class RetrievedProduct:
+    key: str  # 상품 key (카테고리:금융회사코드:금융상품코드)
+    payload: dict  # 점수가 가장 높은 chunk 의 payload (상품 metadata + chunk text)
+    score: float  # hybrid: RRF 점수, dense 만: cosine 유사도
+    dense_rank: int | None = None  # 1부터, 해당 검색 후보에 없으면 None
+    sparse_rank: int | None = None
+    rerank_score: float | None = None  # cross-encoder 점수 (rerank 한 상품만)
+
+
+def payload_product_key(payload: dict, point_id) -> str:
+    """
+    chunk payload 의 상품 key (findata.vector_db.product_key)
+    - product_key 가 없는 payload 는 metadata 로 계산, metadata 도 없으면 point id (chunk 하나를 상품 하나로)
+    """
+    if payload.get(PRODUCT_KEY_FIELD):
+        return payload[PRODUCT_KEY_FIELD]
+    try:
+        return product_key(payload)
+    except KeyError:
+        return str(point_id)
+
+
+def rrf_fuse(
+    dense: list[tuple[str, dict]],
+    sparse: list[tuple[str, dict]],
+    limit: int,
+    k: int = RAG_RRF_K,
+    dense_weight: float = RAG_DENSE_WEIGHT,
+    sparse_weight: float = RAG_SPARSE_WEIGHT,
+) -> list[RetrievedProduct]:
+    """
+    reciprocal rank fusion: score = Σ weight / (k + rank)
+
+    parameter (list[tuple]) dense : 순위순 (상품 key, payload)
+    parameter (list[tuple]) sparse : 순위순 (상품 key, payload)
+    return list[RetrievedProduct] : score 순 상위 limit 개 (같으면 dense 순위가 높은 것 먼저)
+    """
+    fused: dict[str, RetrievedProduct] = {}
+    for rank, (key, payload) in enumerate(dense, start=1):
+        fused[key] = RetrievedProduct(key, payload, dense_weight / (k + rank), dense_rank=rank)
+    for rank, (key, payload) in enumerate(sparse, start=1):
+        product = fused.setdefault(key, RetrievedProduct(key, payload, 0.0))
+        product.score += sparse_weight / (k + rank)
+        product.sparse_rank = rank
+    return sorted(fused.values(), key=lambda p: (-p.score, p.dense_rank or math.inf))[:limit]
+
+
+class HybridRetriever:
+    """
+    dense(Qdrant) + BM25 검색 결과를 상품 단위로 묶어 RRF 로 합침, BM25 index 는 처음 검색할 때 생성
+
+    parameter (QdrantClient) client : dense 검색, BM25 index 를 만들 때 scroll
+    parameter (callable) encode : query(str) -> 임베딩 벡터
+    parameter (str) collection_name : 모든 카테고리 상품이 있는 collection
+    parameter (str) mode : "hybrid" 또는 "dense"
+    parameter (int) topk : fusion 전에 각 검색에서 가져오는 후보 상품 수 (limit 보다 작으면 limit)
+    parameter (CrossEncoderReranker) reranker : None 이면 rerank 하지 않음
+    """
+
+    def __init__(
+        self,
+        client,
+        encode,
+        collection_name: str = QDRANT_COLLECTION,
+        mode: str = RAG_RETRIEVER,
+        topk: int = RAG_TOPK,
+        rrf_k: int = RAG_RRF_K,
+        dense_weight: float = RAG_DENSE_WEIGHT,
+        sparse_weight: float = RAG_SPARSE_WEIGHT,
+        bm25_ttl: float = RAG_BM25_TTL,
+        reranker=None,
+    ):
+        self.client = client
+        self.encode = encode
+        self.collection_name = collection_name
+        self.mode = mode
+        self.topk = topk
+        self.rrf_k = rrf_k
+        self.dense_weight = dense_weight
+        self.sparse_weight = sparse_weight
+        self.bm25_ttl = bm25_ttl
+        self.reranker = reranker
+        self.index = RefreshingIndex(build=partial(build_bm25_index, client, collection_name), ttl=bm25_ttl)
+
+    def bm25(self) -> BM25Index:
+        return self.index.get()
+
+    def candidates(self, limit: int) -> int:
+        """
+        각 검색에서 가져올 상품 수 (rerank 하면 rerank 후보 수 이상)
+        """
+        if self.reranker is not None:
+            limit = max(limit, self.reranker.max_candidates)
+        return limit if self.mode == "dense" else max(limit, self.topk)
+
+    def sparse_search(
+        self, query: str, category: str | None = None, limit: int = 0, product_filter: ProductFilter | None = None
+    ) -> list[tuple[str, dict]] | None:
+        """
+        return list[(str, dict)] | None : BM25 순위순 (상품 key, payload), dense 만 쓰는 경우 None
+        """
+        if self.mode == "dense":
+            return None
+        try:
+            index = self.bm25()
+        except Exception as e:
+            print(f"BM25 index 를 만들 수 없어 dense 결과만 사용합니다 ({self.collection_name}): {e!r}")
+            return None
+        allowed = None
+        if category_filter(category) is not None:
+            allowed = index.columns.category == category
+        if product_filter:
+            mask = product_filter.mask(index.columns)
+            allowed = mask if allowed is None else allowed & mask
+        return [
+            (payload_product_key(index.payloads[i], index.ids[i]), index.payloads[i])
+            for i, _ in index.search_products(query, self.candidates(limit), allowed)
+        ]
+
+    def dense_kwargs(self, category: str | None, limit: int, product_filter: ProductFilter | None) -> dict:
+        """
+        query_points_groups 인자 (카테고리, 상품 조건은 Qdrant payload filter 로 ANN 검색 전에 적용)
+        """
+        query_filter = category_filter(category)
+        if product_filter and (conditions := product_filter.to_qdrant()):
+            if query_filter is None:
+                query_filter = conditions
+            else:
+                query_filter.must.extend(conditions.must)
+        return {
+            "collection_name": self.collection_name,
+            "query_filter": query_filter,
+            "group_by": PRODUCT_KEY_FIELD,
+            "group_size": 1,
+            "limit": self.candidates(limit),
+        }
+
+    def fuse(self, query: str, groups, sparse: list[tuple[str, dict]] | None, limit: int) -> list[RetrievedProduct]:
+        """
+        parameter (GroupsResult) groups : query_points_groups 결과 (상품 key 별 group, 상품 순위순)
+        """
+        dense_hits = [(str(group.id), group.hits[0]) for group in groups.groups if group.hits]
+        if sparse is None:
+            products = [
+                RetrievedProduct(key, hit.payload, hit.score, dense_rank=rank)
+                for rank, (key, hit) in enumerate(dense_hits, start=1)
+            ]
+        else:
+            dense = [(key, hit.payload) for key, hit in dense_hits]
+            weights = (self.dense_weight, self.sparse_weight)
+            products = rrf_fuse(dense, sparse, len(dense) + len(sparse), self.rrf_k, *weights)
+        if self.reranker is not None and products:
+            products = self.reranker.rerank(query, products)
+        return products[:limit]
+
+    def search(
+        self, query: str, category: str | None = None, limit: int = 3, product_filter: ProductFilter | None = None
+    ) -> list[RetrievedProduct]:
+        """
+        parameter (str) query : 사용자 질문
+        parameter (str) category : "fixed_deposit", "installment_deposit", "jeonse_loan", "all"(또는 None 이면 전체)
+        parameter (int) limit : 반환할 상품 수 (서로 다른 상품 key)
+        parameter (ProductFilter) product_filter : 상품 조건, 조건에 맞는 상품이 없으면 조건 없이 다시 검색
+        return list[RetrievedProduct] : 점수 순
+        """
+        q_vec = self.encode(query)
+        dense_kwargs = self.dense_kwargs(category, limit, product_filter)
+        groups = self.client.query_points_groups(query=q_vec, **dense_kwargs)
+        sparse = self.sparse_search(query, category, limit, product_filter)
+        results = self.fuse(query, groups, sparse, limit)
+        if not results and product_filter:
+            print(f"조건({product_filter.describe()})에 맞는 상품이 없어 조건 없이 검색합니다.")
+            groups = self.client.query_points_groups(query=q_vec, **self.dense_kwargs(category, limit, None))
+            results = self.fuse(query, groups, self.sparse_search(query, category, limit), limit)
+        return results
+
+    async def asearch(
+        self, query: str, category: str | None, limit: int, aclient, product_filter: ProductFilter | None = None
+    ) -> list[RetrievedProduct]:
+        """
+        search 의 async 버전 (dense 는 AsyncQdrantClient, query embedding / BM25 / rerank 는 thread 에서)
+        """
+        q_vec, sparse = await asyncio.gather(
+            asyncio.to_thread(self.encode, query),
+            asyncio.to_thread(self.sparse_search, query, category, limit, product_filter),
+        )
+        groups = await aclient.query_points_groups(query=q_vec, **self.dense_kwargs(category, limit, product_filter))
+        results = await asyncio.to_thread(self.fuse, query, groups, sparse, limit)
+        if not results and product_filter:
+            print(f"조건({product_filter.describe()})에 맞는 상품이 없어 조건 없이 검색합니다.")
+            groups, sparse = await asyncio.gather(
+                aclient.query_points_groups(query=q_vec, **self.dense_kwargs(category, limit, None)),
+                asyncio.to_thread(self.sparse_search, query, category, limit),
+            )
+            results = await asyncio.to_thread(self.fuse, query, groups, sparse, limit)
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_retriever() -> HybridRetriever:
+    """
+    Hybrid Retriever Singleton instance 생성
+    - dense 검색과 BM25 index 생성은 앱 전역 qdrant_client, query embedding 은 encode_query(캐시) 사용
+    - RAG_RERANKER_MODEL 을 설정한 경우에만 cross-encoder rerank
+
+    parameter () : None
+    return HybridRetriever : rag_search 에서 사용하는 검색기
+    """
+    from finbot.singleton.embedding_cache import encode_query
+    from finbot.singleton.vectordb import qdrant_client
+    from rag_flow.rerank import get_reranker
+
+    print(f"Singleton Hybrid Retriever를 생성합니다 ({RAG_RETRIEVER})....")
+    return HybridRetriever(qdrant_client, encode_query, reranker=get_reranker())